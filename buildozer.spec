@@ -5,8 +5,9 @@ package.domain = org.local
 
 source.dir = .
 source.include_exts = py,kv,png,jpg,ttf,txt,json
+source.exclude_dirs = tools, tests, bin
 version = 0.1
-requirements = python3,kivy
+requirements = python3,kivy,sqlite3
 icon.filename = icon.png
 orientation = portrait
 fullscreen = 0
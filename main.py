@@ -5,28 +5,55 @@
 #            안드로이드 공식 쓰기 가능 폴더(user_data_dir)로 동적 할당되도록 수정
 # - 초기화 팝업창(라이트 테마), 바깥 터치 닫기, 기록 페이징, 시간 표시 등 최종 기능 적용
 
-import os, sys, json, traceback
+import os, sys, time, threading, traceback
+from functools import partial
+from collections import OrderedDict
+from itertools import islice
 from datetime import datetime
+
+# 시작 시간 측정용 (tools/bench_startup.py 가 SLAB_STARTUP_PROBE 로 켬)
+_T_START = time.perf_counter()
+_STARTUP_PROBE = os.environ.get("SLAB_STARTUP_PROBE", "")
+# 성능 통계 출력 (저장/게이지/렌더링 등, 기본은 끔): SLAB_STATS=1
+_STATS = bool(os.environ.get("SLAB_STATS", "") or _STARTUP_PROBE)
+
 from kivy.app import App
 from kivy.metrics import dp, sp
 from kivy.core.window import Window
-from kivy.core.text import LabelBase
+from kivy.core.text import LabelBase, Label as CoreLabel
+from kivy.core.text.markup import MarkupLabel as CoreMarkupLabel
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 from kivy.uix.widget import Widget
 from kivy.uix.image import Image
 from kivy.uix.behaviors import ButtonBehavior
-from kivy.properties import NumericProperty, ListProperty, BooleanProperty
-from kivy.graphics import Color, RoundedRectangle, Ellipse
+from kivy.properties import NumericProperty, ListProperty, BooleanProperty, StringProperty
+from kivy.graphics import Color, RoundedRectangle, Ellipse, Rectangle, InstructionGroup
 from kivy.uix.screenmanager import ScreenManager, Screen, NoTransition
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.popup import Popup
+from kivy.uix.dropdown import DropDown
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.clock import Clock
+
+from slab_core import (MAX_HISTORY, _num_or_none, _compute, build_code, check_inputs,
+                       ERR_TOO_LONG, compile_plan,
+                       build_history_summary, ResultFormatter,
+                       load_settings, save_settings)
+from slab_persist import PersistWorker, HistoryQueue
+from slab_plan import PlanIndex, find_plan_file
+from slab_suggest import CodeIndex
+from slab_fixed import to_units
+# 기록 저장소 / 열 보관소(numpy) / 손실 비교 / 게이지(asyncio) / 동기화(urllib) 는
+# 첫 프레임에 필요 없으므로 쓰는 곳에서 import
 
 # ===== 빌드용 파일 경로 설정 (상대 경로) =====
 FONT = "NanumGothic"
-FONT_PATH = "NanumGothic.ttf"
+FONT_PATH = "NanumGothic.ttf"      # 빌드 전에 tools/subset_font.py 로 쓰는 글자만 남긴 부분 폰트로 교체
+GLYPHS_PATH = "font_glyphs.txt"    # 부분 폰트에 남긴 글자 (시작 후 글리프 미리 그리기용)
 ICON_PATH = "1702.png"
 
 # 폰트 등록 (빌드 환경에서는 파일이 같은 디렉토리에 포함됨)
@@ -35,21 +62,7 @@ try:
 except Exception as e:
     print(f"폰트 등록 실패: {e}")
 
-MAX_HISTORY = 10
-
 # ===== 유틸 =====
-def _num_or_none(s):
-    try:
-        s = (s or "").strip()
-        if not s or s == ".":
-            return None
-        return float(s)
-    except Exception:
-        return None
-
-def round_half_up(n):
-    return int(float(n) + 0.5)
-
 def _install_global_crash_hook(user_data_dir: str):
     def _write(path, text):
         try:
@@ -66,66 +79,14 @@ def _install_global_crash_hook(user_data_dir: str):
         sys.__excepthook__(exc_type, exc, tb)
     sys.excepthook = _hook
 
-# ===== 순수 계산 =====
-def _compute(slab, guides, loss):
-    total_loss = loss * (len(guides) - 1)
-    remain = slab - (sum(guides) + total_loss)
-    if remain < 0:
-        return None
-    add_each = remain / len(guides)
-    real = [g + add_each for g in guides]
-    return {
-        "slab": slab, "guides": guides, "loss": loss,
-        "total_loss": total_loss, "remain": remain,
-        "add_each": add_each, "real": real,
-    }
-
-# ===== 기록 및 설정 저장/불러오기 (APK 호환용 수정) =====
-def load_history(filepath) -> list:
-    try:
-        if os.path.exists(filepath):
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data if isinstance(data, list) else []
-    except Exception:
-        pass
-    return []
-
-def save_history(filepath, history: list):
-    try:
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(history, f, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
-
-def _defaults():
-    return {
-        "prefix": "SG94",
-        "round": False,
-        "out_font": 15,
-        "hide_mm": False,
-        "loss_mm": 15.0,
-        "show_history": False,
-        "swap_sections": False
-    }
-
-def load_settings(filepath):
-    st = _defaults()
-    try:
-        if os.path.exists(filepath):
-            with open(filepath, "r", encoding="utf-8") as f:
-                got = json.load(f) or {}
-            st.update(got)
-    except Exception:
-        pass
-    return st
-
-def save_settings(filepath, data: dict):
-    try:
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
+# 실시간 계산 지연: -1 = 같은 프레임의 입력 변경을 모아 그리기 직전에 한 번 계산,
+#                  양수 = 입력이 그 시간(초) 동안 멈추면 계산
+LIVE_DEBOUNCE_S = -1
+FRAME_MS = 1000.0 / 60
+
+def _num_text(x):
+    # 입력칸에 다시 넣을 숫자 문자열 (9000.0 -> "9000", 2950.5 -> "2950.5")
+    return f"{x:.10g}"
 
 # ===== 공통 위젯 =====
 class RoundedButton(ButtonBehavior, Label):
@@ -194,6 +155,96 @@ class DigitInput(TextInput):
             filtered = filtered[:remain]
         return super().insert_text(filtered, from_undo=from_undo)
 
+class GuideRows(ScrollView):
+    """지시길이 입력 행 (개수 가변). 줄인 행은 버리지 않고 보관했다가 늘릴 때 다시 씀"""
+    MIN_ROWS = 2
+    MAX_ROWS = 50
+    DEFAULT_ROWS = 3
+    VISIBLE_ROWS = 5
+
+    def __init__(self, label_width, input_width, on_change=None, **kwargs):
+        super().__init__(do_scroll_x=False, size_hint=(1, None), bar_width=dp(4), **kwargs)
+        self._lw = label_width
+        self._iw = input_width
+        self.on_change = on_change
+        self._box = BoxLayout(orientation="vertical", spacing=dp(8), size_hint_y=None)
+        self._box.bind(minimum_height=self._box.setter("height"))
+        self.add_widget(self._box)
+        self._rows = []          # [(행 위젯, 입력칸)] 보관 중인 행 포함
+        self.count = 0
+        self.set_count(self.DEFAULT_ROWS)
+
+    @property
+    def inputs(self):
+        return [inp for _, inp in self._rows[:self.count]]
+
+    def values(self):
+        return [_num_or_none(inp.text) for _, inp in self._rows[:self.count]]
+
+    def set_values(self, values):
+        # 행이 모자라면 늘리고, 남는 행은 비움
+        self.set_count(max(len(values), self.count))
+        for i, inp in enumerate(self.inputs):
+            inp.text = _num_text(values[i]) if i < len(values) and values[i] is not None else ""
+
+    def clear(self):
+        self.set_count(self.DEFAULT_ROWS)
+        for inp in self.inputs:
+            inp.text = ""
+
+    def set_count(self, n):
+        n = max(self.MIN_ROWS, min(self.MAX_ROWS, n))
+        while len(self._rows) < n:
+            self._rows.append(self._make_row(len(self._rows) + 1))
+        for i in range(self.count, n):
+            self._box.add_widget(self._rows[i][0])
+        for i in range(n, self.count):
+            row, inp = self._rows[i]
+            inp.text = ""
+            self._box.remove_widget(row)
+        self.count = n
+        vis = min(n, self.VISIBLE_ROWS)
+        self.height = dp(30) * vis + dp(8) * (vis - 1)
+
+    def _add_row(self):
+        if self.count >= self.MAX_ROWS:
+            return
+        self.set_count(self.count + 1)
+        row, inp = self._rows[self.count - 1]
+        Clock.schedule_once(lambda dt: (self.scroll_to(row), setattr(inp, "focus", True)), 0)
+
+    def _make_row(self, i):
+        row = BoxLayout(orientation="horizontal", spacing=dp(6), size_hint=(1, None), height=dp(30))
+        lab = Label(text=f"{i}번 지시길이:", font_name=FONT, color=(0,0,0,1),
+                    size_hint=(None,1), width=self._lw, halign="right", valign="middle")
+        lab.bind(size=lambda *_: setattr(lab, "text_size", (lab.width, None)))
+        inp = DigitInput(max_len=4, allow_float=True, width=self._iw)
+        if self.on_change:
+            inp.bind(text=self.on_change)
+        row.add_widget(lab)
+        row.add_widget(inp)
+
+        btns = BoxLayout(orientation="horizontal", spacing=dp(6),
+                         size_hint=(None,1), width=dp(58*2+6))
+        def _btn(text, cb):
+            b = RoundedButton(text=text, bg_color=[0.8,0.8,0.8,1], fg_color=[0,0,0,1],
+                              size_hint=(None,1), width=dp(58), font_size=dp(17))
+            b.bind(on_release=lambda *_: cb())
+            btns.add_widget(b)
+        if i == 1:
+            # 1번 행 빈 자리에 행 삭제 / 추가
+            _btn("-", lambda: self.set_count(self.count - 1))
+            _btn("+", self._add_row)
+        else:
+            first = self._rows[0][1]
+            _btn("← 1번", lambda: setattr(inp, "text", first.text))
+            if i >= 3:
+                prev = self._rows[i - 2][1]
+                _btn(f"← {i-1}번", lambda: setattr(inp, "text", prev.text))
+        row.add_widget(btns)
+        row.add_widget(Label())
+        return row, inp
+
 class AlnumInput(TextInput):
     max_len = NumericProperty(6)
     def __init__(self, **kwargs):
@@ -217,6 +268,16 @@ class AlnumInput(TextInput):
             filtered = filtered[:remain]
         return super().insert_text(filtered, from_undo=from_undo)
 
+class AddrInput(AlnumInput):
+    # 게이지 주소 (host:port, serial://장치@속도) - 대소문자 그대로
+    max_len = NumericProperty(48)
+    def insert_text(self, substring, from_undo=False):
+        filtered = "".join(ch for ch in substring if ch.isalnum() or ch in ".:/_-@")
+        remain = max(0, self.max_len - len(self.text))
+        if remain <= 0:
+            return
+        return TextInput.insert_text(self, filtered[:remain], from_undo=from_undo)
+
 class PillSwitch(ButtonBehavior, Widget):
     active = BooleanProperty(False)
     def __init__(self, active=False, **kwargs):
@@ -250,6 +311,233 @@ class PillSwitch(ButtonBehavior, Widget):
         self.active = not self.active
         self._render()
 
+# ===== 결과 표시 (텍스처 캐시) =====
+# 같은 문구/글씨 크기/폭이면 이미 그려 둔 텍스처를 다시 사용 (한글 글리프 재래스터화 방지)
+# - 기록 페이지를 앞뒤로 넘기거나 기록/결과를 오갈 때 다시 그리지 않음
+# - 개수(cache_size)와 전체 픽셀 바이트(cache_bytes) 둘 다로 제한하는 LRU
+class ResultView(Widget):
+    text = StringProperty("")
+    font_size = NumericProperty(dp(15))
+
+    def __init__(self, scroll_view, cache_size=16, cache_bytes=32 * 1024 * 1024, **kwargs):
+        super().__init__(**kwargs)
+        self.size_hint_y = None
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+        self.hits = 0
+        self.misses = 0
+        self._sv = scroll_view
+        self._cache = OrderedDict()
+        self._bytes = 0
+        self._tex = None
+        # 줄 단위 모드 (실시간 계산): 줄마다 텍스처를 두고 바뀐 줄만 다시 그림
+        self._lines = []
+        self._line_texs = []
+        self._line_cache = {}
+        self._line_rects = []
+        self.line_renders = 0
+        self.render_stats = {"n": 0, "first_ms": 0.0, "sum_ms": 0.0, "max_ms": 0.0}
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self._rect = Rectangle(size=(0, 0))
+            self._line_group = InstructionGroup()
+        # 같은 프레임 안의 text / 폭 변경은 한 번만 처리
+        self._trigger = Clock.create_trigger(self._refresh, -1)
+        self.bind(text=self._trigger, font_size=self._trigger, width=self._trigger)
+        scroll_view.bind(size=self._trigger)
+        self.bind(pos=self._place, size=self._place)
+
+    def _render(self, text, font_size, width):
+        t0 = time.perf_counter()
+        lbl = CoreMarkupLabel(text=text, font_name=FONT, font_size=font_size,
+                              color=(0, 0, 0, 1), text_size=(width, None),
+                              halign="left", valign="top")
+        lbl.refresh()
+        ms = (time.perf_counter() - t0) * 1000.0
+        rs = self.render_stats
+        if not rs["n"]:
+            rs["first_ms"] = ms
+        rs["n"] += 1
+        rs["sum_ms"] += ms
+        rs["max_ms"] = max(rs["max_ms"], ms)
+        return lbl.texture
+
+    def clear(self):
+        """결과 지우기. 줄 단위 모드에서는 text 가 이미 "" 라 text 만 비우면 _refresh 가 안 돌아감"""
+        self._lines = []
+        self._line_texs = []
+        self.text = ""
+        self._refresh()
+
+    def is_empty(self):
+        return not self.text and not self._lines
+
+    def show_lines(self, lines):
+        """줄 목록으로 표시. 이전과 같은 줄은 텍스처를 그대로 쓰고 바뀐 줄만 렌더링"""
+        self._lines = list(lines)
+        if self.text:
+            self.text = ""
+        self._layout_lines()
+
+    def _layout_lines(self):
+        if self.width <= 0:
+            return
+        fs, w = self.font_size, int(self.width)
+        texs = []
+        for line in self._lines:
+            # 빈 줄도 한 줄 높이를 차지하도록 공백으로 렌더링
+            key = (line or " ", fs, w)
+            tex = self._line_cache.get(key)
+            if tex is None:
+                self.line_renders += 1
+                tex = self._line_cache[key] = self._render(*key)
+            texs.append(tex)
+        if len(self._line_cache) > 256:
+            keep = {(line or " ", fs, w) for line in self._lines}
+            self._line_cache = {k: v for k, v in self._line_cache.items() if k in keep}
+        while len(self._line_rects) < len(texs):
+            r = Rectangle(size=(0, 0))
+            self._line_group.add(r)
+            self._line_rects.append(r)
+        self._line_texs = texs
+        self._tex = None
+        self.height = max(self._sv.height, sum(t.height for t in texs))
+        self._fit_scroll()
+        self._place()
+
+    def _refresh(self, *_):
+        if self.width <= 0:
+            return
+        if not self.text and self._lines:
+            self._layout_lines()
+            return
+        self._lines = []
+        self._line_texs = []
+        key = (self.text, self.font_size, int(self.width))
+        tex = self._cache.get(key)
+        if tex is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+        elif self.text:
+            self.misses += 1
+            tex = self._render(*key)
+            if self.cache_size > 0:
+                self._cache[key] = tex
+                self._bytes += tex.width * tex.height * 4
+                while self._cache and (len(self._cache) > self.cache_size
+                                       or self._bytes > self.cache_bytes):
+                    _, old = self._cache.popitem(last=False)
+                    self._bytes -= old.width * old.height * 4
+        self._tex = tex
+        self.height = max(self._sv.height, tex.height if tex else 0)
+        self._fit_scroll()
+        self._place()
+
+    def _fit_scroll(self):
+        # 화면보다 긴 결과(지시길이가 많은 경우)는 스크롤 허용
+        if self.height > self._sv.height:
+            self._sv.do_scroll_y = True
+
+    def _place(self, *_):
+        y = self.top
+        for i, r in enumerate(self._line_rects):
+            if i < len(self._line_texs):
+                t = self._line_texs[i]
+                y -= t.height
+                r.texture = t
+                r.size = t.size
+                r.pos = (self.x, y)
+            else:
+                r.size = (0, 0)
+        tex = self._tex
+        if tex is None:
+            self._rect.size = (0, 0)
+            return
+        self._rect.texture = tex
+        self._rect.size = tex.size
+        self._rect.pos = (self.x, self.top - tex.height)
+
+# 글리프 미리 그리기: 같은 글꼴/크기/굵기의 폰트 객체와 글리프는 Kivy(SDL_ttf)가 재사용하므로
+# 한 번 그려 두면 첫 계산 결과도 폰트 열기 / 래스터화를 기다리지 않음
+def _warm_text(text, font_size, markup=False, bold=False):
+    cls = CoreMarkupLabel if markup else CoreLabel
+    cls(text=text, font_name=FONT, font_size=font_size, bold=bold).refresh()
+
+# ===== 기록 목록 (RecycleView: 화면에 보이는 줄만 위젯 생성/재사용) =====
+class HistoryRow(RecycleDataViewBehavior, ButtonBehavior, Label):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.font_name = FONT
+        self.color = (0, 0, 0, 1)
+        self.markup = True
+        self.halign = "left"
+        self.valign = "middle"
+        self.shorten = True
+        self._rv = None
+        self._index = 0
+        self.bind(size=lambda *_: setattr(self, "text_size", self.size))
+        with self.canvas.before:
+            Color(0.85, 0.85, 0.85, 1)
+            self._line = Rectangle(pos=self.pos, size=(self.width, dp(1)))
+        self.bind(pos=self._sync_line, size=self._sync_line)
+    def _sync_line(self, *_):
+        self._line.pos = self.pos
+        self._line.size = (self.width, dp(1))
+    def refresh_view_attrs(self, rv, index, data):
+        self._rv = rv
+        self._index = index
+        return super().refresh_view_attrs(rv, index, data)
+    def on_release(self, *_):
+        if self._rv is not None:
+            self._rv.on_open(self._index)
+
+class HistoryList(RecycleView):
+    PAGE = 50
+    def __init__(self, on_open, **kwargs):
+        super().__init__(**kwargs)
+        self.on_open = on_open
+        self.history = None
+        self.st = {}
+        self.viewclass = HistoryRow
+        self.do_scroll_x = False
+        self.bar_width = dp(4)
+        lay = RecycleBoxLayout(orientation="vertical", size_hint_y=None,
+                               default_size=(None, dp(38)), default_size_hint=(1, None))
+        lay.bind(minimum_height=lay.setter("height"))
+        self.add_widget(lay)
+        self.bind(scroll_y=self._maybe_load_more)
+
+    def reset(self, history, st):
+        self.history = history
+        self.st = st
+        self.data = []
+        self.scroll_y = 1.0
+        self._load_more()
+
+    def _load_more(self):
+        # 요약은 필요한 만큼만 한 페이지씩 읽음 (전체 기록을 한 번에 읽지 않음)
+        start = len(self.data)
+        total = len(self.history)
+        if start >= total:
+            return False
+        recs = self.history.recent(start, self.PAGE)
+        self.data.extend({"text": build_history_summary(d, total - start - i, self.st)}
+                         for i, d in enumerate(recs))
+        return True
+
+    def _maybe_load_more(self, *_):
+        lay = self.layout_manager
+        if lay is None or self.scroll_y > 0.05 or lay.height <= self.height:
+            return
+        top_px = (1.0 - self.scroll_y) * (lay.height - self.height)
+        if self._load_more():
+            # 줄이 늘어도 보고 있던 위치 유지
+            def _keep(*_):
+                span = self.layout_manager.height - self.height
+                if span > 0:
+                    self.scroll_y = max(0.0, 1.0 - top_px / span)
+            Clock.schedule_once(_keep, 0)
+
 # ===== 메인 화면 =====
 class MainScreen(Screen):
     W_LABEL_CODE  = dp(110)
@@ -264,9 +552,18 @@ class MainScreen(Screen):
         super().__init__(**kwargs)
         self.app = app
         self._showing_history = False
+        self._history_detail = False
         self._history_idx = 0  
         self._last_result_text = ""
+        self._sweeping = False
+        self._clear_popup = None
+        self.formatter = ResultFormatter()
+        # 실시간 계산 (설정 "live_calc")
+        self._live_ev = Clock.create_trigger(self._live_calc, LIVE_DEBOUNCE_S)
+        self._live_t0 = None
+        self.live_stats = {"n": 0, "last_ms": 0.0, "sum_ms": 0.0, "max_ms": 0.0, "over_frame": 0}
         self.build_ui()
+        self.in_total.bind(text=self._on_live_input)
 
     def build_ui(self):
         Window.clearcolor = (0.93, 0.93, 0.93, 1)
@@ -312,8 +609,14 @@ class MainScreen(Screen):
         self.in_code_front = DigitInput(max_len=3, allow_float=False,
                                         width=self.W_INPUT_SHORT)
         self.in_code_front.bind(text=self._auto_move_back)
+        self.in_code_front.bind(text=self._lookup_plan)
+        self.in_code_front.bind(text=self._suggest_codes)
         row_code.add_widget(self.in_code_front)
 
+        # 강번 자동완성 목록 (앞자리 1~2자리 입력 시, 하나를 재사용)
+        self.suggest = DropDown(auto_width=False, width=dp(180), max_height=dp(44*6))
+        self.suggest.bind(on_select=self._pick_code)
+
         dash = Label(text="-0", font_name=FONT, color=(0,0,0,1),
                      size_hint=(None,1), width=dp(22),
                      halign="center", valign="middle")
@@ -322,6 +625,9 @@ class MainScreen(Screen):
 
         self.in_code_back = DigitInput(max_len=1, allow_float=False,
                                        width=self.W_INPUT_BACK)
+        self.in_code_back.bind(text=self._lookup_plan)
+        self.in_code_front.bind(text=self._sync_gauge)
+        self.in_code_back.bind(text=self._sync_gauge)
         row_code.add_widget(self.in_code_back)
         root.add_widget(row_code)
 
@@ -352,55 +658,24 @@ class MainScreen(Screen):
 
         root.add_widget(row_total)
 
-        # 지시길이 1~3
-        grid = GridLayout(cols=4, size_hint=(1,None),
-                          height=dp(30*3 + 8*2),
-                          row_default_height=dp(30),
-                          row_force_default=True,
-                          spacing=dp(6))
-
-        def _lab(text):
-            L = Label(text=text, font_name=FONT, color=(0,0,0,1),
-                      size_hint=(None,1), width=self.W_LABEL_LONG,
-                      halign="right", valign="middle")
-            L.bind(size=lambda *_: setattr(L, "text_size", (L.width, None)))
-            return L
-
-        self.in_p1 = DigitInput(max_len=4, allow_float=True, width=self.W_INPUT_GUIDE)
-        self.in_p2 = DigitInput(max_len=4, allow_float=True, width=self.W_INPUT_GUIDE)
-        self.in_p3 = DigitInput(max_len=4, allow_float=True, width=self.W_INPUT_GUIDE)
-
-        grid.add_widget(_lab("1번 지시길이:"))
-        grid.add_widget(self.in_p1)
-        grid.add_widget(Label()); grid.add_widget(Label())
-
-        grid.add_widget(_lab("2번 지시길이:"))
-        grid.add_widget(self.in_p2)
-        b21 = RoundedButton(text="← 1번", bg_color=[0.8,0.8,0.8,1], fg_color=[0,0,0,1],
-                            size_hint=(None,1), width=dp(58), font_size=dp(17))
-        b21.bind(on_release=lambda *_: self._copy(self.in_p1, self.in_p2))
-        grid.add_widget(b21); grid.add_widget(Label())
-
-        grid.add_widget(_lab("3번 지시길이:"))
-        grid.add_widget(self.in_p3)
-        btn_row = BoxLayout(orientation="horizontal", spacing=dp(6),
-                            size_hint=(None,1), width=dp(58*2+6))
-        b31 = RoundedButton(text="← 1번", bg_color=[0.8,0.8,0.8,1], fg_color=[0,0,0,1],
-                            size_hint=(None,1), width=dp(58), font_size=dp(17))
-        b32 = RoundedButton(text="← 2번", bg_color=[0.8,0.8,0.8,1], fg_color=[0,0,0,1],
-                            size_hint=(None,1), width=dp(58), font_size=dp(17))
-        b31.bind(on_release=lambda *_: self._copy(self.in_p1, self.in_p3))
-        b32.bind(on_release=lambda *_: self._copy(self.in_p2, self.in_p3))
-        btn_row.add_widget(b31); btn_row.add_widget(b32)
-        grid.add_widget(btn_row); grid.add_widget(Label())
-        root.add_widget(grid)
-
-        # 계산 버튼
+        # 지시길이 (행 개수 가변, 1번 행의 -/+ 로 조절)
+        self.guide_rows = GuideRows(self.W_LABEL_LONG, self.W_INPUT_GUIDE,
+                                    on_change=self._on_live_input)
+        root.add_widget(self.guide_rows)
+
+        # 계산 버튼 + 손실 비교 (설정 손실 ± 5 mm 표, 입력하는 대로 갱신)
+        row_calc = BoxLayout(orientation="horizontal", size_hint=(1,None),
+                             height=dp(44), spacing=dp(6))
         btn_calc = RoundedButton(text="계산하기", bg_color=[0.23,0.53,0.23,1],
-                                 fg_color=[1,1,1,1], size_hint=(1,None),
-                                 height=dp(44), radius=dp(10))
+                                 fg_color=[1,1,1,1], size_hint=(1,1), radius=dp(10))
         btn_calc.bind(on_release=lambda *_: self.calculate())
-        root.add_widget(btn_calc)
+        row_calc.add_widget(btn_calc)
+        self.btn_sweep = RoundedButton(text="손실 비교", bg_color=[0.27,0.47,0.7,1],
+                                       fg_color=[1,1,1,1], size_hint=(None,1),
+                                       width=dp(96), radius=dp(10))
+        self.btn_sweep.bind(on_release=lambda *_: self._toggle_sweep())
+        row_calc.add_widget(self.btn_sweep)
+        root.add_widget(row_calc)
 
         # 출력 박스 컨테이너
         out_container = BoxLayout(orientation="vertical", size_hint=(1,1), padding=[0, dp(6), 0, 0])
@@ -428,22 +703,14 @@ class MainScreen(Screen):
 
         # 스크롤 뷰
         self.scroll_view = ScrollView(size_hint=(1, 1), do_scroll_x=False, do_scroll_y=False)
-        self.out = Label(text="", font_name=FONT, color=(0,0,0,1), markup=True,
-                         size_hint_y=None, halign="left", valign="top")
-
-        def _update_rect(*args):
-            if self.out.width <= 0:
-                return
-            self.out.text_size = (self.out.width, None)
-            self.out.texture_update()
-            target_h = max(self.scroll_view.height, self.out.texture_size[1])
-            self.out.height = target_h
-            self.out.text_size = (self.out.width, target_h)
-
-        self.out.bind(width=_update_rect, text=_update_rect)
-        self.scroll_view.bind(size=_update_rect)
+        self.out = ResultView(self.scroll_view)
         self.scroll_view.add_widget(self.out)
-        text_bg.add_widget(self.scroll_view)
+
+        # 결과(스크롤 뷰) / 기록 목록을 바꿔 끼우는 자리
+        self.out_area = BoxLayout(size_hint=(1, 1))
+        self.out_area.add_widget(self.scroll_view)
+        text_bg.add_widget(self.out_area)
+        self.hist_list = HistoryList(on_open=self._open_history_detail, size_hint=(1, 1))
 
         # 페이징 바
         self.nav_bar = BoxLayout(orientation='horizontal', size_hint=(1, None), height=0, opacity=0, spacing=dp(10), padding=[dp(10), 0, dp(10), dp(5)])
@@ -475,6 +742,12 @@ class MainScreen(Screen):
 
     # 초기화 확인 팝업 (라이트 테마 / 바깥 터치 닫기)
     def _confirm_clear(self):
+        # 팝업은 처음 한 번만 만들고 재사용
+        if self._clear_popup is None:
+            self._clear_popup = self._build_clear_popup()
+        self._clear_popup.open()
+
+    def _build_clear_popup(self):
         content = BoxLayout(orientation="vertical", padding=dp(10), spacing=dp(10))
         lbl = Label(text="모든 입력값과 결과를\n초기화하시겠습니까?", font_name=FONT, halign="center", valign="middle", color=(0,0,0,1))
         lbl.bind(size=lambda *_: setattr(lbl, "text_size", lbl.size))
@@ -498,21 +771,19 @@ class MainScreen(Screen):
 
         btn_cancel.bind(on_release=popup.dismiss)
         btn_ok.bind(on_release=lambda *_: self._clear_all(popup))
-
-        popup.open()
+        return popup
 
     def _clear_all(self, popup):
         popup.dismiss()
         self.in_code_front.text = ""
         self.in_code_back.text = ""
         self.in_total.text = ""
-        self.in_p1.text = ""
-        self.in_p2.text = ""
-        self.in_p3.text = ""
-        self.out.text = ""
+        self.guide_rows.clear()
+        self.out.clear()
         self._last_result_text = ""
         self._showing_history = False
         self.btn_history.text = "기록"
+        self._show_panel(self.scroll_view)
         self.nav_bar.height = 0
         self.nav_bar.opacity = 0
         self.scroll_view.scroll_y = 1.0
@@ -522,8 +793,50 @@ class MainScreen(Screen):
         if len(value) >= 3:
             self.in_code_back.focus = True
 
-    def _copy(self, src, dst):
-        dst.text = src.text
+    def _suggest_codes(self, instance, value):
+        cf = (value or "").strip()
+        codes = []
+        if 1 <= len(cf) <= 2 and instance.focus:
+            codes = self.app.codes.prefixed(self.lab_prefix.text + cf, limit=8)
+        dd = self.suggest
+        if not codes:
+            if dd.attach_to is not None:
+                dd.dismiss()
+            return
+        dd.clear_widgets()
+        for code in codes:
+            btn = RoundedButton(text=code, bg_color=[0.93,0.93,0.93,1], fg_color=[0,0,0,1],
+                                size_hint_y=None, height=dp(44), font_size=dp(18))
+            btn.bind(on_release=lambda b: dd.select(b.text))
+            dd.add_widget(btn)
+        if dd.attach_to is None:
+            dd.open(instance)
+
+    def _pick_code(self, dd, code):
+        # "SG94123-01" -> 앞자리 "123", 뒷자리 "1" (뒷자리를 먼저 넣어야 색인 조회가 한 번에 됨)
+        cf, sep, cb = code[len(self.lab_prefix.text):].partition("-0")
+        if sep and cf.isdigit() and cb.isdigit():
+            self.in_code_back.text = cb
+            self.in_code_front.text = cf
+        dd.dismiss()
+
+    def _lookup_plan(self, *_):
+        # 작업지시 색인에 있는 강번이면 입력값과 미리 계산된 결과를 바로 표시
+        cf = (self.in_code_front.text or "").strip()
+        cb = (self.in_code_back.text or "").strip()
+        if len(cf) < 3 or not cb:
+            return
+        code = build_code(self.lab_prefix.text, cf, cb)
+        st = self.app.st
+        ent = self.app.plan.get(code, float(st.get("loss_mm", 15.0)))
+        if ent is None:
+            return
+        self.in_total.text = _num_text(ent["slab"])
+        self.guide_rows.set_values(ent["guides"])
+        if ent["result"] is None:
+            self._show_error_in_box(*ERR_TOO_LONG)
+            return
+        self._show_result(self.formatter.result_text(ent["result"], code, st))
 
     def _show_error_in_box(self, title, msg):
         st = self.app.st
@@ -531,18 +844,27 @@ class MainScreen(Screen):
         title_size = int(base_size * 1.6) 
         
         error_text = f"[color=#E53935][b][size={title_size}sp][!] {title}[/size][/b][/color]\n\n{msg}"
+        self._end_sweep()
         
         self.out.text = error_text
         self._showing_history = False
         self.btn_history.text = "기록"
+        self._show_panel(self.scroll_view)
         self.scroll_view.do_scroll_y = False
         self.scroll_view.scroll_y = 1.0
         
         self.nav_bar.height = 0
         self.nav_bar.opacity = 0
 
+    def _show_panel(self, widget):
+        # 출력 자리에 결과(scroll_view) 또는 기록 목록(hist_list) 중 하나만 둠
+        if widget.parent is not self.out_area:
+            self.out_area.clear_widgets()
+            self.out_area.add_widget(widget)
+
     def _show_history_btn(self, show: bool):
-        self.btn_history.disabled = not show
+        # 기록은 첫 화면 이후 백그라운드로 읽음 -> 다 읽기 전에는 눌리지 않게
+        self.btn_history.disabled = not show or self.app.calc_history is None
         self.btn_bar_inner.height = dp(32) if show else 0
         self.btn_bar_inner.opacity = 1 if show else 0
 
@@ -568,8 +890,7 @@ class MainScreen(Screen):
         self.nav_bar.height = dp(40)
         self.nav_bar.opacity = 1
 
-        rev_history = list(reversed(history))
-        total = len(rev_history)
+        total = len(history)
         
         self.lab_page.text = f"[b]{self._history_idx + 1} / {total}[/b]"
         self.lab_page.markup = True
@@ -580,15 +901,20 @@ class MainScreen(Screen):
         self.btn_next.disabled = (self._history_idx == total - 1)
         self.btn_next.opacity = 0.3 if self._history_idx == total - 1 else 1
         
-        d = rev_history[self._history_idx]
+        # 최신 기록이 1페이지: 해당 기록 1건만 읽음
+        d = history[total - 1 - self._history_idx]
         real_calc_num = total - self._history_idx
         self.out.text = self._build_single_history_text(d, real_calc_num)
         self.scroll_view.scroll_y = 1.0
 
     def _toggle_history(self):
-        if self._showing_history:
+        if self._showing_history and self._history_detail:
+            # 상세 -> 목록
+            self._show_history_list(reset=False)
+        elif self._showing_history:
             self._showing_history = False
             self.btn_history.text = "기록"
+            self._show_panel(self.scroll_view)
             self.out.text = self._last_result_text
             self.scroll_view.do_scroll_y = False
             self.scroll_view.scroll_y = 1.0
@@ -596,77 +922,165 @@ class MainScreen(Screen):
             self.nav_bar.height = 0
             self.nav_bar.opacity = 0
         else:
+            self._end_sweep()
             self._showing_history = True
-            self.btn_history.text = "돌아가기"
-            self._history_idx = 0  
-            self._update_history_page()
-            self.scroll_view.do_scroll_y = True
-            self.scroll_view.scroll_y = 1.0
+            self._show_history_list(reset=True)
 
-    def _build_single_history_text(self, d: dict, real_idx: int) -> str:
-        st = self.app.st
-        do_round = bool(st.get("round", False))
-        hide_mm  = bool(st.get("hide_mm", False))
-        unit = "" if hide_mm else " mm"
-
-        def fmt(x):
-            return f"{round_half_up(x)}" if do_round else f"{x:.1f}"
+    def _show_history_list(self, reset):
+        self._history_detail = False
+        self.btn_history.text = "돌아가기"
+        self.nav_bar.height = 0
+        self.nav_bar.opacity = 0
+        history = self.app.calc_history
+        if not history:
+            self._show_panel(self.scroll_view)
+            self.out.text = "(계산 기록이 없습니다)"
+            return
+        if reset or not self.hist_list.data:
+            self.hist_list.reset(history, self.app.st)
+        self._show_panel(self.hist_list)
+
+    def _open_history_detail(self, idx):
+        # 목록에서 누른 기록만 전체 내용을 읽어 표시 (이전/다음 페이징 유지)
+        self._history_detail = True
+        self.btn_history.text = "목록"
+        self._history_idx = idx
+        self._show_panel(self.scroll_view)
+        self._update_history_page()
+        self.scroll_view.do_scroll_y = True
+        self.scroll_view.scroll_y = 1.0
 
-        lines = []
-        
-        time_str = d.get("timestamp", "과거 기록")
-        lines.append(f"━━ [ {time_str} ] ━━")
-        
-        if d.get("code"):
-            lines.append(f"강번: {d['code']}")
-        lines.append(f"Slab 실길이: {fmt(d['slab'])}{unit}")
-        for i, g in enumerate(d["guides"], 1):
-            lines.append(f"{i}번 지시길이: {fmt(g)}{unit}")
-        lines.append("")
-        lines.append("■ 절단 손실 계산 ■")
-        n = len(d["guides"])
-        lines.append(f"손실 1회: {fmt(d['loss'])}{unit}")
-        lines.append(f"절단 횟수: {n-1}회")
-        lines.append(f"전체 손실: {fmt(d['loss'])} × {n-1} = {fmt(d['total_loss'])}{unit}")
-        lines.append("")
-        lines.append("■ 여유길이 배분 ■")
-        lines.append(f"지시길이 합계: {fmt(sum(d['guides']))}{unit}")
-        lines.append(f"전체 손실: {fmt(d['total_loss'])}{unit}")
-        lines.append(f"여유길이: {fmt(d['remain'])}{unit} → 각 +{fmt(d['add_each'])}{unit}")
-        lines.append("")
-        
-        lines.append("■ 시각화 (절단 마킹 포인트) ■")
-        visual = "H"
-        loss_val = d.get("loss", 15.0)
-        for i, r in enumerate(d["real"], 1):
-            mark = round_half_up(r + loss_val/2) if do_round else (r + loss_val/2)
-            mark_s = f"{int(mark)}" if do_round else f"{mark:.1f}"
-            visual += f"-{i}번({mark_s})-"
-        visual += "T"
-        lines.append(visual)
-
-        return "\n".join(lines)
+    def _build_single_history_text(self, d: dict, real_idx: int) -> str:
+        # 같은 기록을 다시 볼 때는 캐시된 문구 사용
+        return self.formatter.history_text(d, real_idx, self.app.st)
 
     def apply_settings(self, st: dict):
+        self.formatter.invalidate()
         self.lab_prefix.text = st.get("prefix", "SG94") or "SG94"
         self.out.font_size = dp(int(st.get("out_font", 15)))
         show_hist = bool(st.get("show_history", False))
         self._show_history_btn(show_hist)
+        # 손실 등 설정이 바뀌면 실시간 결과도 다시 계산
+        self._on_live_input()
+
+    # ----- 실시간 계산 -----
+    def _on_live_input(self, *_):
+        self._sync_gauge()
+        if not (self.app.st.get("live_calc", False) or self._sweeping):
+            return
+        if self._live_t0 is None:
+            self._live_t0 = time.perf_counter()
+        self._live_ev.cancel()
+        self._live_ev()
+
+    def _live_calc(self, *_):
+        # 기록은 남기지 않음 (계산하기를 눌러야 저장)
+        t0, self._live_t0 = self._live_t0, None
+        if self._showing_history:
+            return
+        slab = _num_or_none(self.in_total.text)
+        guides, err = check_inputs(slab, self.guide_rows.values())
+        if err:
+            # 입력 중인 값은 오류로 띄우지 않고 이전 결과를 그대로 둠
+            return
+        st = self.app.st
+        if self._sweeping:
+            self._show_panel(self.scroll_view)
+            self.out.show_lines(self._sweep_lines(slab, guides))
+            return
+        result = _compute(slab, guides, float(st.get("loss_mm", 15.0)))
+        if result is None:
+            lines = ["[color=#E53935][b][!] " + ERR_TOO_LONG[0] + "[/b][/color]", "", ERR_TOO_LONG[1]]
+        else:
+            code_str = build_code(self.lab_prefix.text,
+                                  self.in_code_front.text, self.in_code_back.text)
+            text = self.formatter.result_text(result, code_str, st)
+            self._last_result_text = text
+            lines = text.split("\n")
+        self._show_panel(self.scroll_view)
+        self.out.show_lines(lines)
+        if t0 is not None:
+            ms = (time.perf_counter() - t0) * 1000.0
+            ls = self.live_stats
+            ls["n"] += 1
+            ls["last_ms"] = ms
+            ls["sum_ms"] += ms
+            ls["max_ms"] = max(ls["max_ms"], ms)
+            if ms > FRAME_MS:
+                ls["over_frame"] += 1
+
+    # ----- 길이 게이지 -----
+    def _sync_gauge(self, *_):
+        # 측정값과 짝지을 강번 / 지시길이 / 손실을 수신 스레드에 넘김
+        gauge = self.app.gauge
+        if gauge is None:
+            return
+        code_str = build_code(self.lab_prefix.text,
+                              self.in_code_front.text, self.in_code_back.text)
+        guides = [v for v in self.guide_rows.values() if v is not None and v > 0]
+        gauge.set_context(code_str, guides, float(self.app.st.get("loss_mm", 15.0)))
+
+    def _on_gauge_results(self, items):
+        # 수신 스레드가 계산한 결과 (UI 스레드, 몰려 온 경우 마지막 측정값만 표시)
+        it = items[-1]
+        self.in_total.text = _num_text(it["slab"])
+        if self._sweeping or self._showing_history:
+            # 손실 비교는 in_total 변경으로 다시 계산됨
+            return
+        self._live_ev.cancel()
+        self._live_t0 = None
+        if it["result"] is None:
+            if it["error"] is not ERR_TOO_LONG:
+                return      # 지시길이 입력 전
+            lines = ["[color=#E53935][b][!] " + ERR_TOO_LONG[0] + "[/b][/color]", "", ERR_TOO_LONG[1]]
+        else:
+            text = self.formatter.result_text(it["result"], it["code"], self.app.st)
+            self._last_result_text = text
+            lines = text.split("\n")
+        self._show_panel(self.scroll_view)
+        self.out.show_lines(lines)
+
+    # ----- 손실 비교 -----
+    def _sweep_lines(self, slab, guides):
+        st = self.app.st
+        loss = float(st.get("loss_mm", 15.0))
+        from slab_sweep import sweep, loss_steps, sweep_lines
+        res = sweep(slab, guides, loss_steps(loss))
+        return sweep_lines(res, compile_plan(st), len(guides), to_units(loss))
+
+    def _toggle_sweep(self):
+        if self._sweeping:
+            self._end_sweep()
+            self._show_panel(self.scroll_view)
+            self.out.text = self._last_result_text
+            self.scroll_view.do_scroll_y = False
+            self.scroll_view.scroll_y = 1.0
+            return
+        slab = _num_or_none(self.in_total.text)
+        guides, err = check_inputs(slab, self.guide_rows.values())
+        if err:
+            self._show_error_in_box(*err)
+            return
+        self._showing_history = False
+        self.btn_history.text = "기록"
+        self.nav_bar.height = 0
+        self.nav_bar.opacity = 0
+        self._sweeping = True
+        self.btn_sweep.text = "결과 보기"
+        self._show_panel(self.scroll_view)
+        self.out.show_lines(self._sweep_lines(slab, guides))
+        self.scroll_view.scroll_y = 1.0
+
+    def _end_sweep(self):
+        self._sweeping = False
+        self.btn_sweep.text = "손실 비교"
 
     def calculate(self):
         try:
             slab = _num_or_none(self.in_total.text)
-            p1, p2, p3 = map(_num_or_none,
-                             [self.in_p1.text, self.in_p2.text, self.in_p3.text])
-            
-            if slab is None or slab <= 0:
-                self._show_error_in_box("입력 오류", "Slab 실길이를 올바르게 입력하세요.")
-                return
-            
-            guides = [v for v in (p1, p2, p3) if v is not None and v > 0]
-            
-            if len(guides) < 2:
-                self._show_error_in_box("입력 부족", "최소 2개 이상의 지시길이를 입력하세요.")
+            guides, err = check_inputs(slab, self.guide_rows.values())
+            if err:
+                self._show_error_in_box(*err)
                 return
 
             st   = self.app.st
@@ -674,79 +1088,46 @@ class MainScreen(Screen):
             result = _compute(slab, guides, loss)
             
             if result is None:
-                self._show_error_in_box("계산 불가", "절단 길이가 부족합니다.\n입력하신 길이를 다시 확인하세요.")
+                self._show_error_in_box(*ERR_TOO_LONG)
                 return
 
-            cf = (self.in_code_front.text or "").strip()
-            cb = (self.in_code_back.text or "").strip()
-            code_str = f"{self.lab_prefix.text}{cf}-0{cb}" if (cf and cb) else ""
+            code_str = build_code(self.lab_prefix.text,
+                                  self.in_code_front.text, self.in_code_back.text)
             record = dict(result)
             record["code"] = code_str
-            record["timestamp"] = datetime.now().strftime("%m-%d %H:%M:%S")
-            
-            self.app.calc_history.append(record)
-            if len(self.app.calc_history) > MAX_HISTORY:
-                self.app.calc_history.pop(0)
+            now = datetime.now()
+            record["timestamp"] = now.strftime("%m-%d %H:%M:%S")
+            record["ts"] = now.timestamp()
             
-            # [빌드용] 전역 변수 대신, App 객체에 저장된 안전한 경로 사용
-            save_history(self.app.history_file, self.app.calc_history)
-
-            do_round = bool(st.get("round", False))
-            hide_mm  = bool(st.get("hide_mm", False))
-            unit = "" if hide_mm else " mm"
-            def fmt(x):
-                return f"{round_half_up(x)}" if do_round else f"{x:.1f}"
-
-            lines_top = []
-            if code_str:
-                lines_top.append(f"▶ 강번: {code_str}\n")
-            lines_top.append(f"▶ Slab 실길이: {fmt(slab)}{unit}")
-            for i, g in enumerate(guides, 1):
-                lines_top.append(f"▶ {i}번 지시길이: {fmt(g)}{unit}")
-            lines_top.append(
-                f"▶ 절단 손실: {fmt(loss)}{unit} × {len(guides)-1}"
-                f" = {fmt(result['total_loss'])}{unit}"
-            )
-            lines_top.append(
-                f"▶ 전체 여유길이: {fmt(result['remain'])}{unit}"
-                f" → 각 +{fmt(result['add_each'])}{unit}\n"
-            )
-
-            sec_real = ["▶ 절단 후 예상 길이:"]
-            for i, r in enumerate(result["real"], 1):
-                sec_real.append(f"   {i}번: {fmt(r)}{unit}")
-
-            visual = "H"
-            for i, r in enumerate(result["real"], 1):
-                mark = round_half_up(r + loss/2) if do_round else (r + loss/2)
-                mark_s = f"{int(mark)}" if do_round else f"{mark:.1f}"
-                visual += f"-{i}번({mark_s})-"
-            visual += "T"
-            sec_vis = ["\n▶ 시각화 (절단 마킹 포인트):", visual]
-
-            if bool(st.get("swap_sections", False)):
-                lines_bottom = sec_vis + [""] + sec_real
-            else:
-                lines_bottom = sec_real + [""] + sec_vis
-
-            result_text = "\n".join(lines_top + [""] + lines_bottom)
-            
-            self._last_result_text = result_text
-            self._showing_history  = False
-            self.btn_history.text  = "기록"
-            self.out.text          = result_text
-            self.scroll_view.do_scroll_y = False
-            
-            self.nav_bar.height = 0
-            self.nav_bar.opacity = 0
+            # 기록 1건만 추가 (전체 다시 쓰기 없음)
+            self.app.add_history(record)
+            self.app.codes.add(code_str)
 
-            show_hist = bool(st.get("show_history", False))
-            self._show_history_btn(show_hist)
+            self._show_result(self.formatter.result_text(result, code_str, st))
 
         except Exception as e:
             self._show_error_in_box("알 수 없는 오류", f"오류 내용: {e}")
             raise
 
+    def _show_result(self, result_text):
+        self._end_sweep()
+        self._last_result_text = result_text
+        self._showing_history  = False
+        self.btn_history.text  = "기록"
+        self._show_panel(self.scroll_view)
+        self.scroll_view.do_scroll_y = False
+        if self.app.st.get("live_calc", False):
+            # 실시간 결과와 같은 줄은 다시 렌더링하지 않음
+            self.out.show_lines(result_text.split("\n"))
+        else:
+            self.out.text      = result_text
+        
+        self.nav_bar.height = 0
+        self.nav_bar.opacity = 0
+
+        show_hist = bool(self.app.st.get("show_history", False))
+        self._show_history_btn(show_hist)
+
 # ===== 설정 화면 =====
 class SettingsScreen(Screen):
     def __init__(self, app, **kwargs):
@@ -766,6 +1147,9 @@ class SettingsScreen(Screen):
         self.ed_loss.text        = f"{float(st.get('loss_mm', 15.0)):.0f}"
         self.sw_history.active   = bool(st.get("show_history", False))
         self.sw_swap.active      = bool(st.get("swap_sections", False))
+        self.sw_live.active      = bool(st.get("live_calc", False))
+        self.ed_gauge.text       = st.get("gauge_addr", "") or ""
+        self.ed_sync.text        = st.get("sync_url", "") or ""
 
     def _black(self, text):
         lab = Label(text=text, font_name=FONT, color=(0,0,0,1),
@@ -861,6 +1245,26 @@ class SettingsScreen(Screen):
         root.add_widget(self._indent_row(self.sw_swap,
                                          self._gray("절단 예상 길이를 아래로")))
 
+        # 8. 실시간 계산
+        root.add_widget(self._black("8. 실시간 계산"))
+        self.sw_live = PillSwitch(active=bool(self.app.st.get("live_calc", False)))
+        root.add_widget(self._indent_row(self.sw_live,
+                                         self._gray("입력하는 대로 결과 표시 (기록은 계산하기)")))
+
+        # 9. 길이 게이지 연결
+        root.add_widget(self._black("9. 길이 게이지 연결"))
+        self.ed_gauge = AddrInput(width=dp(170))
+        self.ed_gauge.text = self.app.st.get("gauge_addr", "") or ""
+        root.add_widget(self._indent_row(self.ed_gauge,
+                                         self._gray("host:port (비우면 끔)")))
+
+        # 10. 교대 서버 동기화
+        root.add_widget(self._black("10. 교대 서버 동기화"))
+        self.ed_sync = AddrInput(width=dp(170), max_len=80)
+        self.ed_sync.text = self.app.st.get("sync_url", "") or ""
+        root.add_widget(self._indent_row(self.ed_sync,
+                                         self._gray("http://host:port (비우면 끔)")))
+
         # 여백 + 버전
         root.add_widget(Widget(size_hint=(1,1)))
         sig = Label(text="버전 1.1", font_name=FONT, color=(0.4,0.4,0.4,1),
@@ -890,11 +1294,25 @@ class SettingsScreen(Screen):
                 "loss_mm":       float(loss),
                 "show_history":  bool(self.sw_history.active),
                 "swap_sections": bool(self.sw_swap.active),
+                "live_calc":     bool(self.sw_live.active),
+                "gauge_addr":    (self.ed_gauge.text or "").strip(),
+                "sync_url":      (self.ed_sync.text or "").strip(),
             })
             # [빌드용] 전역 변수 대신, App 객체에 저장된 안전한 경로 사용
-            save_settings(self.app.settings_file, st)
+            # 저장은 작업 스레드에서 (UI 는 기다리지 않음)
+            self.app.persist.submit("settings", partial(save_settings, self.app.settings_file, st))
+            prefix_changed = st["prefix"] != self.app.st.get("prefix")
+            gauge_changed = st["gauge_addr"] != self.app.st.get("gauge_addr", "")
+            sync_changed = st["sync_url"] != self.app.st.get("sync_url", "")
             self.app.st = st
+            if gauge_changed:
+                self.app.start_gauge()
+            if sync_changed:
+                self.app.start_sync()
             self.app.main_screen.apply_settings(st)
+            if prefix_changed:
+                # 앞자리/뒷자리로 적힌 작업지시는 강번 고정부가 바뀌면 다시 색인
+                self.app.load_plan(force=True)
             self.app.open_main()
         except Exception:
             self.app.open_main()
@@ -907,24 +1325,295 @@ class SlabApp(App):
         
         # 파일 경로 동적 생성
         self.settings_file = os.path.join(self.user_data_dir, "settings.json")
-        self.history_file = os.path.join(self.user_data_dir, "calc_history.json")
         
         self.st = load_settings(self.settings_file)
-        self.calc_history = load_history(self.history_file)
+        # 기록 추가는 저장 작업 스레드가 모아서 씀
+        self.persist = PersistWorker()
+        self.persist.start()
+        # 기록 저장소 / 열 보관소는 첫 프레임 이후 백그라운드로 엶 (_load_history)
+        # 그 전에 계산한 기록은 _early 에 두었다가 열리면 넘김
+        self.calc_history = None
+        self.archive = None
+        self._early = []
+        # 작업지시 색인 (첫 화면 이후 백그라운드로 읽음)
+        self.plan = PlanIndex()
+        # 길이 게이지 수신 (설정 "gauge_addr", 첫 화면 이후 연결)
+        self.gauge = None
+        # 교대 서버 동기화 (설정 "sync_url", 기록 싱크로 붙임, 바꿔 끼우기는 _switch_sync)
+        self.sync = None
+        self._sync_gen = 0
+        self._sync_lock = threading.Lock()
+        # 강번 자동완성 색인 (작업지시 + 지난 기록, 기록 쪽은 기록을 열 때 채움)
+        self.codes = CodeIndex()
         
         self.sm = ScreenManager(transition=NoTransition())
         self.main_screen = MainScreen(self, name="main")
-        self.settings_screen = SettingsScreen(self, name="settings")
+        # 설정 화면은 처음 열 때 만듦 (open_settings)
+        self.settings_screen = None
         self.sm.add_widget(self.main_screen)
-        self.sm.add_widget(self.settings_screen)
         self.sm.current = "main"
+        self._t_built = time.perf_counter()
         return self.sm
 
+    def on_start(self):
+        if _STARTUP_PROBE:
+            Window.bind(on_flip=self._on_first_frame)
+        Window.bind(on_flip=self._after_first_frame)
+        Clock.schedule_once(lambda dt: self.load_plan(), 0)
+        Clock.schedule_once(lambda dt: self.start_gauge(), 0)
+
+    def start_gauge(self):
+        # 주소가 바뀌면 이전 연결을 끊고 다시 시작
+        if self.gauge is not None:
+            self.gauge.stop()
+            self.gauge = None
+        addr = (self.st.get("gauge_addr") or "").strip()
+        if not addr:
+            return
+        from slab_gauge import GaugeIngest
+        try:
+            gauge = GaugeIngest(addr, lambda fn: Clock.schedule_once(lambda dt: fn(), 0),
+                                self.main_screen._on_gauge_results)
+        except ValueError as e:
+            print(f"게이지 연결 안 함: {e}")
+            return
+        self.gauge = gauge
+        self.main_screen._sync_gauge()
+        gauge.start()
+
+    def load_plan(self, force=False):
+        # user_data_dir 또는 내부 저장소 Download 폴더의 work_orders.csv / .jsonl
+        download = os.path.join(os.environ.get("EXTERNAL_STORAGE", "/sdcard"), "Download")
+        path = find_plan_file([self.user_data_dir, download])
+        if not path:
+            return
+        if force:
+            self.plan.path = None
+        self.plan.start(path, self.st.get("prefix", "SG94") or "SG94",
+                        float(self.st.get("loss_mm", 15.0)),
+                        on_done=self._plan_loaded)
+
+    def _plan_loaded(self, idx):
+        # 작업지시 스레드에서 호출됨
+        if idx.error:
+            print(f"작업지시 읽기 실패: {idx.error}")
+            return
+        self.codes.update(idx.codes())
+        if _STATS:
+            print(f"작업지시 {len(idx)}건 색인 ({idx.load_ms:.0f} ms, 제외 {idx.skipped})")
+
+    def _on_first_frame(self, *_):
+        Window.unbind(on_flip=self._on_first_frame)
+        now = time.perf_counter()
+        print(f"SLAB_STARTUP import_ms={(_T_IMPORTED - _T_START)*1000:.1f} "
+              f"build_ms={(self._t_built - _T_IMPORTED)*1000:.1f} "
+              f"first_frame_ms={(now - _T_START)*1000:.1f} "
+              f"wall={time.time():.6f}", flush=True)
+        if _STARTUP_PROBE == "exit":
+            self.stop()
+
+    def on_pause(self):
+        self.persist.flush()
+        return True
+
+    def on_resume(self):
+        # 작업지시 파일이 바뀌었으면 다시 읽음 (수정 시각 비교)
+        self.load_plan()
+
+    # ----- 기록 (첫 프레임 이후) -----
+    def _after_first_frame(self, *_):
+        Window.unbind(on_flip=self._after_first_frame)
+        threading.Thread(target=self._load_history, name="slab-history", daemon=True).start()
+        Clock.schedule_once(self._warm_glyphs, 0)
+
+    # ----- 글리프 미리 그리기 (첫 프레임 이후, 한 프레임에 한 단계) -----
+    def _warm_glyphs(self, *_):
+        st = self.st
+        out_fs = dp(int(st.get("out_font", 15)))
+        steps = []
+        try:
+            # 결과 화면과 같은 경로 (마크업, 굵게 포함)
+            result = _compute(9000.0, [2950.0, 3000.0, 2900.0], float(st.get("loss_mm", 15.0)))
+            code_str = build_code(st.get("prefix", "SG94") or "SG94", "00000", "0")
+            steps.append((self.main_screen.formatter.result_text(result, code_str, st), out_fs, True))
+        except Exception:
+            pass
+        try:
+            with open(GLYPHS_PATH, "r", encoding="utf-8") as f:
+                chars = f.read().strip("\n")
+        except OSError:
+            chars = ""
+        if chars:
+            # 64 글자씩 줄바꿈 (텍스처 최대 폭 초과 방지)
+            block = "\n".join(chars[i:i + 64] for i in range(0, len(chars), 64))
+            # 결과(보통/굵게), 입력칸 dp(17), 기본 Label 15sp, 팝업 제목 14sp
+            steps += [(block, out_fs), (block, out_fs, False, True),
+                      (block, dp(17)), (block, sp(15)), (block, sp(14))]
+        self.warm_ms = 0.0
+        Clock.schedule_once(partial(self._warm_step, steps, 0), 0)
+
+    def _warm_step(self, steps, i, *_):
+        if i >= len(steps):
+            if _STATS:
+                print(f"글리프 미리 그리기: {len(steps)}단계 {self.warm_ms:.0f} ms", flush=True)
+            return
+        t0 = time.perf_counter()
+        try:
+            _warm_text(*steps[i])
+        except Exception as e:
+            print(f"글리프 미리 그리기 실패: {e}")
+            return
+        self.warm_ms += (time.perf_counter() - t0) * 1000.0
+        Clock.schedule_once(partial(self._warm_step, steps, i + 1), 0)
+
+    def _load_history(self):
+        # 작업 스레드: SQLite 기록 저장소 (예전 calc_history.json / .jsonl 은 자동 이전) + 열 보관소
+        # 기록 파일을 못 열면 메모리 저장소로 대신함 (이번 실행의 기록/기록 버튼은 그대로 쓸 수 있음)
+        t0 = time.perf_counter()
+        from slab_store import open_history, open_memory_history
+        error = None
+        try:
+            store = open_history(self.user_data_dir, keep=MAX_HISTORY)
+        except Exception as e:
+            print(f"기록 열기 실패: {e}")
+            error = str(e)
+            try:
+                store = open_memory_history(keep=MAX_HISTORY)
+            except Exception as e2:
+                print(f"임시 기록 저장소 열기 실패: {e2}")
+                store = None
+        try:
+            from slab_archive import open_archive
+            archive = open_archive(self.user_data_dir)
+        except Exception as e:
+            print(f"수율 보관소 열기 실패: {e}")
+            archive = None
+        self.history_load_ms = (time.perf_counter() - t0) * 1000.0
+        Clock.schedule_once(lambda dt: self._history_loaded(archive, store, error), 0)
+        if store is not None:
+            self.codes.update(store.codes())
+
+    def _history_loaded(self, archive, store, error=None):
+        if error is not None:
+            ms = self.main_screen
+            if ms.out.is_empty():   # 이미 보여 주는 계산 결과(실시간 줄 포함)는 덮지 않음
+                ms._show_error_in_box("기록 오류", f"기록 파일을 열 수 없습니다.\n이번 실행의 기록만 보관합니다.\n({error})")
+        if store is None:
+            return
+        self.archive = archive
+        self.calc_history = HistoryQueue(store, self.persist, sinks=[archive] if archive is not None else [])
+        # 수율 집계용 열 보관소가 비어 있으면 지난 기록을 채움 (저장소는 묶음 단위로 읽음, 전체를 올리지 않음)
+        if archive is not None and len(archive) == 0 and len(store) > 0:
+            n0 = len(store)
+            self.persist.submit("archive-backfill",
+                                lambda: archive.append_many(islice(store, n0)))
+        early, self._early = self._early, []
+        for rec in early:
+            self.calc_history.append(rec)
+        self.main_screen._show_history_btn(bool(self.st.get("show_history", False)))
+        self.start_sync()
+
+    def add_history(self, record):
+        if self.calc_history is None:
+            self._early.append(record)
+        else:
+            self.calc_history.append(record)
+
+    def start_sync(self):
+        # 보내기함 읽기 / 전송은 모두 slab-sync 스레드.
+        # 이전 동기화 스레드는 urlopen(최대 timeout 초) 중일 수 있으므로 멈추고 바꿔 끼우는 일은
+        # UI 스레드 밖에서 (_switch_sync)
+        if self.calc_history is None:
+            return      # 기록을 연 뒤 _history_loaded 에서 다시 호출됨
+        self._sync_gen += 1
+        threading.Thread(target=self._switch_sync, args=(self._sync_gen,),
+                         name="slab-sync-switch", daemon=True).start()
+
+    def _switch_sync(self, gen):
+        # 한 번에 하나씩: 이전 스레드가 완전히 끝난 뒤에만 새로 만듦 (같은 보내기함 / 상태 파일)
+        with self._sync_lock:
+            if gen != self._sync_gen:
+                return      # 뒤따라 바뀐 설정이 있음 (그쪽에서 처리)
+            old = self.sync
+            if old is not None:
+                # 멈추는 동안 들어온 기록도 old 가 보내기함에 써 두므로 새 스레드가 이어서 보냄
+                old.stop(timeout=None)
+            url = (self.st.get("sync_url") or "").strip()
+            new = None
+            if url:
+                from slab_sync import open_sync
+                new = open_sync(self.user_data_dir, url)
+            done = threading.Event()
+            def _swap():
+                # 싱크 호출(HistoryQueue._drain)과 같은 저장 스레드에서 바꿈 -> 옛/새 싱크가 함께 쓰지 않음
+                try:
+                    hist = self.calc_history
+                    hist.sinks = [s for s in hist.sinks if s is not old] + ([new] if new else [])
+                    self.sync = new
+                    if new is not None:
+                        new.start()
+                        # 처음 켠 기기면 지금까지의 기록을 한 번 보내기함에 넣음 (이후로는 새 기록만)
+                        # 저장소는 묶음 단위로 읽음 (전체를 메모리에 올리지 않음)
+                        new._ready.wait()
+                        n0 = len(hist.store)
+                        if new.fresh and n0:
+                            new.append_many(islice(hist.store, n0))
+                finally:
+                    done.set()
+            self.persist.submit("sync-switch", _swap)
+            done.wait(30.0)
+
+    def on_stop(self):
+        if self.gauge is not None:
+            self.gauge.stop()
+            m = self.gauge.metrics()
+            if _STATS and m["readings"]:
+                print(f"게이지: {m['readings']}건, 묶음 최대 {m['max_batch']}, "
+                      f"수신→화면 p50 {m['ui_p50_ms']:.1f} ms / p95 {m['ui_p95_ms']:.1f} ms / "
+                      f"최대 {m['ui_max_ms']:.1f} ms, 역압 대기 {m['queue_waits'] + m['outbox_waits']}회",
+                      flush=True)
+        if self.calc_history is None and self._early:
+            # 기록을 다 열기 전에 종료: 그동안 계산한 기록만 바로 씀
+            try:
+                from slab_store import open_history
+                open_history(self.user_data_dir, keep=MAX_HISTORY).append_many(self._early)
+            except Exception:
+                pass
+        self.persist.stop()
+        st = self.persist.stats()
+        if _STATS:
+            print(f"저장 작업: {st['writes']}회 (합침 {st['coalesced']}, 오류 {st['errors']}), "
+                  f"평균 {st['avg_ms']:.1f} ms / 최대 {st['max_ms']:.1f} ms", flush=True)
+        ls = self.main_screen.live_stats
+        if _STATS and ls["n"]:
+            print(f"실시간 계산: {ls['n']}회, 입력→결과 평균 {ls['sum_ms'] / ls['n']:.1f} ms / "
+                  f"최대 {ls['max_ms']:.1f} ms, 한 프레임 초과 {ls['over_frame']}회 "
+                  f"(줄 렌더링 {self.main_screen.out.line_renders}회)", flush=True)
+        rs = self.main_screen.out.render_stats
+        if _STATS and rs["n"]:
+            print(f"결과 렌더링: {rs['n']}회, 처음 {rs['first_ms']:.1f} ms / "
+                  f"평균 {rs['sum_ms'] / rs['n']:.1f} ms / 최대 {rs['max_ms']:.1f} ms", flush=True)
+        if self.sync is not None:
+            # 남은 기록은 보내기함에 있으므로 다음 실행 때 이어서 보냄
+            self.sync.stop(timeout=1.0)
+            ss = self.sync.stats
+            if _STATS and (ss["batches"] or ss["failures"]):
+                print(f"동기화: {ss['sent']}건 / {ss['batches']}묶음, "
+                      f"{ss['raw_bytes']:,} → {ss['sent_bytes']:,} bytes, 실패 {ss['failures']}회, "
+                      f"남은 {self.sync.pending()}건", flush=True)
+        if self.calc_history is not None:
+            self.calc_history.close()
+
     def open_settings(self):
+        if self.settings_screen is None:
+            self.settings_screen = SettingsScreen(self, name="settings")
+            self.sm.add_widget(self.settings_screen)
         self.sm.current = "settings"
 
     def open_main(self):
         self.sm.current = "main"
 
+_T_IMPORTED = time.perf_counter()
+
 if __name__ == "__main__":
     SlabApp().run()
@@ -0,0 +1,303 @@
+#-*- coding: utf-8 -*-
+# 계산 기록 열(column) 보관소 - 교대/일/월 단위 손실·수율 집계용
+# - 기록 1건 = 열 파일마다 고정 폭 값 1개 (ts f64, day/slab/total_loss/remain i32, prefix/n u16)
+#   길이는 0.1 mm 정수, day 는 현지 날짜 서수(date.toordinal)
+# - 추가만 함 (끝에 붙이고 fsync). 읽을 때는 mmap, numpy 가 있으면 numpy.memmap 으로 벡터 스캔
+# - 날짜 x 강번 고정부(prefix)별 합계는 추가할 때마다 갱신해 summary.json 에 저장
+#   -> 일별 / 고정부별 조회는 열을 읽지 않음. 임의 시간대(교대)·백분위만 스캔
+# - 비정상 종료로 열 길이가 어긋나면 열 때 가장 짧은 열에 맞춰 자르고 일별 합계를 다시 만듦
+
+import os, sys, re, json, mmap, threading, argparse
+from array import array
+from datetime import date, datetime
+
+from slab_core import atomic_write
+from slab_fixed import SCALE, to_units
+
+try:
+    import numpy as np
+except ImportError:  # 앱(APK)에는 numpy 가 없음 -> 스캔은 mmap + 파이썬 루프
+    np = None
+
+COLUMNS = (("ts", "d"), ("day", "i"), ("prefix", "H"), ("n", "H"),
+           ("slab", "i"), ("total_loss", "i"), ("remain", "i"))
+_NP_TYPES = {"d": "<f8", "i": "<i4", "H": "<u2"}
+_LENGTHS = ("slab", "total_loss", "remain")
+_CODE = re.compile(r"^(.*?)\d{3}-0\d$")
+
+def code_prefix(code):
+    """강번 고정부: "SG94123-01" -> "SG94" (형식이 다르면 강번 전체)"""
+    m = _CODE.match(code or "")
+    return m.group(1) if m else (code or "")
+
+def _day(x):
+    # date / "YYYY-MM-DD" / 서수 -> 서수
+    if x is None or isinstance(x, int):
+        return x
+    if isinstance(x, str):
+        x = date.fromisoformat(x)
+    return x.toordinal()
+
+def _agg(count, slab, total_loss, remain):
+    # 0.1 mm 합계 -> mm, 수율 = 지시길이 합 / Slab 합
+    return {"count": count, "slab": slab / SCALE, "total_loss": total_loss / SCALE,
+            "remain": remain / SCALE,
+            "yield": (slab - total_loss - remain) / slab if slab else 0.0}
+
+class HistoryArchive:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.RLock()
+        self._prefix_file = os.path.join(path, "prefixes.txt")
+        self._summary_file = os.path.join(path, "summary.json")
+        self._prefixes = []
+        if os.path.exists(self._prefix_file):
+            with open(self._prefix_file, "r", encoding="utf-8") as f:
+                self._prefixes = f.read().split("\n")[:-1]
+        self._pid = {p: i for i, p in enumerate(self._prefixes)}
+        self._rows = self._recover()
+        self._days = {}
+        if not self._load_summary():
+            self._rebuild_summary()
+
+    def __len__(self):
+        return self._rows
+
+    def _col_path(self, name):
+        return os.path.join(self.path, name + ".col")
+
+    # ----- 추가 -----
+    def append(self, record):
+        self.append_many([record])
+
+    def append_many(self, records):
+        # 일별 합계 / 새 고정부는 지역 변수에 모았다가 열을 다 쓴 뒤에만 반영
+        # (묶음 중간 기록이 잘못되어 예외가 나도 summary 가 열에 없는 행을 세지 않게)
+        cols = {name: array(tc) for name, tc in COLUMNS}
+        with self._lock:
+            pids = dict(self._pid)
+            new_prefixes = []
+            days = {}
+            for rec in records:
+                ts = float(rec.get("ts") or 0.0)
+                slab = to_units(rec["slab"])
+                loss = to_units(rec.get("loss", 15.0))
+                guides = [to_units(g) for g in rec["guides"]]
+                n = len(guides)
+                total_loss = loss * (n - 1)
+                remain = slab - sum(guides) - total_loss
+                prefix = code_prefix(rec.get("code"))
+                pid = pids.get(prefix)
+                if pid is None:
+                    pid = pids[prefix] = len(self._prefixes) + len(new_prefixes)
+                    new_prefixes.append(prefix)
+                day = date.fromtimestamp(ts).toordinal() if ts else 0
+                for name, v in (("ts", ts), ("day", day), ("prefix", pid), ("n", n),
+                                ("slab", slab), ("total_loss", total_loss), ("remain", remain)):
+                    cols[name].append(v)
+                s = days.setdefault((day, pid), [0, 0, 0, 0])
+                s[0] += 1
+                s[1] += slab
+                s[2] += total_loss
+                s[3] += remain
+            if not cols["ts"]:
+                return
+            # 고정부 이름 -> 열 -> 합계 순서로 저장 (중간에 죽어도 열의 prefix 번호는 항상 이름이 있음)
+            if new_prefixes:
+                with open(self._prefix_file, "a", encoding="utf-8") as f:
+                    f.write("".join(p + "\n" for p in new_prefixes))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._prefixes += new_prefixes
+                self._pid = pids
+            for name, tc in COLUMNS:
+                a = cols[name]
+                if sys.byteorder == "big":
+                    a.byteswap()
+                with open(self._col_path(name), "ab") as f:
+                    f.write(a.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+            for key, v in days.items():
+                s = self._days.setdefault(key, [0, 0, 0, 0])
+                for j in range(4):
+                    s[j] += v[j]
+            self._rows += len(cols["ts"])
+            self._save_summary()
+
+    # ----- 일별 합계 -----
+    def _save_summary(self):
+        rows = [[d, p] + v for (d, p), v in sorted(self._days.items())]
+        atomic_write(self._summary_file,
+                     json.dumps({"rows": self._rows, "days": rows}).encode("utf-8"))
+
+    def _load_summary(self):
+        try:
+            with open(self._summary_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("rows") != self._rows:
+            return False
+        self._days = {(r[0], r[1]): r[2:] for r in data["days"]}
+        return True
+
+    def _rebuild_summary(self):
+        self._days = {}
+        if self._rows:
+            day, pid = self.column("day"), self.column("prefix")
+            slab, tl, rem = self.column("slab"), self.column("total_loss"), self.column("remain")
+            for i in range(self._rows):
+                s = self._days.setdefault((int(day[i]), int(pid[i])), [0, 0, 0, 0])
+                s[0] += 1
+                s[1] += int(slab[i])
+                s[2] += int(tl[i])
+                s[3] += int(rem[i])
+        self._save_summary()
+
+    def _recover(self):
+        # 열마다 건수가 다르면 (쓰는 도중 종료) 가장 짧은 열에 맞춤
+        counts = []
+        for name, tc in COLUMNS:
+            p = self._col_path(name)
+            size = os.path.getsize(p) if os.path.exists(p) else 0
+            counts.append(size // array(tc).itemsize)
+        rows = min(counts)
+        for (name, tc), c in zip(COLUMNS, counts):
+            p = self._col_path(name)
+            if c != rows or (os.path.exists(p) and os.path.getsize(p) % array(tc).itemsize):
+                with open(p, "ab") as f:
+                    f.truncate(rows * array(tc).itemsize)
+        return rows
+
+    # ----- 열 읽기 (mmap) -----
+    def column(self, name):
+        """열 하나: numpy 가 있으면 읽기 전용 memmap 배열, 없으면 mmap 위의 memoryview"""
+        tc = dict(COLUMNS)[name]
+        if self._rows == 0:
+            return np.zeros(0, dtype=_NP_TYPES[tc]) if np is not None else array(tc)
+        if np is not None:
+            return np.memmap(self._col_path(name), dtype=_NP_TYPES[tc], mode="r", shape=(self._rows,))
+        with open(self._col_path(name), "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(mm)[:self._rows * array(tc).itemsize].cast(tc)
+
+    def _mask(self, ts_from, ts_to, prefix):
+        # 조건에 맞는 행: numpy 면 bool 배열, 아니면 행 번호 목록
+        ts = self.column("ts")
+        pid = None
+        if prefix is not None:
+            pid = self._pid.get(prefix, -1)
+        if np is not None:
+            m = np.ones(self._rows, dtype=bool)
+            if ts_from is not None:
+                m &= ts >= ts_from
+            if ts_to is not None:
+                m &= ts < ts_to
+            if pid is not None:
+                m &= self.column("prefix") == pid
+            return m
+        pcol = self.column("prefix") if pid is not None else None
+        return [i for i in range(self._rows)
+                if (ts_from is None or ts[i] >= ts_from) and (ts_to is None or ts[i] < ts_to)
+                and (pid is None or pcol[i] == pid)]
+
+    # ----- 집계 -----
+    def daily(self, day_from=None, day_to=None, prefix=None):
+        """일별 합계 (summary 만 사용). day_from 이상 day_to 이하, 날짜순"""
+        lo, hi = _day(day_from), _day(day_to)
+        pid = None if prefix is None else self._pid.get(prefix, -1)
+        out = {}
+        with self._lock:
+            for (d, p), v in self._days.items():
+                if (lo is not None and d < lo) or (hi is not None and d > hi):
+                    continue
+                if pid is not None and p != pid:
+                    continue
+                s = out.setdefault(d, [0, 0, 0, 0])
+                for j in range(4):
+                    s[j] += v[j]
+        return [dict(day=date.fromordinal(d).isoformat() if d else None, **_agg(*out[d]))
+                for d in sorted(out)]
+
+    def by_prefix(self, day_from=None, day_to=None):
+        """강번 고정부별 합계 (summary 만 사용)"""
+        lo, hi = _day(day_from), _day(day_to)
+        out = {}
+        with self._lock:
+            for (d, p), v in self._days.items():
+                if (lo is not None and d < lo) or (hi is not None and d > hi):
+                    continue
+                s = out.setdefault(p, [0, 0, 0, 0])
+                for j in range(4):
+                    s[j] += v[j]
+        return [dict(prefix=self._prefixes[p], **_agg(*out[p])) for p in sorted(out)]
+
+    def scan(self, ts_from=None, ts_to=None, prefix=None):
+        """임의 시간대(교대 등) 합계: 열 스캔"""
+        with self._lock:
+            if self._rows == 0:
+                return _agg(0, 0, 0, 0)
+            m = self._mask(ts_from, ts_to, prefix)
+            if np is not None:
+                sums = [int(self.column(c)[m].sum(dtype=np.int64)) for c in _LENGTHS]
+                return _agg(int(m.sum()), *sums)
+            cols = [self.column(c) for c in _LENGTHS]
+            return _agg(len(m), *(sum(c[i] for i in m) for c in cols))
+
+    def percentiles(self, column="remain", qs=(50, 90, 99), ts_from=None, ts_to=None, prefix=None):
+        """열 값의 백분위 (mm). 보간은 numpy.percentile 기본(linear)과 같음"""
+        with self._lock:
+            if self._rows == 0:
+                return {q: None for q in qs}
+            m = self._mask(ts_from, ts_to, prefix)
+            if np is not None:
+                vals = self.column(column)[m]
+                if len(vals) == 0:
+                    return {q: None for q in qs}
+                return {q: float(v) / SCALE for q, v in zip(qs, np.percentile(vals, qs))}
+            col = self.column(column)
+            vals = sorted(col[i] for i in m)
+        if not vals:
+            return {q: None for q in qs}
+        out = {}
+        for q in qs:
+            pos = (len(vals) - 1) * q / 100.0
+            lo = int(pos)
+            hi = min(lo + 1, len(vals) - 1)
+            out[q] = (vals[lo] + (vals[hi] - vals[lo]) * (pos - lo)) / SCALE
+        return out
+
+def open_archive(user_data_dir):
+    return HistoryArchive(os.path.join(user_data_dir, "archive"))
+
+# ===== 명령행 =====
+def _ts(s):
+    return datetime.fromisoformat(s).timestamp() if s else None
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="계산 기록 손실·수율 집계")
+    ap.add_argument("archive", help="archive 폴더 (앱 user_data_dir/archive)")
+    ap.add_argument("query", choices=["daily", "prefix", "shift", "pct"])
+    ap.add_argument("--from", dest="start", help="daily/prefix: YYYY-MM-DD, shift/pct: YYYY-MM-DD HH:MM")
+    ap.add_argument("--to", dest="end")
+    ap.add_argument("--prefix", default=None, help="강번 고정부 (예: SG94)")
+    ap.add_argument("--column", default="remain", choices=list(_LENGTHS))
+    args = ap.parse_args(argv)
+    arc = HistoryArchive(args.archive)
+    if args.query == "daily":
+        rows = arc.daily(args.start, args.end, args.prefix)
+    elif args.query == "prefix":
+        rows = arc.by_prefix(args.start, args.end)
+    elif args.query == "shift":
+        rows = [arc.scan(_ts(args.start), _ts(args.end), args.prefix)]
+    else:
+        rows = [arc.percentiles(args.column, ts_from=_ts(args.start), ts_to=_ts(args.end),
+                                prefix=args.prefix)]
+    for r in rows:
+        print(json.dumps(r, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
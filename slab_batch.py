@@ -0,0 +1,126 @@
+#-*- coding: utf-8 -*-
+# 후판 계산기 배치 계산 (NumPy 벡터화)
+# - slab_core._compute 와 행 단위로 완전히 같은 값을 돌려줌
+# - 지시길이 행렬은 NaN 으로 패딩 (행마다 지시길이 개수가 다를 수 있음)
+# - compute_batch_fixed: 0.1 mm 정수(int64) 경로, slab_fixed.compute_fixed 와 행 단위로 같은 값
+
+import numpy as np
+
+from slab_core import _compute
+
+# ===== 배치 계산 =====
+def compute_batch(slab, guides, loss):
+    """여러 Slab 을 한 번에 계산한다.
+
+    slab   : (N,)   Slab 실길이
+    guides : (N, K) 지시길이, 빈 칸은 NaN
+    loss   : (N,) 또는 스칼라, 절단 손실 1회 길이
+
+    반환 dict (모두 NumPy 배열):
+      ok         : (N,)   계산 가능 여부 (_compute 가 None 이면 False)
+      n          : (N,)   지시길이 개수
+      total_loss : (N,)   전체 손실
+      remain     : (N,)   여유길이 (음수면 계산 불가)
+      add_each   : (N,)   각 지시길이에 더해지는 길이, 불가 행은 NaN
+      real       : (N, K) 절단 후 예상 길이, 빈 칸/불가 행은 NaN
+      marks      : (N, K) 절단 마킹 포인트 (real + loss/2)
+    """
+    slab = np.asarray(slab, dtype=np.float64)
+    guides = np.asarray(guides, dtype=np.float64)
+    if guides.ndim == 1:
+        guides = guides.reshape(-1, 1)
+    loss = np.broadcast_to(np.asarray(loss, dtype=np.float64), slab.shape)
+
+    valid = ~np.isnan(guides)
+    n = valid.sum(axis=1)
+
+    total_loss = loss * (n - 1)
+    # sum(guides) 와 같은 순서(왼쪽부터)로 더해야 스칼라 결과와 비트 단위로 일치
+    g_sum = np.zeros(slab.shape, dtype=np.float64)
+    for j in range(guides.shape[1]):
+        g_sum += np.where(valid[:, j], guides[:, j], 0.0)
+    remain = slab - (g_sum + total_loss)
+
+    ok = (n > 0) & ~(remain < 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        add_each = np.where(ok, remain / n, np.nan)
+    real = np.where(valid & ok[:, None], guides + add_each[:, None], np.nan)
+    marks = real + (loss / 2)[:, None]
+
+    return {
+        "ok": ok, "n": n,
+        "total_loss": total_loss, "remain": remain,
+        "add_each": add_each, "real": real, "marks": marks,
+    }
+
+# ===== 고정소수점 배치 =====
+def padded_from(batch):
+    """slab_fixed.FixedBatch -> (slab (N,), guides (N, K) 0 패딩, n (N,), loss (N,)) int32
+    (slab / loss 는 복사 없이 array 버퍼를 그대로 봄, 계산은 compute_batch_fixed 에서 int64)"""
+    slab = np.frombuffer(batch.slab, dtype=np.int32)
+    loss = np.frombuffer(batch.loss, dtype=np.int32)
+    offs = np.frombuffer(batch.offs, dtype=np.uint32).astype(np.int64)
+    flat = np.frombuffer(batch.guides, dtype=np.int32)
+    n = np.diff(offs).astype(np.int32)
+    k = int(n.max()) if len(n) else 0
+    guides = np.zeros((len(slab), k), dtype=np.int32)
+    rows = np.repeat(np.arange(len(slab)), n)
+    cols = np.arange(len(flat)) - np.repeat(offs[:-1], n)
+    guides[rows, cols] = flat
+    return slab, guides, n, loss
+
+def compute_batch_fixed(slab, guides, n, loss):
+    """정수 배치 계산 (단위 0.1 mm). guides 의 빈 칸은 0, n 은 행별 지시길이 개수.
+
+    add_each / real / marks 는 분모 den (= 2n) 의 분자 (slab_fixed.compute_fixed 와 같음).
+    """
+    slab = np.asarray(slab, dtype=np.int64)
+    guides = np.asarray(guides, dtype=np.int64)
+    n = np.asarray(n, dtype=np.int64)
+    loss = np.broadcast_to(np.asarray(loss, dtype=np.int64), slab.shape)
+    valid = np.arange(guides.shape[1])[None, :] < n[:, None]
+
+    total_loss = loss * (n - 1)
+    remain = slab - guides.sum(axis=1) - total_loss
+    ok = (n > 0) & (remain >= 0)
+    den = 2 * n
+    real = np.where(valid, guides * den[:, None] + 2 * remain[:, None], 0)
+    marks = np.where(valid, real + (loss * n)[:, None], 0)
+    return {
+        "ok": ok, "n": n, "den": den,
+        "total_loss": total_loss, "remain": remain,
+        "add_each": 2 * remain, "real": real, "marks": marks,
+    }
+
+def round_units(num, den, step=1):
+    """num / (den * step) 사사오입 (배열, num >= 0). step=1 -> 0.1 mm, step=10 -> 1 mm"""
+    d = np.asarray(den) * step
+    if np.ndim(num) > np.ndim(d):
+        d = d[:, None]
+    return (2 * num + d) // (2 * d)
+
+def iter_results(slab, guides, loss, res):
+    """compute_batch 결과를 _compute 와 같은 dict(또는 None)로 한 행씩 돌려준다."""
+    loss = np.broadcast_to(np.asarray(loss, dtype=np.float64), np.shape(slab))
+    for i in range(len(slab)):
+        if not res["ok"][i]:
+            yield None
+            continue
+        row = guides[i]
+        g = [float(x) for x in row if x == x]
+        yield {
+            "slab": float(slab[i]), "guides": g, "loss": float(loss[i]),
+            "total_loss": float(res["total_loss"][i]),
+            "remain": float(res["remain"][i]),
+            "add_each": float(res["add_each"][i]),
+            "real": [float(x) for x in res["real"][i] if x == x],
+        }
+
+def compute_scalar(slab, guides, loss):
+    """비교용: 같은 입력을 _compute 로 한 행씩 계산"""
+    loss = np.broadcast_to(np.asarray(loss, dtype=np.float64), np.shape(slab))
+    out = []
+    for i in range(len(slab)):
+        g = [float(x) for x in guides[i] if x == x]
+        out.append(_compute(float(slab[i]), g, float(loss[i])))
+    return out
@@ -0,0 +1,236 @@
+#-*- coding: utf-8 -*-
+# 후판 계산기 헤드리스 배치 모드 (Kivy 미사용)
+# - CSV / JSONL 입력을 한 줄씩 읽어 계산 결과를 바로 출력 (메모리 일정)
+# - 계산/반올림/표시 규칙은 앱(MainScreen.calculate)과 같은 slab_core 함수를 사용
+#
+# 사용 예)
+#   python slab_cli.py orders.csv > result.jsonl
+#   cat orders.jsonl | python slab_cli.py --round --out-format csv
+#   python slab_cli.py big.csv --workers 8 --chunk-size 5000 > result.jsonl
+#
+# 입력 열 (CSV 헤더 / JSONL 키)
+#   code            : 완성된 강번 (예: SG94123-01)  또는
+#   front, back     : 강번 입력칸 값 (prefix + front + "-0" + back 로 조합)
+#   slab            : Slab 실길이
+#   p1, p2, ...     : 지시길이 (JSONL 은 "guides": [...] 도 가능)
+
+import io, os, sys, csv, json, re, math, time, argparse
+from collections import deque
+from functools import partial
+from itertools import islice
+
+from slab_core import (_num_or_none, _compute,
+                       build_code, check_inputs, ERR_TOO_LONG, ERR_VALUE)
+from slab_fixed import fixed_from_result, fmt_units
+
+_GUIDE_KEY = re.compile(r"^(?:p|guide)(\d+)$", re.IGNORECASE)
+
+OUT_FIELDS = ["code", "slab", "guides", "loss", "total_loss", "remain",
+              "add_each", "real", "marks", "error"]
+
+# 해석할 수 없는 입력 줄은 이 키 하나만 가진 레코드로 넘김 (그 줄만 오류 행, 나머지는 계속)
+_ROW_ERROR = "_row_error"
+ERR_ROW = ("입력 오류", "JSON 객체가 아닌 줄입니다.")
+
+# ===== 입력 =====
+def _detect_format(stream):
+    # 첫 글자만 보고 판단 (스트림을 되감을 수 없으므로 읽은 줄을 다시 붙여 돌려줌)
+    first = stream.readline()
+    if first.startswith("\ufeff"):      # stdin 등 utf-8-sig 로 열지 못한 입력의 BOM
+        first = first[1:]
+    fmt = "jsonl" if first.lstrip().startswith("{") else "csv"
+    def _lines():
+        if first:
+            yield first
+        yield from stream
+    return fmt, _lines()
+
+def read_raw(lines, in_format):
+    # 파싱 전 단계: CSV 는 (헤더, 행 리스트), JSONL 은 (None, 줄 문자열)
+    # 병렬 실행 때 dict 변환/JSON 해석을 워커 쪽에서 하도록 나눔
+    if in_format == "jsonl":
+        return None, (line for line in lines if line.strip())
+    reader = csv.reader(lines)
+    return next(reader, []), reader
+
+def to_records(items, header, in_format):
+    if in_format == "jsonl":
+        for line in items:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                rec = None
+            yield rec if isinstance(rec, dict) else {_ROW_ERROR: ERR_ROW}
+    else:
+        n = len(header)
+        for row in items:
+            if len(row) < n:
+                row = row + [None] * (n - len(row))
+            yield dict(zip(header, row))
+
+def read_records(lines, in_format):
+    header, items = read_raw(lines, in_format)
+    return to_records(items, header, in_format)
+
+def _as_num(v):
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        # JSON 의 1e999 는 inf 로 들어옴 -> 문자열과 같이 유한한 값만
+        v = float(v)
+        return v if math.isfinite(v) else None
+    return _num_or_none(v if isinstance(v, str) else None)
+
+def _text(v):
+    # JSONL 숫자 0 도 "0" 으로 (v or "" 는 0 을 빈 값으로 만듦)
+    return "" if v is None else str(v)
+
+def parse_record(rec, prefix):
+    if _text(rec.get("code")).strip():
+        code = _text(rec["code"]).strip()
+    else:
+        code = build_code(rec.get("prefix") or prefix,
+                          _text(rec.get("front")), _text(rec.get("back")))
+    if isinstance(rec.get("guides"), list):
+        values = [_as_num(v) for v in rec["guides"]]
+    else:
+        keyed = []
+        for k, v in rec.items():
+            m = _GUIDE_KEY.match(str(k or "").strip())
+            if m:
+                keyed.append((int(m.group(1)), v))
+        values = [_as_num(v) for _, v in sorted(keyed)]
+    return code, _as_num(rec.get("slab")), values
+
+# ===== 계산 =====
+def format_output(code, result, err, do_round):
+    """_compute 결과(또는 오류) -> 출력 dict. 표시 값은 고정소수점 결과에서 (앱 화면과 같은 반올림)"""
+    out = {"code": code}
+    if err is None and result is None:
+        err = ERR_TOO_LONG
+    if err is None:
+        try:
+            fx = fixed_from_result(result)
+        except ValueError:
+            err = ERR_VALUE
+    if err:
+        out["error"] = f"{err[0]}: {err[1]}".replace("\n", " ")
+        return out
+    den, sc = fx["den"], fx["scale"]
+    fmt = lambda num, d=1: fmt_units(num, d, do_round, sc)
+    out.update({
+        "slab": fmt(fx["slab"]),
+        "guides": [fmt(g) for g in fx["guides"]],
+        "loss": fmt(fx["loss"]),
+        "total_loss": fmt(fx["total_loss"]),
+        "remain": fmt(fx["remain"]),
+        "add_each": fmt(fx["add_each"], den),
+        "real": [fmt(r, den) for r in fx["real"]],
+        "marks": [fmt(m, den) for m in fx["marks"]],
+    })
+    return out
+
+def calc_records(records, prefix, loss, do_round):
+    for rec in records:
+        if _ROW_ERROR in rec:
+            yield format_output("", None, rec[_ROW_ERROR], do_round)
+            continue
+        code, slab, values = parse_record(rec, prefix)
+        guides, err = check_inputs(slab, values)
+        result = None if err else _compute(slab, guides, loss)
+        yield format_output(code, result, err, do_round)
+
+# ===== 출력 =====
+def write_header(stream, out_format):
+    if out_format == "csv":
+        csv.writer(stream, lineterminator="\n").writerow(OUT_FIELDS)
+
+def write_results(results, stream, out_format):
+    if out_format == "csv":
+        w = csv.writer(stream, lineterminator="\n")
+        for out in results:
+            w.writerow([";".join(v) if isinstance(v, list) else v
+                        for v in (out.get(k, "") for k in OUT_FIELDS)])
+    else:
+        for out in results:
+            stream.write(json.dumps(out, ensure_ascii=False))
+            stream.write("\n")
+
+# ===== 묶음(chunk) 단위 실행 =====
+# 입력을 chunk_size 행씩 잘라 각 묶음을 문자열로 완성해 돌려줌
+# - workers > 1 이면 프로세스 풀에서 병렬 처리, 결과는 입력 순서대로 내보냄
+# - 동시에 처리 중인 묶음은 workers*2 개까지 (메모리 일정)
+# - 1개든 N개든 같은 _render_chunk 를 거치므로 출력은 바이트 단위로 같음
+def _chunks(it, size):
+    it = iter(it)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _render_chunk(items, header, in_format, prefix, loss, do_round, out_format):
+    buf = io.StringIO()
+    records = to_records(items, header, in_format)
+    write_results(calc_records(records, prefix, loss, do_round), buf, out_format)
+    return len(items), buf.getvalue()
+
+def run_chunks(lines, in_format, prefix, loss, do_round, out_format,
+               workers=1, chunk_size=5000):
+    header, items = read_raw(lines, in_format)
+    job = partial(_render_chunk, header=header, in_format=in_format, prefix=prefix,
+                  loss=loss, do_round=do_round, out_format=out_format)
+    if workers <= 1:
+        for chunk in _chunks(items, chunk_size):
+            yield job(chunk)
+        return
+    # 앱(slab_plan)도 이 모듈의 입력 파서를 쓰므로 병렬 실행 때만 import
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        pending = deque()
+        for chunk in _chunks(items, chunk_size):
+            pending.append(ex.submit(job, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="후판 계산기 배치 모드")
+    ap.add_argument("input", nargs="?", default="-", help="입력 파일 (기본: stdin)")
+    ap.add_argument("--in-format", choices=["auto", "csv", "jsonl"], default="auto")
+    ap.add_argument("--out-format", choices=["jsonl", "csv"], default="jsonl")
+    ap.add_argument("--prefix", default="SG94", help="강번 고정부 (front/back 입력일 때)")
+    ap.add_argument("--loss", type=float, default=15.0, help="절단 손실 1회 (mm)")
+    ap.add_argument("--round", action="store_true", help="출력값을 정수로 표시")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="병렬 프로세스 수 (0 = CPU 코어 수)")
+    ap.add_argument("--chunk-size", type=int, default=5000, help="묶음당 행 수")
+    ap.add_argument("--stats", action="store_true", help="처리 행 수/속도를 stderr 로 출력")
+    args = ap.parse_args(argv)
+    if not math.isfinite(args.loss) or args.loss < 0:
+        ap.error("--loss 는 0 이상의 유한한 값")
+    workers = args.workers or os.cpu_count() or 1
+
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8-sig", newline="")
+    try:
+        if args.in_format == "auto":
+            in_format, lines = _detect_format(src)
+        else:
+            in_format, lines = args.in_format, src
+        t0 = time.perf_counter()
+        rows = 0
+        write_header(sys.stdout, args.out_format)
+        for n, text in run_chunks(lines, in_format, args.prefix, args.loss, args.round,
+                                  args.out_format, workers, max(1, args.chunk_size)):
+            sys.stdout.write(text)
+            rows += n
+        if args.stats:
+            dt = time.perf_counter() - t0
+            print(f"{rows} 행, {dt:.2f} s, {rows / dt if dt else 0:,.0f} 행/s "
+                  f"(workers={workers}, chunk={args.chunk_size})", file=sys.stderr)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
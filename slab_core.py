@@ -0,0 +1,285 @@
+#-*- coding: utf-8 -*-
+# 후판 계산기 코어 모듈 (계산 / 결과 문구 / 기록·설정 저장)
+# - Kivy 를 import 하지 않음 (배치/헤드리스 실행에서도 그대로 사용)
+# - 앱 시작 시간에 그대로 더해지므로 표준 라이브러리 외 import 금지
+
+import os, json, math
+from collections import OrderedDict
+
+from slab_fixed import SCALE, to_units, decimals, fmt_units, fixed_from_result
+
+# 기록 보관 개수 (기록은 추가 전용 저널이라 저장 비용과는 무관, slab_store 참고)
+MAX_HISTORY = 1000
+
+# ===== 유틸 =====
+def _num_or_none(s):
+    try:
+        s = (s or "").strip()
+        if not s or s == ".":
+            return None
+        v = float(s)
+        # "nan" / "inf" / "1e999" 도 float() 는 받아 주므로 유한한 값만
+        return v if math.isfinite(v) else None
+    except Exception:
+        return None
+
+def round_half_up(n):
+    # int(n + 0.5) 는 0.49999999999999994 같은 값에서 덧셈 오차로 올라감 -> 소수부를 직접 비교
+    n = float(n)
+    f = math.floor(n)
+    return int(f) + (1 if n - f >= 0.5 else 0)
+
+def make_fmt(do_round):
+    def fmt(x):
+        return f"{round_half_up(x)}" if do_round else f"{x:.1f}"
+    return fmt
+
+def fmt_mark(r, loss, do_round):
+    mark = round_half_up(r + loss/2) if do_round else (r + loss/2)
+    return f"{int(mark)}" if do_round else f"{mark:.1f}"
+
+def build_code(prefix, front, back):
+    cf = (front or "").strip()
+    cb = (back or "").strip()
+    return f"{prefix}{cf}-0{cb}" if (cf and cb) else ""
+
+# ===== 입력 검사 (오류 제목, 메시지) =====
+ERR_SLAB     = ("입력 오류", "Slab 실길이를 올바르게 입력하세요.")
+ERR_GUIDES   = ("입력 부족", "최소 2개 이상의 지시길이를 입력하세요.")
+ERR_TOO_LONG = ("계산 불가", "절단 길이가 부족합니다.\n입력하신 길이를 다시 확인하세요.")
+ERR_VALUE    = ("입력 오류", "길이 값이 올바르지 않습니다.")
+
+def check_inputs(slab, values):
+    """-> (guides, None) 또는 (None, (제목, 메시지))"""
+    # 숫자로 직접 들어온 값(JSON 등)도 nan / inf 는 잘못된 입력으로
+    if slab is None or not math.isfinite(slab) or slab <= 0:
+        return None, ERR_SLAB
+    guides = [v for v in values if v is not None and math.isfinite(v) and v > 0]
+
+    if len(guides) < 2:
+        return None, ERR_GUIDES
+    return guides, None
+
+# ===== 순수 계산 =====
+def _compute(slab, guides, loss):
+    total_loss = loss * (len(guides) - 1)
+    remain = slab - (sum(guides) + total_loss)
+    if remain < 0:
+        return None
+    add_each = remain / len(guides)
+    real = [g + add_each for g in guides]
+    return {
+        "slab": slab, "guides": guides, "loss": loss,
+        "total_loss": total_loss, "remain": remain,
+        "add_each": add_each, "real": real,
+    }
+
+# ===== 결과 문구 =====
+# 표시 설정(반올림/mm 숨김/위치 이동)이 같으면 같은 RenderPlan 을 재사용
+def settings_fingerprint(st):
+    return (bool(st.get("round", False)),
+            bool(st.get("hide_mm", False)),
+            bool(st.get("swap_sections", False)))
+
+class RenderPlan:
+    __slots__ = ("fingerprint", "do_round", "unit", "swap", "fmt")
+
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+        self.do_round, hide_mm, self.swap = fingerprint
+        self.unit = "" if hide_mm else " mm"
+        self.fmt = make_fmt(self.do_round)
+
+    def mark(self, r, loss):
+        return fmt_mark(r, loss, self.do_round)
+
+    def u(self, num, den=1, scale=SCALE):
+        # 고정소수점 값 (1/scale mm 단위 분자 / 분모) 표시
+        return fmt_units(num, den, self.do_round, scale)
+
+_PLANS = {}
+
+def compile_plan(st):
+    fp = settings_fingerprint(st)
+    plan = _PLANS.get(fp)
+    if plan is None:
+        plan = _PLANS[fp] = RenderPlan(fp)
+    return plan
+
+# 시각화 한 줄에 넣을 최대 조각 수 (넘으면 줄바꿈, 3~5 조각은 예전과 같은 한 줄)
+VISUAL_PER_LINE = 5
+
+def build_visual(plan, fx):
+    den, sc = fx["den"], fx["scale"]
+    parts = [f"-{i}번({plan.u(m, den, sc)})-" for i, m in enumerate(fx["marks"], 1)]
+    k = VISUAL_PER_LINE
+    return "H" + "\n".join("".join(parts[i:i + k]) for i in range(0, len(parts), k)) + "T"
+
+def build_result_text(result, code_str, st):
+    # 표시 숫자는 모두 고정소수점 결과에서 (나눗셈 값도 표시할 때 한 번만 반올림)
+    plan = compile_plan(st)
+    fx = fixed_from_result(result)
+    den, sc = fx["den"], fx["scale"]
+    unit = plan.unit
+    u = lambda num, d=1: plan.u(num, d, sc)
+
+    lines_top = []
+    if code_str:
+        lines_top.append(f"▶ 강번: {code_str}\n")
+    lines_top.append(f"▶ Slab 실길이: {u(fx['slab'])}{unit}")
+    for i, g in enumerate(fx["guides"], 1):
+        lines_top.append(f"▶ {i}번 지시길이: {u(g)}{unit}")
+    lines_top.append(
+        f"▶ 절단 손실: {u(fx['loss'])}{unit} × {len(fx['guides'])-1}"
+        f" = {u(fx['total_loss'])}{unit}"
+    )
+    lines_top.append(
+        f"▶ 전체 여유길이: {u(fx['remain'])}{unit}"
+        f" → 각 +{u(fx['add_each'], den)}{unit}\n"
+    )
+
+    sec_real = ["▶ 절단 후 예상 길이:"]
+    for i, r in enumerate(fx["real"], 1):
+        sec_real.append(f"   {i}번: {u(r, den)}{unit}")
+
+    sec_vis = ["\n▶ 시각화 (절단 마킹 포인트):", build_visual(plan, fx)]
+
+    if plan.swap:
+        lines_bottom = sec_vis + [""] + sec_real
+    else:
+        lines_bottom = sec_real + [""] + sec_vis
+
+    return "\n".join(lines_top + [""] + lines_bottom)
+
+def build_history_text(d, real_idx, st):
+    plan = compile_plan(st)
+    fx = fixed_from_result(d)
+    den, sc = fx["den"], fx["scale"]
+    unit = plan.unit
+    u = lambda num, d=1: plan.u(num, d, sc)
+
+    lines = []
+    
+    time_str = d.get("timestamp", "과거 기록")
+    lines.append(f"━━ [ {time_str} ] ━━")
+    
+    if d.get("code"):
+        lines.append(f"강번: {d['code']}")
+    lines.append(f"Slab 실길이: {u(fx['slab'])}{unit}")
+    for i, g in enumerate(fx["guides"], 1):
+        lines.append(f"{i}번 지시길이: {u(g)}{unit}")
+    lines.append("")
+    lines.append("■ 절단 손실 계산 ■")
+    n = len(fx["guides"])
+    lines.append(f"손실 1회: {u(fx['loss'])}{unit}")
+    lines.append(f"절단 횟수: {n-1}회")
+    lines.append(f"전체 손실: {u(fx['loss'])} × {n-1} = {u(fx['total_loss'])}{unit}")
+    lines.append("")
+    lines.append("■ 여유길이 배분 ■")
+    lines.append(f"지시길이 합계: {u(sum(fx['guides']))}{unit}")
+    lines.append(f"전체 손실: {u(fx['total_loss'])}{unit}")
+    lines.append(f"여유길이: {u(fx['remain'])}{unit} → 각 +{u(fx['add_each'], den)}{unit}")
+    lines.append("")
+    
+    lines.append("■ 시각화 (절단 마킹 포인트) ■")
+    lines.append(build_visual(plan, fx))
+
+    return "\n".join(lines)
+
+def build_history_summary(d, real_idx, st):
+    # 기록 목록 한 줄 요약
+    plan = compile_plan(st)
+    code = d.get("code") or "(강번 없음)"
+    sc = 10 ** max(1, decimals(d["slab"]))
+    return (f"[b]{real_idx}[/b]  [color=#777777]{d.get('timestamp', '과거 기록')}[/color]  "
+            f"{code}  /  Slab {plan.u(to_units(d['slab'], sc), 1, sc)}{plan.unit}  /  {len(d['guides'])}개")
+
+class ResultFormatter:
+    """기록 문구 캐시: (기록 id, 설정 fingerprint) -> 문구, LRU 로 maxsize 건 유지.
+
+    설정이 바뀌면(apply_settings) invalidate() 로 비움.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def record_key(d):
+        # 저장소 id (SQLite), 없으면 계산 시각 (아직 저장 전 기록 / 저널)
+        return d.get("id") or d.get("ts")
+
+    def history_text(self, d, real_idx, st):
+        rid = self.record_key(d)
+        if rid is None:
+            return build_history_text(d, real_idx, st)
+        key = (rid, settings_fingerprint(st))
+        text = self._cache.get(key)
+        if text is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return text
+        self.misses += 1
+        text = self._cache[key] = build_history_text(d, real_idx, st)
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return text
+
+    def result_text(self, result, code_str, st):
+        return build_result_text(result, code_str, st)
+
+    def invalidate(self):
+        self._cache.clear()
+
+# ===== 기록 및 설정 저장/불러오기 (APK 호환용 수정) =====
+def load_history(filepath) -> list:
+    try:
+        if os.path.exists(filepath):
+            with open(filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, list) else []
+    except Exception:
+        pass
+    return []
+
+def atomic_write(filepath, data: bytes):
+    # 임시 파일에 쓰고 fsync 후 교체 -> 중간에 죽어도 이전 파일 또는 새 파일 중 하나는 온전함
+    tmp = filepath + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, filepath)
+
+def _defaults():
+    return {
+        "prefix": "SG94",
+        "round": False,
+        "out_font": 15,
+        "hide_mm": False,
+        "loss_mm": 15.0,
+        "show_history": False,
+        "swap_sections": False,
+        "live_calc": False,
+        "gauge_addr": "",
+        "sync_url": ""
+    }
+
+def load_settings(filepath):
+    st = _defaults()
+    try:
+        if os.path.exists(filepath):
+            with open(filepath, "r", encoding="utf-8") as f:
+                got = json.load(f) or {}
+            st.update(got)
+    except Exception:
+        pass
+    return st
+
+def save_settings(filepath, data: dict):
+    try:
+        atomic_write(filepath, json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+    except Exception:
+        pass
@@ -0,0 +1,191 @@
+#-*- coding: utf-8 -*-
+# 길이 고정소수점 엔진 (0.1 mm 정수)
+# - 입력 길이는 0.1 mm 단위 정수로 바꿔 정수로만 계산 (0.05 는 올림)
+# - 나눗셈이 들어가는 값(여유 배분, 예상 길이, 마킹 포인트)은 공통 분모 2N 의 분자로 들고 있다가
+#   표시할 때 한 번만 정확히 사사오입 -> float 의 .x5 반올림 오차가 없음
+# - 표시용(fixed_from_result)은 입력의 소수 자릿수에 맞춘 단위(scale)를 써서 0.1 mm 보다 잘게
+#   입력된 값도 두 번 반올림되지 않음
+# - 배치/기록은 FixedBatch(array 정수 열)로 묶어 dict + float 보다 작게 보관
+# - 표준 라이브러리만 사용 (slab_core 가 import)
+
+import sys, math, struct
+from array import array
+
+SCALE = 10          # 1 mm = 10 단위
+
+# 표시용 단위의 최대 소수 자릿수 (1e-6 mm)
+_MAX_DIGITS = 6
+
+def _text(x):
+    if isinstance(x, str):
+        return x.strip()
+    try:
+        return repr(float(x))       # float 는 가장 짧은 십진 표현 기준 (2950.55 -> "2950.55")
+    except (TypeError, ValueError):
+        return ""
+
+def to_units(x, scale=SCALE):
+    """숫자 또는 숫자 문자열 -> 1/scale mm 정수 (다음 자리 5 이상 올림). 변환 불가면 None"""
+    if isinstance(x, int):
+        return x * scale
+    if isinstance(x, float) and -1e9 < x < 1e9:
+        # k / scale 가 다시 x 가 되면 x 의 십진 표현은 정확히 k / scale (문자열 변환 생략)
+        k = round(x * scale)
+        if k / scale == x:
+            return k
+    s = _text(x)
+    neg = s.startswith("-")
+    s = s.lstrip("+-")
+    if "e" in s or "E" in s:
+        from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+        try:
+            u = int((Decimal(s) * scale).quantize(Decimal(1), ROUND_HALF_UP))
+        except (InvalidOperation, ValueError):
+            return None
+        return -u if neg else u
+    ip, _, fp = s.partition(".")
+    if not (ip + fp).isdigit():
+        return None
+    k = len(str(scale)) - 1
+    u = int(ip or "0") * scale + int(fp[:k].ljust(k, "0") or "0")
+    if fp[k:k + 1] >= "5":
+        u += 1
+    return -u if neg else u
+
+def decimals(x):
+    """소수 자릿수 (2950.55 -> 2, 9000.0 -> 0)"""
+    if isinstance(x, (int, float)) and -1e9 < x < 1e9:
+        if x == int(x):
+            return 0
+        if round(x * 10) / 10 == x:
+            return 1
+    s = _text(x)
+    if "e" in s or "E" in s:
+        return _MAX_DIGITS
+    return len(s.partition(".")[2].rstrip("0"))
+
+def round_div(num, den):
+    """num / den 를 정수로 사사오입 (0.5 는 0 에서 먼 쪽)"""
+    if num >= 0:
+        return (2 * num + den) // (2 * den)
+    return -((2 * -num + den) // (2 * den))
+
+def fmt_units(num, den=1, do_round=False, scale=SCALE):
+    """(num / den) / scale mm 값을 표시 문자열로: 반올림이면 "1234", 아니면 "1234.5" """
+    if do_round:
+        return str(round_div(num, den * scale))
+    t = round_div(num * SCALE, den * scale)
+    sign = "-" if t < 0 else ""
+    t = abs(t)
+    return f"{sign}{t // SCALE}.{t % SCALE}"
+
+def compute_fixed(slab_u, guides_u, loss_u, allow_negative=False, scale=SCALE):
+    """정수 계산 (단위 1/scale mm). 나눗셈 결과(add_each/real/marks)는 분모 den 의 분자.
+    길이 부족이면 None"""
+    n = len(guides_u)
+    total_loss = loss_u * (n - 1)
+    remain = slab_u - sum(guides_u) - total_loss
+    if remain < 0 and not allow_negative:
+        return None
+    den = 2 * n
+    real = [g * den + 2 * remain for g in guides_u]
+    half = loss_u * n                  # loss / 2 = loss * N / 2N
+    return {
+        "slab": slab_u, "guides": list(guides_u), "loss": loss_u,
+        "total_loss": total_loss, "remain": remain, "den": den, "scale": scale,
+        "add_each": 2 * remain, "real": real, "marks": [r + half for r in real],
+    }
+
+def fixed_from_result(result):
+    """_compute 결과(float dict, 기록 포함) -> compute_fixed 결과 (표시용, 입력 자릿수 그대로)"""
+    vals = [result["slab"], result["loss"]] + list(result["guides"])
+    # nan / inf 는 정수로 바꿀 수 없음 (to_units -> None) -> 변환 전에 거름
+    if not all(math.isfinite(float(v)) for v in vals):
+        raise ValueError("유한하지 않은 길이 값")
+    scale = 10 ** min(_MAX_DIGITS, max(1, max(decimals(v) for v in vals)))
+    # 부족 판정은 이미 _compute 에서 끝남 (여기서는 표시만)
+    return compute_fixed(to_units(result["slab"], scale),
+                         [to_units(g, scale) for g in result["guides"]],
+                         to_units(result["loss"], scale), allow_negative=True, scale=scale)
+
+# ===== 정수 열 저장 =====
+_MAGIC = b"SFB1"
+_HEAD = struct.Struct("<4sII")
+
+class FixedBatch:
+    """(Slab, 지시길이 N 개, 손실) 묶음을 0.1 mm 정수 array 열로 보관.
+
+    slab / loss : 레코드당 int32 하나씩
+    offs        : 레코드 i 의 지시길이는 guides[offs[i]:offs[i+1]]
+    """
+    __slots__ = ("slab", "loss", "offs", "guides")
+
+    def __init__(self):
+        self.slab = array("i")
+        self.loss = array("i")
+        self.offs = array("I", [0])
+        self.guides = array("i")
+
+    @classmethod
+    def from_records(cls, records):
+        fb = cls()
+        for rec in records:
+            fb.append(rec["slab"], rec["guides"], rec.get("loss", 15.0))
+        return fb
+
+    def __len__(self):
+        return len(self.slab)
+
+    def append(self, slab, guides, loss):
+        # 모두 바꿔 본 뒤에 추가 (중간에 실패해도 열 길이가 어긋나지 않게)
+        vals = [to_units(slab), to_units(loss)] + [to_units(g) for g in guides]
+        if any(u is None or not -2**31 <= u < 2**31 for u in vals):
+            raise ValueError(f"0.1 mm 정수로 바꿀 수 없는 길이 값: {slab!r}, {guides!r}, {loss!r}")
+        self.slab.append(vals[0])
+        self.loss.append(vals[1])
+        self.guides.extend(vals[2:])
+        self.offs.append(len(self.guides))
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.slab)
+        return (self.slab[i], self.guides[self.offs[i]:self.offs[i + 1]].tolist(), self.loss[i])
+
+    def compute(self, i):
+        slab_u, guides_u, loss_u = self[i]
+        return compute_fixed(slab_u, guides_u, loss_u)
+
+    def results(self):
+        g, offs = self.guides, self.offs
+        for i in range(len(self.slab)):
+            yield compute_fixed(self.slab[i], g[offs[i]:offs[i + 1]].tolist(), self.loss[i])
+
+    @property
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self.slab, self.loss, self.offs, self.guides))
+
+    # ----- 바이너리 (리틀 엔디언 고정) -----
+    def to_bytes(self):
+        cols = [self.slab, self.loss, self.offs, self.guides]
+        if sys.byteorder == "big":
+            cols = [array(a.typecode, a) for a in cols]
+            for a in cols:
+                a.byteswap()
+        return _HEAD.pack(_MAGIC, len(self.slab), len(self.guides)) + b"".join(a.tobytes() for a in cols)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, n, k = _HEAD.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("FixedBatch 형식이 아님")
+        fb = cls()
+        pos = _HEAD.size
+        for name, count in (("slab", n), ("loss", n), ("offs", n + 1), ("guides", k)):
+            a = array(getattr(fb, name).typecode)
+            size = a.itemsize * count
+            a.frombytes(data[pos:pos + size])
+            if sys.byteorder == "big":
+                a.byteswap()
+            setattr(fb, name, a)
+            pos += size
+        return fb
@@ -0,0 +1,350 @@
+#-*- coding: utf-8 -*-
+# 레이저 길이 게이지 수신 (asyncio)
+# - 게이지 출력(TCP 또는 시리얼, 한 줄에 측정값 하나)을 별도 스레드의 asyncio 루프에서 읽음
+# - 읽기 -> 큐(크기 제한) -> 계산(묶음) -> UI 우편함 -> post(콜백) 으로 UI 스레드에 전달
+#   UI 가 밀리면 우편함이 차서 계산이 기다리고, 큐가 차서 읽기가 기다림 (TCP 흐름 제어로 게이지까지)
+# - 측정값이 몰려 오면 쌓인 것을 한 번에 계산하고, UI 콜백은 한 번에 하나만 예약 (나머지는 합침)
+# - 지연 시간: 수신 -> 계산 완료 -> 화면 표시 (perf_counter 기준) 를 최근 N 건으로 집계
+#
+# 주소: "tcp://host:port", "host:port", "serial:///dev/ttyUSB0@9600" (시리얼은 pyserial-asyncio 필요)
+#
+# 사용 예)
+#   python slab_gauge.py serve --port 5020 --rate 20          # 시험용 게이지 흉내 서버
+#   python slab_gauge.py listen 127.0.0.1:5020 --guides 2950 3000 2900
+
+import re, sys, time, asyncio, threading, argparse
+from collections import deque
+
+from slab_core import _compute, check_inputs, ERR_TOO_LONG
+
+_NUM = re.compile(r"[-+]?\d+(?:\.\d+)?")
+
+def parse_reading(line):
+    """게이지 한 줄 -> mm (float). "9000.5", "ST,GS,+09000.5,mm", "01:L=9000.5" 등 마지막 숫자.
+    숫자가 없거나(상태/오류 줄) 0 이하면 None"""
+    if isinstance(line, (bytes, bytearray)):
+        line = line.decode("ascii", "replace")
+    nums = _NUM.findall(line)
+    if not nums:
+        return None
+    try:
+        v = float(nums[-1])
+    except ValueError:
+        return None
+    return v if v > 0 else None
+
+def parse_addr(addr):
+    """-> ("tcp", host, port) 또는 ("serial", device, baud)"""
+    addr = (addr or "").strip()
+    if addr.startswith("serial://"):
+        dev, _, baud = addr[len("serial://"):].partition("@")
+        return "serial", dev, int(baud or 9600)
+    if addr.startswith("tcp://"):
+        addr = addr[len("tcp://"):]
+    host, _, port = addr.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"게이지 주소 형식: host:port 또는 serial://장치@속도 ({addr!r})")
+    return "tcp", host, int(port)
+
+async def _skip_long_line(reader, n):
+    """StreamReader 한도보다 긴 줄: 이미 훑은 n 바이트부터 줄 끝까지 버림 (다음 줄부터 다시 맞춤)"""
+    while True:
+        await reader.readexactly(n)
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as e:
+            n = e.consumed
+
+async def _open(addr):
+    kind, a, b = parse_addr(addr)
+    if kind == "serial":
+        try:
+            import serial_asyncio
+        except ImportError:
+            raise RuntimeError("시리얼 게이지는 pyserial-asyncio 가 필요함")
+        return await serial_asyncio.open_serial_connection(url=a, baudrate=b)
+    return await asyncio.open_connection(a, b)
+
+def _pct(vals, q):
+    if not vals:
+        return 0.0
+    s = sorted(vals)
+    return s[min(len(s) - 1, int(len(s) * q / 100))]
+
+class GaugeIngest:
+    """게이지 수신 파이프라인 (start() 로 스레드 시작, stop() 으로 종료).
+
+    post(fn)            : fn 을 UI 스레드에서 실행하도록 예약 (앱은 Clock.schedule_once)
+    on_results(items)   : UI 스레드에서 호출, items 는 도착 순서의 dict 목록
+                          {"seq", "slab", "code", "result"(_compute 결과 또는 None), "error", "t_recv"}
+    set_context(...)    : 측정값과 짝지을 강번 / 지시길이 / 손실 (UI 스레드에서 바꿈)
+    """
+
+    def __init__(self, addr, post, on_results, queue_size=64, max_batch=32,
+                 outbox_size=256, keep=1000):
+        parse_addr(addr)            # 형식이 틀리면 여기서 ValueError
+        self.addr = addr
+        self.post = post
+        self.on_results = on_results
+        self.queue_size = queue_size
+        self.max_batch = max_batch
+        self.outbox_size = outbox_size
+        self._ctx = ("", None, 15.0)
+        self._lock = threading.Lock()
+        self._outbox = []
+        self._posted = False
+        self._loop = None
+        self._stop_ev = None
+        self._room = None           # 우편함에 자리가 나면 set (asyncio.Event)
+        self._thread = None
+        self._seq = 0
+        self.connected = False
+        self.stats = {"readings": 0, "bad_lines": 0, "batches": 0, "max_batch": 0,
+                      "queue_high": 0, "queue_waits": 0, "outbox_waits": 0,
+                      "ui_calls": 0, "connects": 0, "errors": 0}
+        self.lat_calc = deque(maxlen=keep)      # 수신 -> 계산 완료 (ms)
+        self.lat_ui = deque(maxlen=keep)        # 수신 -> 화면 표시 (ms)
+
+    # ----- UI 스레드 -----
+    def set_context(self, code, guides, loss):
+        # 튜플 하나를 통째로 바꿈 (계산 쪽은 읽기만)
+        self._ctx = (code or "", list(guides) if guides else None, float(loss))
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="slab-gauge", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=2.0):
+        loop = self._loop
+        if loop is not None and self._stop_ev is not None:
+            try:
+                loop.call_soon_threadsafe(self._stop_ev.set)
+            except RuntimeError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _deliver(self):
+        # post 로 예약되어 UI 스레드에서 실행: 그동안 쌓인 결과를 한 번에 넘김
+        with self._lock:
+            items, self._outbox = self._outbox, []
+            self._posted = False
+        self.stats["ui_calls"] += 1
+        if self._loop is not None and self._room is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._room.set)
+            except RuntimeError:
+                pass
+        try:
+            self.on_results(items)
+        finally:
+            now = time.perf_counter()
+            self.lat_ui.extend((now - it["t_recv"]) * 1000.0 for it in items)
+
+    def metrics(self):
+        out = dict(self.stats)
+        for name, vals in (("calc", list(self.lat_calc)), ("ui", list(self.lat_ui))):
+            out[f"{name}_p50_ms"] = _pct(vals, 50)
+            out[f"{name}_p95_ms"] = _pct(vals, 95)
+            out[f"{name}_max_ms"] = max(vals) if vals else 0.0
+        return out
+
+    # ----- 수신 스레드 (asyncio) -----
+    def _run(self):
+        try:
+            asyncio.run(self._main())
+        except Exception:
+            self.stats["errors"] += 1
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop_ev = asyncio.Event()
+        self._room = asyncio.Event()
+        queue = asyncio.Queue(self.queue_size)
+        tasks = [asyncio.create_task(self._read_loop(queue)),
+                 asyncio.create_task(self._calc_loop(queue))]
+        await self._stop_ev.wait()
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _read_loop(self, queue):
+        delay = 0.5
+        while True:
+            try:
+                reader, writer = await _open(self.addr)
+            except RuntimeError:
+                self.stats["errors"] += 1
+                return
+            except (OSError, asyncio.TimeoutError):
+                self.stats["errors"] += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 5.0)
+                continue
+            self.connected = True
+            self.stats["connects"] += 1
+            try:
+                while True:
+                    try:
+                        line = await reader.readuntil(b"\n")
+                    except asyncio.IncompleteReadError as e:
+                        line = e.partial        # 연결 끝 (줄바꿈 없는 마지막 줄)
+                        if not line:
+                            break
+                    except asyncio.LimitOverrunError as e:
+                        # 줄바꿈 없이 쏟아지는 잡음 등: 나쁜 줄 하나로 세고 줄 끝까지 버림
+                        self.stats["bad_lines"] += 1
+                        await _skip_long_line(reader, e.consumed)
+                        continue
+                    delay = 0.5                 # 실제로 데이터를 받은 연결이면 대기 시간 초기화
+                    t = time.perf_counter()
+                    v = parse_reading(line)
+                    if v is None:
+                        self.stats["bad_lines"] += 1
+                        continue
+                    self.stats["readings"] += 1
+                    if queue.full():
+                        # 계산이 밀림: 여기서 기다리는 동안 소켓을 읽지 않음 -> 게이지 쪽 송신이 막힘
+                        self.stats["queue_waits"] += 1
+                    await queue.put((v, t))
+                    self.stats["queue_high"] = max(self.stats["queue_high"], queue.qsize())
+            except asyncio.IncompleteReadError:
+                pass                            # 긴 줄을 버리는 중에 연결이 끊김
+            except (OSError, ValueError):
+                # 연결 오류 / 스트림 오류 (수신은 세션 끝까지 계속)
+                self.stats["errors"] += 1
+            finally:
+                self.connected = False
+                writer.close()
+            # 끊기면 (정상 EOF 포함) 항상 잠시 뒤 다시 연결
+            # -> 연결만 받고 바로 닫는 게이지에 쉬지 않고 다시 붙지 않음
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5.0)
+
+    async def _calc_loop(self, queue):
+        while True:
+            batch = [await queue.get()]
+            # 몰려 온 측정값은 한 번에 (최대 max_batch)
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            self.stats["batches"] += 1
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+            code, guides, loss = self._ctx
+            items = []
+            for v, t in batch:
+                self._seq += 1
+                item = {"seq": self._seq, "slab": v, "code": code, "result": None,
+                        "error": None, "t_recv": t}
+                g, err = check_inputs(v, guides or [])
+                if err:
+                    item["error"] = err
+                else:
+                    item["result"] = _compute(v, g, loss)
+                    if item["result"] is None:
+                        item["error"] = ERR_TOO_LONG
+                items.append(item)
+            now = time.perf_counter()
+            self.lat_calc.extend((now - t) * 1000.0 for _, t in batch)
+            while True:
+                with self._lock:
+                    if len(self._outbox) < self.outbox_size:
+                        self._outbox.extend(items)
+                        post = not self._posted
+                        self._posted = True
+                        break
+                    self._room.clear()
+                # UI 가 아직 못 가져감: 자리가 날 때까지 대기 (읽기/큐도 같이 멈춤)
+                self.stats["outbox_waits"] += 1
+                await self._room.wait()
+            if post:
+                self.post(self._deliver)
+
+# ===== 시험용 게이지 (흉내 서버) =====
+async def stand_in_server(host="127.0.0.1", port=5020, rate=20.0, burst=0, seed=0,
+                          base=9000.0, noise=150.0, count=None, started=None):
+    """연결마다 rate 건/초로 측정값 줄("ST,GS,+09012.3,mm")을 보냄.
+    burst > 0 이면 가끔 burst 건을 한꺼번에 보냄. count 건 보내면 연결 종료."""
+    import random
+    rnd = random.Random(seed)
+
+    async def handle(reader, writer):
+        sent = 0
+        try:
+            while (count is None or sent < count) and not writer.is_closing():
+                k = burst if burst and rnd.random() < 0.1 else 1
+                if count is not None:
+                    k = min(k, count - sent)
+                for _ in range(k):
+                    v = base + rnd.uniform(-noise, noise)
+                    writer.write(f"ST,GS,{v:+09.1f},mm\r\n".encode("ascii"))
+                    sent += 1
+                await writer.drain()
+                if rate > 0:
+                    await asyncio.sleep(1.0 / rate)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    if started is not None:
+        started(server.sockets[0].getsockname()[1])
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="레이저 길이 게이지 수신 / 시험 서버")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sv = sub.add_parser("serve")
+    sv.add_argument("--host", default="127.0.0.1")
+    sv.add_argument("--port", type=int, default=5020)
+    sv.add_argument("--rate", type=float, default=20.0)
+    sv.add_argument("--burst", type=int, default=0)
+    ls = sub.add_parser("listen")
+    ls.add_argument("addr")
+    ls.add_argument("--code", default="")
+    ls.add_argument("--guides", type=float, nargs="+", default=[2950.0, 3000.0, 2900.0])
+    ls.add_argument("--loss", type=float, default=15.0)
+    ls.add_argument("--seconds", type=float, default=0, help="0 이면 Ctrl+C 까지")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "serve":
+        try:
+            asyncio.run(stand_in_server(args.host, args.port, args.rate, args.burst))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    # UI 대신 주 스레드에서 콜백을 실행 (Clock 역할)
+    calls = deque()
+    def show(items):
+        for it in items:
+            r = it["result"]
+            text = f"remain {r['remain']:.1f}" if r else it["error"][0]
+            print(f"#{it['seq']} {it['slab']:.1f} {it['code']} {text}", flush=True)
+    ing = GaugeIngest(args.addr, calls.append, show)
+    ing.set_context(args.code, args.guides, args.loss)
+    ing.start()
+    end = time.monotonic() + args.seconds if args.seconds else None
+    try:
+        while end is None or time.monotonic() < end:
+            for _ in range(len(calls)):
+                calls.popleft()()
+            time.sleep(0.005)
+    except KeyboardInterrupt:
+        pass
+    ing.stop()
+    m = ing.metrics()
+    print(f"측정 {m['readings']}건, 묶음 {m['batches']}회 (최대 {m['max_batch']}), "
+          f"UI 호출 {m['ui_calls']}회, 큐 대기 {m['queue_waits']} / 우편함 대기 {m['outbox_waits']}",
+          file=sys.stderr)
+    print(f"지연 ms 계산 p50 {m['calc_p50_ms']:.2f} p95 {m['calc_p95_ms']:.2f} / "
+          f"화면 p50 {m['ui_p50_ms']:.2f} p95 {m['ui_p95_ms']:.2f} max {m['ui_max_ms']:.2f}",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#-*- coding: utf-8 -*-
+# 저장 작업 스레드
+# - UI 는 저장할 내용(스냅샷)만 넘기고 바로 돌아감 -> 계산/화면이 디스크를 기다리지 않음
+# - 같은 키로 연달아 들어온 작업은 마지막 것만 실행 (설정 저장 합치기)
+# - 기록 추가는 HistoryQueue 가 모아 두었다가 한 번에 기록 (트랜잭션/fsync 1회)
+# - App.on_pause / on_stop 에서 flush() 로 남은 작업을 모두 씀
+
+import time, threading
+from collections import deque
+
+class PersistWorker(threading.Thread):
+    def __init__(self, delay=0.05):
+        super().__init__(name="slab-persist", daemon=True)
+        self.delay = delay           # 연속 저장을 합치기 위해 기다리는 시간 (초)
+        self._cv = threading.Condition()
+        self._jobs = {}              # key -> callable (같은 키는 덮어씀)
+        self._busy = False
+        self._flush_now = False
+        self._stopping = False
+        self.writes = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self._total_ms = 0.0
+
+    def submit(self, key, job):
+        with self._cv:
+            if key in self._jobs:
+                self.coalesced += 1
+            self._jobs[key] = job
+            self._cv.notify_all()
+
+    def flush(self, timeout=5.0):
+        """대기 중인 작업을 모두 쓸 때까지 기다림 (지연 없이 바로 실행)"""
+        end = time.monotonic() + timeout
+        with self._cv:
+            self._flush_now = True
+            self._cv.notify_all()
+            while self._jobs or self._busy:
+                left = end - time.monotonic()
+                if left <= 0:
+                    return False
+                self._cv.wait(left)
+        return True
+
+    def stop(self, timeout=5.0):
+        self.flush(timeout)
+        with self._cv:
+            self._stopping = True
+            self._cv.notify_all()
+        self.join(timeout)
+
+    def stats(self):
+        with self._cv:
+            return {
+                "queue_depth": len(self._jobs),
+                "writes": self.writes,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "last_ms": self.last_ms,
+                "avg_ms": self._total_ms / self.writes if self.writes else 0.0,
+                "max_ms": self.max_ms,
+            }
+
+    def run(self):
+        while True:
+            with self._cv:
+                while not self._jobs and not self._stopping:
+                    self._cv.wait()
+                if self._stopping and not self._jobs:
+                    return
+                if not self._flush_now and self.delay:
+                    # 짧게 기다리며 뒤따르는 저장 요청을 합침
+                    # (submit 의 notify_all 에 깨어나도 마감 시각까지 다시 기다림)
+                    deadline = time.monotonic() + self.delay
+                    while not self._flush_now and not self._stopping:
+                        left = deadline - time.monotonic()
+                        if left <= 0:
+                            break
+                        self._cv.wait(left)
+                self._flush_now = False
+                jobs = list(self._jobs.values())
+                self._jobs.clear()
+                self._busy = True
+            for job in jobs:
+                t0 = time.perf_counter()
+                try:
+                    job()
+                except Exception:
+                    self.errors += 1
+                ms = (time.perf_counter() - t0) * 1000.0
+                self.writes += 1
+                self.last_ms = ms
+                self.max_ms = max(self.max_ms, ms)
+                self._total_ms += ms
+            with self._cv:
+                self._busy = False
+                self._cv.notify_all()
+
+class HistoryQueue:
+    """기록 저장소 앞단: append 는 메모리에만 넣고 저장은 PersistWorker 가 처리.
+
+    아직 안 써진 기록도 len / 인덱스 접근에 바로 보이므로 기록 화면은 그대로 사용.
+    sinks: 저장소에 쓴 뒤 같은 묶음을 append_many 로 받는 곳 (열 보관소 등, 실패해도 기록은 유지)
+    """
+
+    def __init__(self, store, worker, sinks=()):
+        self.store = store
+        self.worker = worker
+        self.sinks = list(sinks)
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._base = len(store)
+
+    def __len__(self):
+        with self._lock:
+            return self._base + len(self._pending)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, i):
+        with self._lock:
+            total = self._base + len(self._pending)
+            if i < 0:
+                i += total
+            if not 0 <= i < total:
+                raise IndexError(i)
+            if i >= self._base:
+                return self._pending[i - self._base]
+        return self.store[i]
+
+    def recent(self, offset, limit):
+        """최신순 offset 번째부터 limit 건 (아직 안 써진 기록 포함)"""
+        with self._lock:
+            pend = list(reversed(self._pending))
+            # 저장 직후 _base 갱신 전이면 저장소 쪽에 같은 기록이 이미 들어 있음 -> 건너뜀
+            extra = len(self.store) - self._base
+        out = pend[offset:offset + limit]
+        if len(out) < limit:
+            skip = max(0, offset - len(pend)) + max(0, extra)
+            out += self.store.recent(skip, limit - len(out))
+        return out
+
+    def codes(self):
+        with self._lock:
+            pend = [r.get("code") for r in self._pending]
+        return self.store.codes() | {c for c in pend if c}
+
+    def append(self, record):
+        with self._lock:
+            self._pending.append(record)
+        self.worker.submit("history", self._drain)
+
+    def _drain(self):
+        with self._lock:
+            batch = list(self._pending)
+        if not batch:
+            return
+        self.store.append_many(batch)
+        with self._lock:
+            for _ in batch:
+                self._pending.popleft()
+            self._base = len(self.store)
+        for sink in self.sinks:
+            try:
+                sink.append_many(batch)
+            except Exception:
+                pass
+
+    def __getattr__(self, name):
+        # query / count 등 저장소 고유 기능은 그대로 전달
+        return getattr(self.store, name)
@@ -0,0 +1,140 @@
+#-*- coding: utf-8 -*-
+# 작업지시 파일 -> 강번별 계획 색인
+# - 생산계획에서 받은 작업지시(CSV/JSONL, slab_cli 와 같은 열 형식)를 백그라운드 스레드에서 읽어
+#   전체 강번(prefix + 앞자리 + "-0" + 뒷자리) -> (Slab 실길이, 지시길이, _compute 결과) 로 색인
+# - 강번 입력이 끝나면 get() 한 번으로 입력값과 결과를 바로 채움 (다시 계산하지 않음)
+# - 읽는 도중에도 이미 읽은 행은 바로 조회 가능 (batch 행마다 다른 스레드에 양보)
+# - 다시 읽을 때는 새 dict 에 채운 뒤 끝나면 통째로 바꿈 (지워진 강번 / 예전 prefix 결과가 남지 않음)
+# - 인코딩은 UTF-8(BOM 포함), 안 되면 cp949 (엑셀 기본 저장). 읽기 실패는 error 에 남기고 on_done 은 항상 호출
+
+import os, time, threading
+
+from slab_core import _compute, check_inputs
+from slab_cli import _detect_format, read_records, parse_record
+
+PLAN_FILES = ("work_orders.csv", "work_orders.jsonl")
+
+def find_plan_file(dirs):
+    """dirs 중 처음 발견되는 작업지시 파일 경로 (없으면 None)"""
+    for d in dirs:
+        for name in PLAN_FILES:
+            path = os.path.join(d, name)
+            if d and os.path.isfile(path):
+                return path
+    return None
+
+class PlanIndex:
+    def __init__(self):
+        self._map = {}
+        self._loading = {}          # 읽는 중인 새 색인 (끝나면 _map 으로)
+        self._lock = threading.Lock()   # _map / _loading 교체와 get() 의 다시 계산 저장
+        self.path = None
+        self.mtime = None
+        self.loaded = 0
+        self.skipped = 0
+        self.done = False
+        self.error = ""
+        self.load_ms = 0.0
+        self._thread = None
+
+    def __len__(self):
+        return len(self._map)
+
+    def __contains__(self, code):
+        return code in self._map
+
+    def codes(self):
+        return list(self._map)
+
+    def get(self, code, loss):
+        """-> {"slab", "guides", "result"} 또는 None. 손실 설정이 바뀐 경우만 다시 계산"""
+        with self._lock:
+            loading = self._loading.get(code)
+            ent = loading or self._map.get(code)
+        if ent is None:
+            return None
+        if ent["loss"] != loss and ent["guides"]:
+            new = dict(ent, loss=loss, result=_compute(ent["slab"], ent["guides"], loss))
+            # 읽는 중인 색인은 읽기 스레드 것이라 건드리지 않음.
+            # 완성된 색인도 그사이 바뀌지 않았을 때만 저장 (새로 읽은 값을 옛 값으로 덮지 않게)
+            if loading is None:
+                with self._lock:
+                    if self._map.get(code) is ent:
+                        self._map[code] = new
+            ent = new
+        return ent
+
+    def start(self, path, prefix, loss, batch=2000, on_batch=None, on_done=None):
+        """백그라운드 스레드에서 path 를 읽기 시작 (이미 같은 파일이면 무시)"""
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        if path == self.path and mtime == self.mtime:
+            return self._thread
+        self.path, self.mtime = path, mtime
+        self._thread = threading.Thread(
+            target=self.load, args=(path, prefix, loss, batch, on_batch, on_done),
+            name="slab-plan", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def load(self, path, prefix, loss, batch=2000, on_batch=None, on_done=None):
+        t0 = time.perf_counter()
+        me = threading.current_thread()
+        # 그사이 다른 파일로 다시 시작했으면(start) 이 스레드의 결과는 버림 (완료 알림은 새 스레드가)
+        current = lambda: self._thread is None or self._thread is me or not self._thread.is_alive()
+        self.done = False
+        self.error = ""
+        new = {}
+        try:
+            for encoding in ("utf-8-sig", "cp949"):
+                # 인코딩을 바꿔 다시 읽을 때는 처음부터
+                new = {}
+                if current():
+                    with self._lock:
+                        self._loading = new
+                self.loaded = self.skipped = 0
+                try:
+                    self._read(path, encoding, prefix, loss, new, batch, on_batch)
+                    break
+                except UnicodeDecodeError as e:
+                    self.error = f"인코딩 오류: {e}"
+            else:
+                new = None
+            if new is not None:
+                self.error = ""
+        except Exception as e:
+            # 파일이 중간에 지워짐 / 형식 오류 등: 예전 색인을 그대로 둠
+            self.error = str(e) or type(e).__name__
+            new = None
+        finally:
+            if current():
+                with self._lock:
+                    if new is not None:
+                        self._map = new
+                    self._loading = {}
+                self.load_ms = (time.perf_counter() - t0) * 1000.0
+                self.done = True
+                if on_done:
+                    on_done(self)
+
+    def _read(self, path, encoding, prefix, loss, new, batch, on_batch):
+        with open(path, "r", encoding=encoding, newline="") as f:
+            in_format, lines = _detect_format(f)
+            for rec in read_records(lines, in_format):
+                try:
+                    code, slab, values = parse_record(rec, prefix)
+                    guides, err = check_inputs(slab, values)
+                except Exception:
+                    code, err = None, True
+                if not code or err:
+                    self.skipped += 1
+                    continue
+                new[code] = {"slab": slab, "guides": guides, "loss": loss,
+                             "result": _compute(slab, guides, loss)}
+                self.loaded += 1
+                if self.loaded % batch == 0:
+                    if on_batch:
+                        on_batch(self)
+                    time.sleep(0)
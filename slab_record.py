@@ -0,0 +1,265 @@
+#-*- coding: utf-8 -*-
+# 계산 기록의 압축 표현
+# - HistoryRecord : __slots__ 로 입력값(강번, 시각, Slab, 지시길이, 손실)만 보관
+#                   total_loss / remain / add_each / real / timestamp 는 읽을 때 계산
+#                   d["real"], d.get("code") 처럼 dict 와 같은 방식으로 읽으므로 문구 생성 코드는 그대로
+# - RecordColumns : 여러 건을 열(array) 단위로 보관 (대량 기록 / 배치 결과)
+# - encode/decode : 한 건을 키 이름 없는 바이너리로 (길이는 0.1 mm int32, 안 맞으면 float64)
+
+import math, struct
+from array import array
+from datetime import datetime
+
+from slab_core import _compute
+from slab_fixed import SCALE, to_units, FixedBatch
+
+_TS_FMT = "%m-%d %H:%M:%S"
+_DERIVED = ("total_loss", "remain", "add_each", "real")
+_KEYS = ("slab", "guides", "loss") + _DERIVED + ("code", "timestamp", "ts", "id")
+
+def _ts_text(ts):
+    return datetime.fromtimestamp(ts).strftime(_TS_FMT)
+
+class HistoryRecord:
+    __slots__ = ("code", "ts", "slab", "guides", "loss", "id", "_timestamp")
+
+    def __init__(self, slab, guides, loss, code="", ts=0.0, timestamp=None, id=None):
+        self.slab = float(slab)
+        self.guides = tuple(float(g) for g in guides)
+        self.loss = float(loss)
+        self.code = code or ""
+        self.ts = float(ts or 0.0)
+        # ts 로 만들 수 있는 표시 시각은 따로 들고 있지 않음 (예전 기록만 문자열 보관)
+        if timestamp is not None and self.ts and timestamp == _ts_text(self.ts):
+            timestamp = None
+        self._timestamp = timestamp
+        self.id = id
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["slab"], d["guides"], d.get("loss", 15.0), d.get("code"),
+                   d.get("ts"), d.get("timestamp"), d.get("id"))
+
+    @property
+    def timestamp(self):
+        if self._timestamp is None and self.ts:
+            return _ts_text(self.ts)
+        return self._timestamp
+
+    def result(self):
+        return _compute(self.slab, list(self.guides), self.loss)
+
+    # ----- dict 처럼 읽기 -----
+    def __getitem__(self, key):
+        if key in _DERIVED:
+            res = self.result()
+            if res is None:
+                raise KeyError(key)
+            return res[key]
+        if key == "guides":
+            return list(self.guides)
+        if key in _KEYS:
+            v = self.timestamp if key == "timestamp" else getattr(self, key)
+            if v is None or (key == "ts" and not v):
+                raise KeyError(key)
+            return v
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == "timestamp":
+            self._timestamp = value
+        elif key in ("code", "ts", "id"):
+            setattr(self, key, value)
+        else:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def keys(self):
+        return list(self.to_dict())
+
+    def to_dict(self):
+        d = {"slab": self.slab, "guides": list(self.guides), "loss": self.loss}
+        res = self.result()
+        if res is not None:
+            for k in _DERIVED:
+                d[k] = res[k]
+        d["code"] = self.code
+        for k in ("timestamp", "ts", "id"):
+            v = self.get(k)
+            if v is not None:
+                d[k] = v
+        return d
+
+    def __eq__(self, other):
+        if isinstance(other, HistoryRecord):
+            other = other.to_dict()
+        return isinstance(other, dict) and self.to_dict() == other
+
+    def __repr__(self):
+        return f"HistoryRecord({self.code!r}, slab={self.slab}, guides={list(self.guides)})"
+
+def compactable(d):
+    """dict 기록을 HistoryRecord 로 바꿔도 같은 값이 나오는지 (모르는 키 / 다른 계산식 / nan·inf 면 False)"""
+    if any(k not in _KEYS for k in d):
+        return False
+    try:
+        vals = [float(d["slab"]), float(d.get("loss", 15.0))] + [float(g) for g in d["guides"]]
+    except (KeyError, TypeError, ValueError):
+        return False
+    if not all(math.isfinite(v) for v in vals):
+        return False
+    res = _compute(vals[0], vals[2:], vals[1])
+    return res is not None and all(k not in d or d[k] == res[k] for k in _DERIVED)
+
+# ===== 한 건 바이너리 =====
+# flags(B) n(H) code 길이(H) ts(d) | 길이 (n+2)개: slab, loss, 지시길이 | code | [timestamp 길이(B) + 문자열]
+_HEAD = struct.Struct("<BHHd")
+_F_FLOAT = 1        # 길이를 float64 로 (0.1 mm 로 정확히 안 떨어지는 값이 있을 때)
+_F_TEXT_TS = 2      # 예전 기록의 timestamp 문자열 포함
+
+def _lengths(rec):
+    vals = [rec.slab, rec.loss] + list(rec.guides)
+    units = [to_units(v) for v in vals]
+    if all(u is not None and u / SCALE == v for u, v in zip(units, vals)):
+        return 0, struct.pack(f"<{len(units)}i", *units)
+    return _F_FLOAT, struct.pack(f"<{len(vals)}d", *vals)
+
+def encode(rec):
+    if not isinstance(rec, HistoryRecord):
+        rec = HistoryRecord.from_dict(rec)
+    flags, body = _lengths(rec)
+    code = rec.code.encode("utf-8")
+    tail = b""
+    if rec._timestamp is not None:
+        flags |= _F_TEXT_TS
+        t = rec._timestamp.encode("utf-8")[:255]
+        tail = bytes([len(t)]) + t
+    return _HEAD.pack(flags, len(rec.guides), len(code), rec.ts) + body + code + tail
+
+def decode(buf, id=None):
+    flags, n, lc, ts = _HEAD.unpack_from(buf)
+    pos = _HEAD.size
+    if flags & _F_FLOAT:
+        vals = struct.unpack_from(f"<{n + 2}d", buf, pos)
+        pos += 8 * (n + 2)
+    else:
+        vals = [u / SCALE for u in struct.unpack_from(f"<{n + 2}i", buf, pos)]
+        pos += 4 * (n + 2)
+    code = bytes(buf[pos:pos + lc]).decode("utf-8")
+    pos += lc
+    timestamp = None
+    if flags & _F_TEXT_TS:
+        lt = buf[pos]
+        timestamp = bytes(buf[pos + 1:pos + 1 + lt]).decode("utf-8")
+    return HistoryRecord(vals[0], vals[2:], vals[1], code, ts, timestamp, id)
+
+# ===== 열 단위 보관 =====
+_COL_MAGIC = b"SRC1"
+_COL_HEAD = struct.Struct("<4sIII")
+
+class RecordColumns:
+    """기록 여러 건을 열 단위로: 시각 float64, 길이 0.1 mm int32(FixedBatch), 강번은 바이트 한 덩어리.
+
+    0.1 mm 로 안 떨어지는 값이나 예전 timestamp 문자열이 있는 드문 행은 _extra 에 HistoryRecord 로.
+    """
+    __slots__ = ("ts", "lens", "codes", "code_offs", "_extra")
+
+    def __init__(self):
+        self.ts = array("d")
+        self.lens = FixedBatch()
+        self.codes = bytearray()
+        self.code_offs = array("I", [0])
+        self._extra = {}
+
+    @classmethod
+    def from_records(cls, records):
+        cols = cls()
+        for rec in records:
+            cols.append(rec)
+        return cols
+
+    def __len__(self):
+        return len(self.ts)
+
+    def append(self, rec):
+        if not isinstance(rec, HistoryRecord):
+            rec = HistoryRecord.from_dict(rec)
+        i = len(self.ts)
+        self.ts.append(rec.ts)
+        self.codes += rec.code.encode("utf-8")
+        self.code_offs.append(len(self.codes))
+        if _lengths(rec)[0] or rec._timestamp is not None:
+            self._extra[i] = rec
+            self.lens.append(0, (), 0)
+        else:
+            self.lens.append(rec.slab, rec.guides, rec.loss)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.ts)
+        if not 0 <= i < len(self.ts):
+            raise IndexError(i)
+        rec = self._extra.get(i)
+        if rec is not None:
+            return rec
+        slab_u, guides_u, loss_u = self.lens[i]
+        code = self.codes[self.code_offs[i]:self.code_offs[i + 1]].decode("utf-8")
+        return HistoryRecord(slab_u / SCALE, [g / SCALE for g in guides_u], loss_u / SCALE,
+                             code, self.ts[i])
+
+    def __iter__(self):
+        for i in range(len(self.ts)):
+            yield self[i]
+
+    @property
+    def nbytes(self):
+        return (self.ts.itemsize * len(self.ts) + self.lens.nbytes + len(self.codes)
+                + self.code_offs.itemsize * len(self.code_offs)
+                + sum(len(encode(r)) for r in self._extra.values()))
+
+    # ----- 바이너리 -----
+    def to_bytes(self):
+        lens = self.lens.to_bytes()
+        extra = b"".join(struct.pack("<II", i, len(b)) + b
+                         for i, b in ((i, encode(r)) for i, r in sorted(self._extra.items())))
+        ts, offs = array("d", self.ts), array("I", self.code_offs)
+        if struct.pack("=I", 1) != struct.pack("<I", 1):
+            ts.byteswap()
+            offs.byteswap()
+        return (_COL_HEAD.pack(_COL_MAGIC, len(self.ts), len(lens), len(self._extra))
+                + lens + ts.tobytes() + offs.tobytes() + bytes(self.codes) + extra)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, n, n_lens, n_extra = _COL_HEAD.unpack_from(data)
+        if magic != _COL_MAGIC:
+            raise ValueError("RecordColumns 형식이 아님")
+        cols = cls()
+        pos = _COL_HEAD.size
+        cols.lens = FixedBatch.from_bytes(data[pos:pos + n_lens])
+        pos += n_lens
+        cols.ts = array("d")
+        cols.ts.frombytes(data[pos:pos + 8 * n])
+        pos += 8 * n
+        cols.code_offs = array("I")
+        cols.code_offs.frombytes(data[pos:pos + 4 * (n + 1)])
+        pos += 4 * (n + 1)
+        if struct.pack("=I", 1) != struct.pack("<I", 1):
+            cols.ts.byteswap()
+            cols.code_offs.byteswap()
+        cols.codes = bytearray(data[pos:pos + cols.code_offs[-1]])
+        pos += cols.code_offs[-1]
+        for _ in range(n_extra):
+            i, size = struct.unpack_from("<II", data, pos)
+            pos += 8
+            cols._extra[i] = decode(data[pos:pos + size])
+            pos += size
+        return cols
@@ -0,0 +1,321 @@
+#-*- coding: utf-8 -*-
+# 후판 계산 로컬 서비스 (asyncio HTTP/JSON, Kivy 미사용)
+# - 라인 PC / MES 연동용: 앱 화면과 같은 _compute 결과를 slab_cli 와 같은 출력 형식으로
+# - 동시에 들어온 /calc 요청은 짧은 창(window_ms) 동안 모아 한 번에 계산 (numpy 가 있으면 compute_batch)
+# - HTTP/1.1 keep-alive (Connection: close 또는 idle_s 동안 요청이 없으면 끊음), 본문은 Content-Length 만
+# - /stats : 처리량(전체 / 최근 10초), 지연 p50/p95/p99, 묶음 크기
+#
+# 사용 예)
+#   python slab_service.py --port 8765 --loss 15
+#   curl -d '{"slab": 9000, "guides": [2950, 3000, 2900]}' localhost:8765/calc
+#   curl -d '{"records": [{"code": "SG94123-01", "slab": 9000, "p1": 2950, "p2": 3000}]}' localhost:8765/batch
+#
+# 엔드포인트
+#   POST /calc   {"slab", "guides" 또는 p1.., "code" 또는 front/back, "loss"?, "round"?} -> 결과 1건
+#   POST /batch  [...] 또는 {"records": [...], "round"?}                                  -> {"results": [...]}
+#   GET  /stats, GET /health
+# 잘못된 요청(손실 값 오류 등)은 그 요청만 400, 같은 묶음에 모인 다른 요청은 정상 응답
+
+import sys, time, json, asyncio, argparse
+from collections import deque
+
+from slab_core import _compute, check_inputs, ERR_VALUE
+from slab_cli import parse_record, format_output, _as_num
+
+try:
+    import numpy as np
+    from slab_batch import compute_batch, iter_results
+except ImportError:  # numpy 없으면 한 건씩 _compute (결과는 같음)
+    np = None
+
+# 이 개수 이상일 때만 배열로 계산 (적으면 배열 만드는 비용이 더 큼)
+NP_MIN_BATCH = 16
+MAX_BODY = 8 * 1024 * 1024
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+def _parse(rec, prefix, loss):
+    code, slab, values = parse_record(rec, prefix)
+    guides, err = check_inputs(slab, values)
+    row_loss = loss
+    if rec.get("loss") is not None:
+        row_loss = _as_num(rec["loss"])
+        if row_loss is None or row_loss < 0:
+            raise ValueError(f"{ERR_VALUE[0]}: 절단 손실 값이 올바르지 않습니다.")
+    return code, slab, guides, err, row_loss
+
+def calc_rows(items, prefix, loss):
+    """[(rec, do_round)] -> 출력 dict 목록 (입력 순서). 계산 가능한 행은 한 번에.
+    한 행에서 난 예외는 그 행 자리에 예외 객체로 남김 (같은 묶음의 다른 행은 영향 없음)"""
+    parsed = []
+    for rec, _ in items:
+        try:
+            parsed.append(_parse(rec, prefix, loss))
+        except Exception as e:
+            parsed.append(e)
+    ok = [i for i, p in enumerate(parsed) if not isinstance(p, Exception) and p[3] is None]
+    results = [None] * len(parsed)
+    done = False
+    if np is not None and len(ok) >= NP_MIN_BATCH:
+        try:
+            k = max(len(parsed[i][2]) for i in ok)
+            slab = np.array([parsed[i][1] for i in ok], dtype=np.float64)
+            loss_v = np.array([parsed[i][4] for i in ok], dtype=np.float64)
+            guides = np.full((len(ok), k), np.nan)
+            for r, i in enumerate(ok):
+                g = parsed[i][2]
+                guides[r, :len(g)] = g
+            res = compute_batch(slab, guides, loss_v)
+            for i, out in zip(ok, iter_results(slab, guides, loss_v, res)):
+                results[i] = out
+            done = True
+        except Exception:
+            pass        # 한 건씩 다시 (어느 행 문제인지 가림)
+    if not done:
+        for i in ok:
+            _, slab, guides, _, row_loss = parsed[i]
+            try:
+                results[i] = _compute(slab, guides, row_loss)
+            except Exception as e:
+                parsed[i] = e
+    outs = []
+    for i, p in enumerate(parsed):
+        if not isinstance(p, Exception):
+            try:
+                p = format_output(p[0], results[i], p[3], items[i][1])
+            except Exception as e:
+                p = e
+        outs.append(p)
+    return outs
+
+def compute_many(items, prefix, loss):
+    """calc_rows 와 같고, 예외가 난 행은 오류 dict 로"""
+    outs = []
+    for (rec, _), out in zip(items, calc_rows(items, prefix, loss)):
+        if isinstance(out, Exception):
+            code = rec.get("code") if isinstance(rec, dict) else None
+            out = {"code": str(code or ""), "error": str(out) or type(out).__name__}
+        outs.append(out)
+    return outs
+
+def _pct(vals, q):
+    if not vals:
+        return 0.0
+    s = sorted(vals)
+    return s[min(len(s) - 1, int(len(s) * q / 100))]
+
+class CalcService:
+    """계산 요청 묶음 처리 + HTTP 처리. serve() 로 실행"""
+
+    def __init__(self, prefix="SG94", loss=15.0, do_round=False, window_ms=1.0,
+                 max_batch=512, idle_s=15.0, keep=10000):
+        self.prefix = prefix
+        self.loss = float(loss)
+        self.do_round = bool(do_round)
+        self.window = max(0.0, window_ms) / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.idle_s = idle_s
+        self._pending = []
+        self._wake = None
+        self.t_start = time.perf_counter()
+        self.stats = {"requests": 0, "records": 0, "errors": 0, "connections": 0,
+                      "batches": 0, "batched_records": 0, "max_batch": 0}
+        self.lat = deque(maxlen=keep)            # 요청 처리 시간 (ms)
+        self.recent = deque()                   # 최근 10초 응답 시각
+
+    # ----- 묶음 계산 -----
+    async def calc(self, rec, do_round):
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((rec, do_round, fut))
+        self._wake.set()
+        return await fut
+
+    async def _batcher(self):
+        while True:
+            await self._wake.wait()
+            # 같은 순간에 도착한 요청이 모이도록 한 번 양보, 동시 요청이 있으면 window 만큼 더 모음
+            # (혼자 보내는 클라이언트는 기다리지 않음)
+            await asyncio.sleep(0)
+            if self.window and 1 < len(self._pending) < self.max_batch:
+                await asyncio.sleep(self.window)
+            batch = self._pending[:self.max_batch]
+            del self._pending[:len(batch)]
+            if not self._pending:
+                self._wake.clear()
+            if not batch:
+                continue
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        self.stats["batches"] += 1
+        self.stats["batched_records"] += len(batch)
+        self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+        try:
+            outs = calc_rows([(rec, r) for rec, r, _ in batch], self.prefix, self.loss)
+        except Exception as e:
+            for _, _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        # 잘못된 요청은 그 요청만 400 (ValueError), 같은 묶음의 다른 요청은 정상 응답
+        for (_, _, fut), out in zip(batch, outs):
+            if fut.done():
+                continue
+            if isinstance(out, Exception):
+                fut.set_exception(ValueError(str(out) or type(out).__name__))
+            else:
+                fut.set_result(out)
+
+    def metrics(self):
+        now = time.perf_counter()
+        while self.recent and now - self.recent[0] > 10.0:
+            self.recent.popleft()
+        up = now - self.t_start
+        lat = list(self.lat)
+        st = self.stats
+        return dict(st, uptime_s=round(up, 1),
+                    rps=round(st["requests"] / up, 1) if up > 0 else 0.0,
+                    rps_10s=round(len(self.recent) / min(10.0, up), 1) if up > 0 else 0.0,
+                    avg_batch=round(st["batched_records"] / st["batches"], 2) if st["batches"] else 0.0,
+                    p50_ms=round(_pct(lat, 50), 3), p95_ms=round(_pct(lat, 95), 3),
+                    p99_ms=round(_pct(lat, 99), 3), max_ms=round(max(lat), 3) if lat else 0.0,
+                    numpy=np is not None)
+
+    # ----- HTTP -----
+    def _round_of(self, obj):
+        r = obj.get("round") if isinstance(obj, dict) else None
+        return self.do_round if r is None else bool(r)
+
+    async def _route(self, method, path, body):
+        path = path.split("?", 1)[0]
+        if path == "/health":
+            return 200, {"ok": True}
+        if path == "/stats":
+            return 200, self.metrics()
+        if path not in ("/calc", "/batch"):
+            return 404, {"error": "없는 경로"}
+        if method != "POST":
+            return 405, {"error": "POST 만 가능"}
+        try:
+            obj = json.loads(body or b"null")
+        except ValueError:
+            return 400, {"error": "JSON 형식 오류"}
+        if path == "/calc":
+            if not isinstance(obj, dict):
+                return 400, {"error": "객체 하나를 보내야 함"}
+            self.stats["records"] += 1
+            try:
+                return 200, await self.calc(obj, self._round_of(obj))
+            except ValueError as e:
+                return 400, {"error": str(e)}
+        records = obj.get("records") if isinstance(obj, dict) else obj
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            return 400, {"error": "records 는 객체 목록"}
+        do_round = self._round_of(obj)
+        self.stats["records"] += len(records)
+        # 이미 묶음이므로 대기열을 거치지 않고 바로 한 번에
+        return 200, {"results": compute_many([(r, do_round) for r in records],
+                                             self.prefix, self.loss)}
+
+    async def handle(self, reader, writer):
+        self.stats["connections"] += 1
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_s)
+                except asyncio.TimeoutError:
+                    break
+                if not line:
+                    break
+                t0 = time.perf_counter()
+                try:
+                    method, path, version = line.decode("latin-1").split()
+                except ValueError:
+                    await self._send(writer, 400, {"error": "요청 줄 형식 오류"}, False)
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                conn = headers.get("connection", "").lower()
+                keep = conn != "close" if version == "HTTP/1.1" else conn == "keep-alive"
+                body = b""
+                if method == "POST":
+                    if "chunked" in headers.get("transfer-encoding", "").lower() \
+                            or "content-length" not in headers:
+                        await self._send(writer, 411, {"error": "Content-Length 필요"}, False)
+                        break
+                    try:
+                        n = int(headers["content-length"] or 0)
+                    except ValueError:
+                        n = -1
+                    if n < 0:
+                        await self._send(writer, 400, {"error": "Content-Length 형식 오류"}, False)
+                        break
+                    if n > MAX_BODY:
+                        await self._send(writer, 413, {"error": "본문이 너무 큼"}, False)
+                        break
+                    body = await reader.readexactly(n)
+                try:
+                    status, obj = await self._route(method, path, body)
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    status, obj = 500, {"error": str(e)}
+                await self._send(writer, status, obj, keep)
+                now = time.perf_counter()
+                self.stats["requests"] += 1
+                self.lat.append((now - t0) * 1000.0)
+                self.recent.append(now)
+                if not keep:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send(self, writer, status, obj, keep):
+        data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep else 'close'}\r\n\r\n").encode("latin-1")
+        writer.write(head + data)
+        await writer.drain()
+
+    async def serve(self, host="127.0.0.1", port=8765, started=None):
+        self._wake = asyncio.Event()
+        batcher = asyncio.create_task(self._batcher())
+        server = await asyncio.start_server(self.handle, host, port, backlog=512)
+        if started is not None:
+            started(server.sockets[0].getsockname()[1])
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="후판 계산 로컬 서비스 (HTTP/JSON)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--prefix", default="SG94", help="강번 고정부 (front/back 입력일 때)")
+    ap.add_argument("--loss", type=float, default=15.0, help="절단 손실 1회 (mm, 요청별 loss 가 우선)")
+    ap.add_argument("--round", action="store_true", help="출력값을 정수로 표시 (요청별 round 가 우선)")
+    ap.add_argument("--window-ms", type=float, default=1.0, help="/calc 요청을 모으는 시간 (0 = 같은 순간만)")
+    ap.add_argument("--max-batch", type=int, default=512)
+    args = ap.parse_args(argv)
+    svc = CalcService(args.prefix, args.loss, args.round, args.window_ms, args.max_batch)
+    def _started(port):
+        print(f"slab_service http://{args.host}:{port} (numpy {'사용' if np is not None else '없음'})",
+              file=sys.stderr, flush=True)
+    try:
+        asyncio.run(svc.serve(args.host, args.port, _started))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+#-*- coding: utf-8 -*-
+# 주문 조합 최적화 (Slab 1장) / 로트 배정 (Slab 여러 장)
+# - Slab 실길이, 절단 손실, 대기 주문(지시길이 + 허용 최소/최대) 풀에서
+#   스크랩(남는 길이)이 가장 적은 주문 조합과 개수를 찾음
+# - 길이는 0.1 mm 정수로 바꿔 계산 (slab_fixed.to_units, 앱/배치와 같은 사사오입)
+# - 앱 화면에는 연결하지 않음: 대기 주문 풀(허용 최소/최대)을 받을 입력이 앱에 없어
+#   라인 PC 의 명령행(아래 main)과 배치 도구에서만 사용
+#
+# 모델
+#   k 개를 자르면 절단 k-1 회, 각 조각 실제 길이는 [min, max] 안
+#   가능 조건 : Σmin + loss·(k-1) ≤ slab
+#   스크랩    : max(0, slab - loss·(k-1) - Σmax)   (조각을 max 까지 늘려도 남는 길이)
+#   => 용량 C = slab + loss, 무게 w = min + loss, 값 v = max + loss 인 배낭 문제에서
+#      min(Σv, C) 를 최대화
+#
+# 탐색: 분기 한정(branch and bound)
+#   - 같은 (min, max) 주문은 한 종류로 묶고 수량으로 처리
+#   - 깊이 = 조각 수 (종류 수와 무관), 조합은 중복 없이 한 번씩만
+#   - 상한: 현재 값 + 남은 용량 × (남은 종류 중 최대 v/w), C 이상이면 스크랩 0 -> 즉시 종료
+#   - 시간 예산(budget_ms)을 넘기면 그때까지 찾은 최선해를 optimal=False 로 반환
+#
+# 로트 배정 (plan_lot): 한 히트의 Slab 여러 장에 주문 전체를 배정
+#   1) best-fit decreasing: 긴 조각부터, 들어가는 Slab 중 남는 용량이 가장 작은 곳에
+#   2) 국소 탐색 (좋아질 때만 반영, 시간 예산까지 반복)
+#      - 미배정 조각이 있으면 스크랩 큰 Slab 부터 (자기 조각 + 미배정) 으로 solve() 재배치
+#      - 가장 덜 찬 Slab 의 조각을 다른 Slab 빈 곳으로 옮겨 Slab 을 비움 (사용 Slab 감소)
+#      - 스크랩 큰 Slab 2장씩 묶어 재배치
+#   3) workers > 1 이면 Slab/주문을 나눠 프로세스 풀에서 1)~2) 를 병렬로 돌린 뒤
+#      남은 미배정 조각으로 전체에 한 번 더 1)~2)
+
+import sys, csv, json, time, argparse, bisect
+from concurrent.futures import ProcessPoolExecutor
+
+from slab_fixed import SCALE, to_units
+
+def _to_units(x):
+    u = to_units(x)
+    if u is None:
+        raise ValueError(f"길이 값 오류: {x!r}")
+    return u
+
+def make_order(oid, length, tol_minus=0.0, tol_plus=0.0, qty=1):
+    """지시길이 ± 허용오차로 주문 dict 를 만듦"""
+    length = float(length)
+    return {"id": oid, "length": length, "min": length - float(tol_minus),
+            "max": length + float(tol_plus), "qty": int(qty)}
+
+def _spread(slab, loss, lo, hi):
+    # 남는 길이를 조각들에 고르게 나누되 각 조각은 max 를 넘지 않게 (물 채우기)
+    k = len(lo)
+    extra = slab - loss * (k - 1) - sum(lo)
+    real = list(lo)
+    open_ = [i for i in range(k) if hi[i] > lo[i]]
+    while extra > 0 and open_:
+        share = extra // len(open_)
+        if share == 0:
+            # 나머지 0.1 mm 들은 앞 조각부터 1 단위씩
+            for i in open_[:extra]:
+                real[i] += 1
+            extra = 0
+            break
+        nxt = []
+        for i in open_:
+            add = min(share, hi[i] - real[i])
+            real[i] += add
+            extra -= add
+            if real[i] < hi[i]:
+                nxt.append(i)
+        open_ = nxt
+    return real, max(0, extra)
+
+def solve(slab, loss, orders, max_pieces=None, budget_ms=50.0):
+    """스크랩이 가장 적은 주문 조합을 찾는다.
+
+    orders : [{"id", "min", "max", "qty"}]  (make_order 참고)
+    반환 dict:
+      pieces  : 선택된 주문 id 목록 (자르는 순서 = 긴 것부터)
+      lengths : 각 조각 실제 길이 (mm)
+      marks   : 절단 마킹 포인트 (조각 길이 + loss/2, 앱 시각화와 같은 기준)
+      cuts    : 절단 횟수
+      scrap   : 스크랩 (mm)
+      yield   : 사용률 (조각 길이 합 / slab)
+      optimal : 예산 안에 탐색을 끝냈으면 True
+      nodes   : 탐색한 노드 수
+    """
+    t_end = time.perf_counter() + budget_ms / 1000.0
+    S, L = _to_units(slab), _to_units(loss)
+    C = S + L
+
+    # 같은 (min, max) 주문 묶기
+    groups = {}
+    for o in orders:
+        lo, hi = _to_units(o["min"]), _to_units(o["max"])
+        if lo <= 0 or hi < lo or o.get("qty", 1) <= 0 or lo + L > C:
+            continue
+        g = groups.setdefault((lo, hi), [])
+        g.extend([o["id"]] * int(o.get("qty", 1)))
+    types = sorted(groups, key=lambda t: (t[1], t[0]), reverse=True)
+    T = len(types)
+    W = [lo + L for lo, hi in types]
+    V = [hi + L for lo, hi in types]
+    Q = [len(groups[t]) for t in types]
+    max_pieces = max_pieces or sum(Q)
+
+    # 뒤쪽(j 이후) 종류들의 최소 무게 / 최대 v/w
+    suf_minw = [C + 1] * (T + 1)
+    suf_ratio = [0.0] * (T + 1)
+    for j in range(T - 1, -1, -1):
+        suf_minw[j] = min(W[j], suf_minw[j + 1])
+        suf_ratio[j] = max(V[j] / W[j], suf_ratio[j + 1])
+
+    used = [0] * T
+    chosen = []
+    best = {"v": 0, "pick": [], "optimal": True}
+    nodes = 0
+
+    class _Done(Exception):
+        pass
+
+    def dfs(start, cap, v, n):
+        nonlocal nodes
+        nodes += 1
+        if (nodes & 1023) == 0 and time.perf_counter() > t_end:
+            best["optimal"] = False
+            raise _Done
+        val = v if v < C else C
+        if val > best["v"]:
+            best["v"] = val
+            best["pick"] = list(chosen)
+            if val == C:
+                raise _Done
+        if n == max_pieces:
+            return
+        for j in range(start, T):
+            if suf_minw[j] > cap:
+                break
+            ub = v + cap * suf_ratio[j]
+            if (ub if ub < C else C) <= best["v"]:
+                break
+            w = W[j]
+            if w > cap or used[j] == Q[j]:
+                continue
+            used[j] += 1
+            chosen.append(j)
+            dfs(j, cap - w, v + V[j], n + 1)
+            chosen.pop()
+            used[j] -= 1
+
+    try:
+        dfs(0, C, 0, 0)
+    except _Done:
+        pass
+
+    pick = best["pick"]
+    taken = {}
+    ids, lo, hi = [], [], []
+    for j in pick:
+        t = types[j]
+        ids.append(groups[t][taken.get(j, 0)])
+        taken[j] = taken.get(j, 0) + 1
+        lo.append(t[0])
+        hi.append(t[1])
+    if ids:
+        real, scrap_u = _spread(S, L, lo, hi)
+    else:
+        real, scrap_u = [], S
+    lengths = [r / SCALE for r in real]
+    return {
+        "slab": float(slab), "loss": float(loss),
+        "pieces": ids, "lengths": lengths,
+        "marks": [x + float(loss) / 2 for x in lengths],
+        "cuts": max(0, len(ids) - 1),
+        "scrap": scrap_u / SCALE,
+        "yield": sum(real) / S if S else 0.0,
+        "optimal": best["optimal"], "nodes": nodes,
+    }
+
+# ===== 로트 배정 =====
+def _expand(orders):
+    # 주문 수량만큼 조각으로 펼침: (조각 번호, 주문 id, min, max)
+    pieces = []
+    for o in orders:
+        for _ in range(int(o.get("qty", 1))):
+            pieces.append((len(pieces), o["id"], float(o["min"]), float(o["max"])))
+    return pieces
+
+class _Lot:
+    def __init__(self, slabs, pieces, loss):
+        self.slabs = slabs                  # [(code, length)]
+        self.pieces = {p[0]: p for p in pieces}
+        self.loss = loss
+        self.L = _to_units(loss)
+        self.C = [_to_units(length) + self.L for _, length in slabs]
+        # 조각별 무게(min + loss) / 값(max + loss) 은 한 번만 변환
+        self._w = {p[0]: _to_units(p[2]) + self.L for p in pieces}
+        self._v = {p[0]: _to_units(p[3]) + self.L for p in pieces}
+        self.assign = [[] for _ in slabs]   # Slab 별 조각 번호
+        self.used_w = [0] * len(slabs)
+        self.unplaced = set(self.pieces)
+
+    def w(self, pid):
+        return self._w[pid]
+
+    def v(self, pid):
+        return self._v[pid]
+
+    def value(self, i):
+        return min(sum(self.v(p) for p in self.assign[i]), self.C[i]) if self.assign[i] else 0
+
+    def total(self):
+        return sum(self.value(i) for i in range(len(self.slabs)))
+
+    def set_slab(self, i, pids):
+        for p in self.assign[i]:
+            self.unplaced.add(p)
+        for p in pids:
+            self.unplaced.discard(p)
+        self.assign[i] = list(pids)
+        self.used_w[i] = sum(self.w(p) for p in pids)
+
+    def best_fit(self, pids):
+        # 남은 용량 정렬 목록에서 조각 무게 이상인 가장 작은 곳 (bisect)
+        free = sorted((self.C[i] - self.used_w[i], i) for i in range(len(self.slabs)))
+        for pid in sorted(pids, key=lambda p: -self.w(p)):
+            w = self.w(pid)
+            k = bisect.bisect_left(free, (w, -1))
+            if k == len(free):
+                continue
+            cap, i = free.pop(k)
+            self.assign[i].append(pid)
+            self.used_w[i] += w
+            self.unplaced.discard(pid)
+            bisect.insort(free, (cap - w, i))
+
+    def repack(self, idx, budget_ms):
+        # idx 의 Slab 들을 (자기 조각 + 미배정 조각) 으로 차례로 다시 풀어 값이 늘면 반영
+        pool = set(self.unplaced)
+        for i in idx:
+            pool.update(self.assign[i])
+        old = sum(self.value(i) for i in idx)
+        plan = []
+        for i in idx:
+            code, length = self.slabs[i]
+            orders = [{"id": p, "min": self.pieces[p][2], "max": self.pieces[p][3], "qty": 1}
+                      for p in pool]
+            res = solve(length, self.loss, orders, budget_ms=budget_ms / len(idx))
+            plan.append(res["pieces"])
+            pool.difference_update(res["pieces"])
+        new = 0
+        for i, pids in zip(idx, plan):
+            C = self.C[i]
+            new += min(sum(self.v(p) for p in pids), C) if pids else 0
+        if new > old:
+            for i in idx:
+                self.set_slab(i, [])
+            for i, pids in zip(idx, plan):
+                self.set_slab(i, pids)
+            return True
+        return False
+
+    def scrap(self, i):
+        return self.C[i] - self.value(i) if self.assign[i] else 0
+
+    def evacuate(self, i):
+        # Slab i 의 조각을 다른 사용 중 Slab 빈 곳으로 모두 옮길 수 있으면 옮겨서 Slab 1장을 비움
+        free = sorted((self.C[j] - self.used_w[j], j) for j in range(len(self.slabs))
+                      if j != i and self.assign[j])
+        moves = []
+        for pid in sorted(self.assign[i], key=lambda p: -self.w(p)):
+            w = self.w(pid)
+            k = bisect.bisect_left(free, (w, -1))
+            if k == len(free):
+                return False
+            cap, j = free.pop(k)
+            moves.append((pid, j))
+            bisect.insort(free, (cap - w, j))
+        old = sum(self.value(j) for j in {j for _, j in moves}) + self.value(i)
+        for pid, j in moves:
+            self.assign[j].append(pid)
+            self.used_w[j] += self.w(pid)
+        new = sum(self.value(j) for j in {j for _, j in moves})
+        if new < old:
+            # 허용오차로 흡수하던 길이가 줄면 되돌림
+            for pid, j in moves:
+                self.assign[j].remove(pid)
+                self.used_w[j] -= self.w(pid)
+            return False
+        self.assign[i] = []
+        self.used_w[i] = 0
+        return True
+
+    def improve(self, t_end, slab_ms=20.0):
+        # 1) 미배정 조각이 있으면 Slab 별 재배치로 배정량을 늘림
+        # 2) 가장 덜 찬 Slab 부터 비워서 사용 Slab 수를 줄임
+        # 3) 스크랩 큰 Slab 끼리 2장씩 묶어 조각 교환
+        improved = True
+        while improved and time.perf_counter() < t_end:
+            improved = False
+            if self.unplaced:
+                order = sorted((i for i in range(len(self.slabs)) if self.scrap(i) > 0),
+                               key=self.scrap, reverse=True)
+                for i in order:
+                    if time.perf_counter() >= t_end:
+                        return
+                    if self.unplaced and self.repack([i], slab_ms):
+                        improved = True
+            used = [i for i in range(len(self.slabs)) if self.assign[i]]
+            for i in sorted(used, key=lambda i: self.used_w[i] / self.C[i]):
+                if time.perf_counter() >= t_end:
+                    return
+                if self.assign[i] and self.evacuate(i):
+                    improved = True
+            order = sorted((i for i in range(len(self.slabs)) if self.scrap(i) > 0),
+                           key=self.scrap, reverse=True)
+            for a, b in zip(order[0::2], order[1::2]):
+                if time.perf_counter() >= t_end:
+                    return
+                if self.repack([a, b], slab_ms * 2):
+                    improved = True
+
+def _plan_shard(slabs, pieces, loss, budget_s, local_search):
+    t_end = time.perf_counter() + budget_s
+    lot = _Lot(slabs, pieces, loss)
+    lot.best_fit(list(lot.pieces))
+    if local_search:
+        lot.improve(t_end)
+    return lot.assign
+
+def plan_lot(slabs, orders, loss=15.0, budget_s=5.0, workers=1, local_search=True):
+    """Slab 여러 장에 주문을 배정해 전체 사용률을 최대화한다.
+
+    slabs  : [(강번, 실길이)]
+    orders : [{"id", "min", "max", "qty"}]  (make_order 참고)
+    반환 dict:
+      slabs    : [{"code", "slab", "pieces", "lengths", "scrap"}]  (조각 없는 Slab 포함)
+      unplaced : 배정하지 못한 주문 id 목록 (수량만큼 반복)
+      yield    : 조각 길이 합 / 사용한 Slab 길이 합
+      scrap    : 사용한 Slab 스크랩 합 (mm)
+      used     : 사용한 Slab 수
+      workers  : 실제로 나눠 푼 프로세스 수 (Slab 이 workers x 2 장 미만이면 1)
+      runtime_ms
+    """
+    t0 = time.perf_counter()
+    slabs = [(code, float(length)) for code, length in slabs]
+    pieces = _expand(orders)
+    lot = _Lot(slabs, pieces, loss)
+
+    used_workers = 1
+    if workers > 1 and len(slabs) >= workers * 2:
+        used_workers = workers
+        # Slab 은 번갈아, 조각은 긴 순서로 번갈아 나눠 조각 구성이 비슷하도록
+        sl_idx = [list(range(k, len(slabs), workers)) for k in range(workers)]
+        by_len = sorted(pieces, key=lambda p: -p[2])
+        pc = [by_len[k::workers] for k in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futs = [ex.submit(_plan_shard, [slabs[i] for i in sl_idx[k]], pc[k], loss,
+                              budget_s * 0.7, local_search) for k in range(workers)]
+            for k, fut in enumerate(futs):
+                for j, pids in enumerate(fut.result()):
+                    lot.set_slab(sl_idx[k][j], pids)
+        lot.best_fit(list(lot.unplaced))
+        # 나눠 풀면 조각이 다른 묶음의 Slab 에 못 들어가므로 전체 best-fit 보다 나쁠 수 있음
+        # -> 둘 중 나은 쪽에서 국소 탐색 시작 (workers=1 보다 나빠지지 않음)
+        base = _Lot(slabs, pieces, loss)
+        base.best_fit(list(base.pieces))
+        if base.total() > lot.total():
+            lot = base
+    else:
+        lot.best_fit(list(lot.pieces))
+    if local_search:
+        lot.improve(t0 + budget_s)
+
+    out, used_len, piece_len, scrap = [], 0.0, 0.0, 0.0
+    for i, (code, length) in enumerate(slabs):
+        pids = lot.assign[i]
+        if pids:
+            lo = [_to_units(lot.pieces[p][2]) for p in pids]
+            hi = [_to_units(lot.pieces[p][3]) for p in pids]
+            real, sc = _spread(_to_units(length), lot.L, lo, hi)
+            lengths = [r / SCALE for r in real]
+            used_len += length
+            piece_len += sum(lengths)
+            scrap += sc / SCALE
+        else:
+            lengths, sc = [], 0
+        out.append({"code": code, "slab": length,
+                    "pieces": [lot.pieces[p][1] for p in pids],
+                    "lengths": lengths, "scrap": sc / SCALE})
+    return {
+        "slabs": out,
+        "unplaced": [lot.pieces[p][1] for p in sorted(lot.unplaced)],
+        "yield": piece_len / used_len if used_len else 0.0,
+        "scrap": scrap,
+        "used": sum(1 for i in range(len(slabs)) if lot.assign[i]),
+        "workers": used_workers,
+        "runtime_ms": (time.perf_counter() - t0) * 1000.0,
+    }
+
+# ===== 명령행 =====
+#   python slab_solver.py --slab 11850 --loss 15 orders.csv            # Slab 1장
+#   python slab_solver.py --lot slabs.csv --budget-s 5 orders.csv      # 로트 배정 (Slab 여러 장)
+#   orders.csv 열: id, length, tol_minus, tol_plus, qty  (또는 min, max 직접)
+#   slabs.csv  열: code, slab (또는 length)
+def _read_rows(path):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        return list(csv.DictReader(f))
+
+def read_slabs(path):
+    """-> [(강번, 실길이)]"""
+    slabs = []
+    for i, r in enumerate(_read_rows(path), 1):
+        length = r.get("slab") if r.get("slab") not in (None, "") else r.get("length")
+        slabs.append((str(r.get("code") or i), float(length)))
+    return slabs
+
+def read_orders(path):
+    rows = _read_rows(path)
+    orders = []
+    for i, r in enumerate(rows, 1):
+        oid = r.get("id") or str(i)
+        qty = int(r.get("qty") or 1)
+        if r.get("min") not in (None, "") and r.get("max") not in (None, ""):
+            orders.append({"id": oid, "length": float(r.get("length") or r["min"]),
+                           "min": float(r["min"]), "max": float(r["max"]), "qty": qty})
+        else:
+            orders.append(make_order(oid, r["length"], r.get("tol_minus") or 0,
+                                     r.get("tol_plus") or 0, qty))
+    return orders
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Slab 주문 조합 최적화 (1장 / 로트)")
+    ap.add_argument("orders", help="주문 파일 (CSV / JSONL)")
+    ap.add_argument("--slab", type=float, help="Slab 실길이 (mm), 1장 모드")
+    ap.add_argument("--lot", metavar="SLABS", help="Slab 목록 파일 (CSV / JSONL), 로트 배정 모드")
+    ap.add_argument("--loss", type=float, default=15.0, help="절단 손실 1회 (mm)")
+    ap.add_argument("--max-pieces", type=int, default=None)
+    ap.add_argument("--budget-ms", type=float, default=50.0, help="1장 모드 시간 예산")
+    ap.add_argument("--budget-s", type=float, default=5.0, help="로트 모드 시간 예산")
+    ap.add_argument("--workers", type=int, default=1, help="로트 모드 병렬 프로세스 수")
+    ap.add_argument("--no-local-search", action="store_true", help="로트 모드: best-fit 만")
+    args = ap.parse_args(argv)
+    if (args.slab is None) == (args.lot is None):
+        ap.error("--slab 또는 --lot 중 하나를 지정")
+    if args.lot:
+        res = plan_lot(read_slabs(args.lot), read_orders(args.orders), loss=args.loss,
+                       budget_s=args.budget_s, workers=max(1, args.workers),
+                       local_search=not args.no_local_search)
+    else:
+        res = solve(args.slab, args.loss, read_orders(args.orders),
+                    max_pieces=args.max_pieces, budget_ms=args.budget_ms)
+    print(json.dumps(res, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,451 @@
+#-*- coding: utf-8 -*-
+# 계산 기록 저장소
+#
+# [HistoryJournal] 추가 전용 저널 (sqlite3 가 없는 환경용)
+# - calc_history.jsonl : 기록 1건 = JSON 1줄, 계산할 때마다 끝에 한 줄만 추가 (O(1))
+# - calc_history.idx   : 각 줄의 시작 위치 (8바이트 little-endian), N번째 기록으로 바로 seek
+# - 저널이 보관 개수의 2배를 넘으면 최근 기록만 남기고 통째로 교체(compaction)
+# - 비정상 종료로 잘린 마지막 줄/인덱스는 열 때 저널 기준으로 복구
+#
+# [HistoryDB] SQLite 기록 저장소 (기본)
+# - 강번(정확/앞부분/부분 일치), 시간 범위, Slab 길이 범위 검색용 인덱스
+# - 최신순 페이지 조회 (LIMIT/OFFSET 또는 id 커서)
+# - 보관 개수(keep)를 넘으면 추가할 때 가장 오래된 기록부터 삭제
+# - N번째 기록은 id 로 바로 조회 (id 는 오래된 순으로 연속, 중간이 빈 DB 는 id 목록을 따로 들고 있음)
+# - 예전 calc_history.json / calc_history.jsonl 은 처음 열 때 자동 이전
+# - record 열: 새 기록은 slab_record.encode 바이너리(BLOB), 예전/특수 기록은 JSON 문자열 그대로
+#   읽을 때는 BLOB -> HistoryRecord(dict 처럼 읽힘), TEXT -> dict
+#
+# 두 저장소 모두 내부 잠금을 가지므로 저장 작업 스레드(slab_persist)와 UI 가 함께 써도 됨
+
+import os, json, struct, time, tempfile, threading
+from array import array
+from datetime import datetime
+
+try:
+    import sqlite3
+except ImportError:  # sqlite3 없이 빌드된 경우 저널로 대체
+    sqlite3 = None
+
+from slab_core import load_history, atomic_write
+from slab_record import encode, decode, compactable
+
+_OFF = struct.Struct("<Q")
+
+class HistoryJournal:
+    def __init__(self, path, keep=None, legacy_json=None):
+        self.path = path
+        self.idx_path = os.path.splitext(path)[0] + ".idx"
+        self.keep = keep
+        self._lock = threading.RLock()
+        if legacy_json and not os.path.exists(path) and os.path.exists(legacy_json):
+            self._migrate(legacy_json)
+        self._jf = open(path, "a+b")
+        self._xf = open(self.idx_path, "a+b")
+        self._recover()
+
+    # ----- 조회 -----
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        with self._lock:
+            return json.loads(self._read_line(self._offset(i)))
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def recent(self, offset, limit):
+        """최신순 offset 번째부터 limit 건"""
+        with self._lock:
+            stop = max(0, self._count - offset)
+            start = max(0, stop - limit)
+            return [self[i] for i in range(stop - 1, start - 1, -1)]
+
+    def codes(self):
+        """기록에 나온 강번 (중복 제거, 순서 없음)"""
+        return {c for c in (r.get("code") for r in self) if c}
+
+    # ----- 추가 -----
+    def append(self, record):
+        self.append_many([record])
+
+    def append_many(self, records):
+        lines = [(json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8") for r in records]
+        if not lines:
+            return
+        with self._lock:
+            off = self._jf.seek(0, os.SEEK_END)
+            offsets = []
+            for line in lines:
+                offsets.append(off)
+                off += len(line)
+            # 여러 건도 fsync 한 번
+            self._jf.write(b"".join(lines))
+            self._jf.flush()
+            os.fsync(self._jf.fileno())
+            # 인덱스는 저널에서 다시 만들 수 있으므로 fsync 생략
+            self._xf.seek(0, os.SEEK_END)
+            self._xf.write(b"".join(_OFF.pack(o) for o in offsets))
+            self._xf.flush()
+            self._count += len(lines)
+            if self.keep and self._count > self.keep * 2:
+                self.compact()
+
+    def compact(self):
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        if not self.keep or self._count <= self.keep:
+            return
+        first = self._count - self.keep
+        base = self._offset(first)
+        offsets = [self._offset(i) - base for i in range(first, self._count)]
+        self._jf.seek(base)
+        data = self._jf.read()
+        self._jf.close()
+        self._xf.close()
+        # 인덱스를 먼저 지움: 도중에 죽으면 다음 실행 때 저널 전체를 훑어 인덱스를 다시 만듦
+        os.remove(self.idx_path)
+        atomic_write(self.path, data)
+        atomic_write(self.idx_path, b"".join(_OFF.pack(o) for o in offsets))
+        self._jf = open(self.path, "a+b")
+        self._xf = open(self.idx_path, "a+b")
+        self._count = len(offsets)
+
+    def close(self):
+        with self._lock:
+            for f in (self._jf, self._xf):
+                try:
+                    f.close()
+                except Exception:
+                    pass
+
+    # ----- 내부 -----
+    def _offset(self, i):
+        self._xf.seek(i * _OFF.size)
+        return _OFF.unpack(self._xf.read(_OFF.size))[0]
+
+    def _read_line(self, off):
+        self._jf.seek(off)
+        return self._jf.readline()
+
+    def _recover(self):
+        jsize = self._jf.seek(0, os.SEEK_END)
+        n = self._xf.seek(0, os.SEEK_END) // _OFF.size
+        # 인덱스 끝부분이 저널의 온전한 줄을 가리킬 때까지 되돌림
+        end = 0
+        while n > 0:
+            off = self._offset(n - 1)
+            if off < jsize:
+                line = self._read_line(off)
+                if line.endswith(b"\n"):
+                    end = off + len(line)
+                    break
+            n -= 1
+        self._xf.truncate(n * _OFF.size)
+        # 인덱스에 없는 온전한 줄은 인덱스에 추가, 잘린 마지막 줄은 버림
+        self._jf.seek(end)
+        pos, extra = end, []
+        for line in self._jf:
+            if not line.endswith(b"\n"):
+                break
+            extra.append(pos)
+            pos += len(line)
+        if pos < jsize:
+            self._jf.truncate(pos)
+        if extra:
+            self._xf.seek(0, os.SEEK_END)
+            self._xf.write(b"".join(_OFF.pack(o) for o in extra))
+            self._xf.flush()
+        self._count = n + len(extra)
+
+    def _migrate(self, legacy_json):
+        # 예전 calc_history.json (리스트 통째 저장) -> 저널로 1회 변환
+        records = load_history(legacy_json)
+        lines, offsets, pos = [], [], 0
+        for rec in records:
+            line = (json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8")
+            offsets.append(pos)
+            lines.append(line)
+            pos += len(line)
+        atomic_write(self.idx_path, b"".join(_OFF.pack(o) for o in offsets))
+        atomic_write(self.path, b"".join(lines))
+        os.replace(legacy_json, legacy_json + ".bak")
+
+# ===== SQLite 기록 저장소 =====
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id     INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts     REAL    NOT NULL,
+    code   TEXT    NOT NULL DEFAULT '',
+    slab   REAL    NOT NULL,
+    record TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_code ON history(code);
+CREATE INDEX IF NOT EXISTS idx_history_ts   ON history(ts);
+CREATE INDEX IF NOT EXISTS idx_history_slab ON history(slab);
+"""
+
+# 부분 일치(강번 중간 숫자) 검색용 trigram 색인, 지원하지 않는 SQLite 면 LIKE 로 대체
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS history_code
+    USING fts5(code, content='history', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS history_code_ai AFTER INSERT ON history BEGIN
+    INSERT INTO history_code(rowid, code) VALUES (new.id, new.code);
+END;
+CREATE TRIGGER IF NOT EXISTS history_code_ad AFTER DELETE ON history BEGIN
+    INSERT INTO history_code(history_code, rowid, code) VALUES ('delete', old.id, old.code);
+END;
+"""
+
+def _record_ts(rec, now=None):
+    # 예전 기록의 timestamp 는 "%m-%d %H:%M:%S" (연도 없음) -> 미래가 되지 않는 가장 가까운 연도로 가정
+    if isinstance(rec.get("ts"), (int, float)):
+        return float(rec["ts"])
+    now = now or datetime.now()
+    try:
+        t = datetime.strptime(f"{now.year}-{rec.get('timestamp')}", "%Y-%m-%d %H:%M:%S")
+        if t > now:
+            t = t.replace(year=now.year - 1)
+        return t.timestamp()
+    except Exception:
+        return 0.0
+
+class HistoryDB:
+    def __init__(self, path, keep=None, legacy_json=None, legacy_journal=None):
+        self.path = path
+        self.keep = keep
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        try:
+            self._db.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+        self._load_ids()
+        for legacy in (legacy_json, legacy_journal):
+            if legacy and os.path.exists(legacy):
+                self._migrate(legacy)
+        if self.keep and self._count > self.keep:
+            with self._lock, self._db:
+                self._trim()
+
+    # ----- HistoryJournal 과 같은 목록형 접근 (0 = 가장 오래된 기록) -----
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __getitem__(self, i):
+        # OFFSET 은 건너뛸 행을 모두 읽으므로 쓰지 않고, 위치 -> id 로 바꿔 기본 키로 한 건만 조회
+        with self._lock:
+            if i < 0:
+                i += self._count
+            if not 0 <= i < self._count:
+                raise IndexError(i)
+            row = self._db.execute(
+                "SELECT id, record FROM history WHERE id = ?", (self._id_at(i),)).fetchone()
+        return self._load(row)
+
+    def __iter__(self, chunk=500):
+        # chunk 건씩 id 순으로 (전체를 한 번에 메모리에 올리지 않음, 읽는 동안 잠금을 오래 잡지 않음)
+        last = 0
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT id, record FROM history WHERE id > ? ORDER BY id LIMIT ?",
+                    (last, chunk)).fetchall()
+            for row in rows:
+                yield self._load(row)
+            if len(rows) < chunk:
+                return
+            last = rows[-1][0]
+
+    def recent(self, offset, limit):
+        """최신순 offset 번째부터 limit 건"""
+        return self.query(limit=limit, offset=offset)
+
+    def codes(self):
+        """기록에 나온 강번 (중복 제거, code 인덱스만 읽음)"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT code FROM history WHERE code != ''").fetchall()
+        return {r[0] for r in rows}
+
+    # ----- 추가 -----
+    def append(self, record):
+        self.append_many([record])
+
+    def append_many(self, records):
+        rows = []
+        for rec in records:
+            if "ts" not in rec:
+                rec = dict(rec, ts=time.time())
+            body = (encode(rec) if compactable(rec)
+                    else json.dumps(rec, ensure_ascii=False))
+            rows.append((rec["ts"], rec.get("code") or "", float(rec["slab"]), body))
+        if not rows:
+            return
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO history(ts, code, slab, record) VALUES (?, ?, ?, ?)", rows)
+            last = self._db.execute("SELECT MAX(id) FROM history").fetchone()[0]
+            first = last - len(rows) + 1
+            if self._ids is not None:
+                self._ids.extend(range(first, last + 1))
+            elif self._count == 0:
+                self._first = first
+            elif first != self._first + self._count:
+                # 중간 id 가 비었음 (밖에서 최신 기록을 지운 DB 등) -> id 목록으로 전환
+                self._count += len(rows)
+                self._load_ids()
+                self._trim()
+                return
+            self._count += len(rows)
+            self._trim()
+
+    # ----- 검색 -----
+    def query(self, code=None, match="prefix", ts_from=None, ts_to=None,
+              slab_min=None, slab_max=None, limit=50, offset=0, before_id=None):
+        """조건에 맞는 기록을 최신순으로 돌려준다 (각 기록에 "id" 포함).
+
+        match     : "exact" / "prefix" / "contains" (code 검색 방식)
+        before_id : 이전 페이지 마지막 id (커서). OFFSET 보다 깊은 페이지에서 빠름
+        """
+        where, args = self._where(code, match, ts_from, ts_to, slab_min, slab_max)
+        if before_id is not None:
+            where.append("id < ?")
+            args.append(before_id)
+        sql = "SELECT id, record FROM history"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id DESC LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self._db.execute(sql, args + [limit, offset]).fetchall()
+        return [self._load(r) for r in rows]
+
+    def count(self, code=None, match="prefix", ts_from=None, ts_to=None,
+              slab_min=None, slab_max=None):
+        where, args = self._where(code, match, ts_from, ts_to, slab_min, slab_max)
+        sql = "SELECT COUNT(*) FROM history"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with self._lock:
+            return self._db.execute(sql, args).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            try:
+                self._db.close()
+            except Exception:
+                pass
+
+    # ----- 내부 -----
+    def _load_ids(self):
+        lo, hi, n = self._db.execute(
+            "SELECT MIN(id), MAX(id), COUNT(*) FROM history").fetchone()
+        self._count = n
+        self._first = lo or 0
+        self._ids = None
+        if n and hi - lo + 1 != n:
+            self._ids = array("q", (r[0] for r in
+                                    self._db.execute("SELECT id FROM history ORDER BY id")))
+
+    def _id_at(self, i):
+        return self._first + i if self._ids is None else self._ids[i]
+
+    def _trim(self):
+        # 보관 개수를 넘는 오래된 기록 삭제 (호출하는 쪽이 잠금/트랜잭션을 잡고 있음)
+        cut = self._count - self.keep if self.keep else 0
+        if cut <= 0:
+            return
+        first = self._id_at(cut)
+        self._db.execute("DELETE FROM history WHERE id < ?", (first,))
+        self._count -= cut
+        if self._ids is None:
+            self._first = first
+        else:
+            del self._ids[:cut]
+
+    @staticmethod
+    def _load(row):
+        if isinstance(row[1], bytes):
+            return decode(row[1], id=row[0])
+        rec = json.loads(row[1])
+        rec["id"] = row[0]
+        return rec
+
+    def _where(self, code, match, ts_from, ts_to, slab_min, slab_max):
+        where, args = [], []
+        if code:
+            code = code.strip().upper()
+            if match == "exact":
+                where.append("code = ?")
+                args.append(code)
+            elif match == "prefix":
+                # 인덱스 범위 검색 (LIKE 는 대소문자 설정에 따라 인덱스를 못 탐)
+                where.append("code >= ? AND code < ?")
+                args += [code, code + "\uffff"]
+            elif self.has_fts and len(code) >= 3:
+                where.append("id IN (SELECT rowid FROM history_code WHERE history_code MATCH ?)")
+                args.append('"' + code.replace('"', '""') + '"')
+            else:
+                where.append("instr(code, ?) > 0")
+                args.append(code)
+        if ts_from is not None:
+            where.append("ts >= ?")
+            args.append(ts_from)
+        if ts_to is not None:
+            where.append("ts < ?")
+            args.append(ts_to)
+        if slab_min is not None:
+            where.append("slab >= ?")
+            args.append(slab_min)
+        if slab_max is not None:
+            where.append("slab <= ?")
+            args.append(slab_max)
+        return where, args
+
+    def _migrate(self, legacy):
+        if legacy.endswith(".jsonl"):
+            src = HistoryJournal(legacy)
+            records = list(src)
+            src.close()
+        else:
+            records = load_history(legacy)
+        now = datetime.now()
+        self.append_many([dict(r, ts=_record_ts(r, now)) for r in records])
+        os.replace(legacy, legacy + ".bak")
+        idx = os.path.splitext(legacy)[0] + ".idx"
+        if legacy.endswith(".jsonl") and os.path.exists(idx):
+            os.remove(idx)
+
+def open_history(user_data_dir, keep=None):
+    """앱 기록 저장소: SQLite 가 있으면 HistoryDB, 없으면 HistoryJournal"""
+    legacy_json = os.path.join(user_data_dir, "calc_history.json")
+    journal = os.path.join(user_data_dir, "calc_history.jsonl")
+    if sqlite3 is not None:
+        return HistoryDB(os.path.join(user_data_dir, "calc_history.db"), keep=keep,
+                         legacy_json=legacy_json, legacy_journal=journal)
+    return HistoryJournal(journal, keep=keep, legacy_json=legacy_json)
+
+def open_memory_history(keep=None):
+    """기록 파일을 열 수 없을 때 쓰는 임시 저장소 (이번 실행 동안만 보관)"""
+    if sqlite3 is not None:
+        return HistoryDB(":memory:", keep=keep)
+    path = os.path.join(tempfile.mkdtemp(prefix="slab-history-"), "calc_history.jsonl")
+    return HistoryJournal(path, keep=keep)
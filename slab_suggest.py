@@ -0,0 +1,64 @@
+#-*- coding: utf-8 -*-
+# 강번 자동완성 색인
+# - 작업지시(PlanIndex) + 지난 기록의 강번을 정렬 배열 하나로 유지
+# - 접두어 검색은 bisect 두 번 (O(log n)), 결과는 정렬 순서 그대로 limit 건
+# - 계산할 때마다 add() 로 한 건씩 끼워 넣고, 대량 병합(update)은 새 배열을 만든 뒤 교체
+
+import threading
+from bisect import bisect_left, insort
+
+_END = "\uffff"
+
+class CodeIndex:
+    def __init__(self, codes=()):
+        self._lock = threading.Lock()
+        self._set = set(c for c in codes if c)
+        self._arr = sorted(self._set)
+
+    def __len__(self):
+        return len(self._arr)
+
+    def __contains__(self, code):
+        return code in self._set
+
+    def add(self, code):
+        """한 건 추가 (이미 있으면 무시)"""
+        if not code:
+            return
+        with self._lock:
+            if code in self._set:
+                return
+            self._set.add(code)
+            insort(self._arr, code)
+
+    def update(self, codes):
+        """여러 건 병합. 정렬은 잠금 밖에서 하고 마지막에 배열만 교체 (조회는 막지 않음)"""
+        new = set(c for c in codes if c)
+        with self._lock:
+            new -= self._set
+        if not new:
+            return 0
+        if len(new) < 64:
+            for c in new:
+                self.add(c)
+            return len(new)
+        arr = sorted(new)
+        with self._lock:
+            new = [c for c in arr if c not in self._set]
+            self._set.update(new)
+            merged = self._arr + new
+            merged.sort()      # 정렬된 두 구간 -> timsort 가 한 번의 병합으로 처리
+            self._arr = merged
+        return len(new)
+
+    def prefixed(self, prefix, limit=8):
+        """prefix 로 시작하는 강번 (정렬순 최대 limit 건)"""
+        arr = self._arr
+        i = bisect_left(arr, prefix)
+        j = bisect_left(arr, prefix + _END, i)
+        return arr[i:min(j, i + limit)]
+
+    def count(self, prefix):
+        arr = self._arr
+        i = bisect_left(arr, prefix)
+        return bisect_left(arr, prefix + _END, i) - i
@@ -0,0 +1,160 @@
+#-*- coding: utf-8 -*-
+# 절단 손실 민감도 (손실 값 범위 x 지시길이 조합을 한 번에 계산)
+# - "손실을 몇 mm 로 바꾸면 / 지시길이 하나를 빼면 여유길이가 얼마인지" 를 설정 변경 없이 표로
+# - 길이는 0.1 mm 정수 (slab_fixed 와 같은 단위), 각 +(add_each) 는 분모 2k 의 분자
+# - remain(L, S) = slab - 조합 합(S) - 손실(L) x (k-1)  -> 외적 한 번 (numpy 가 있으면 배열 연산)
+# - 계산 가능한 최대 손실 = (slab - 조합 합) // (k-1)  -> "절단 길이가 부족합니다" 까지 남은 거리
+
+from itertools import combinations
+
+from slab_fixed import SCALE, to_units
+
+try:
+    import numpy as np
+except ImportError:  # 앱(APK)에는 numpy 가 없음 -> 같은 식을 파이썬 루프로
+    np = None
+
+# 손실 범위 기본값 (설정 손실 ± SPAN, STEP 간격)
+SWEEP_SPAN = 5.0
+SWEEP_STEP = 1.0
+# 모든 조합(2^n)을 만드는 최대 지시길이 개수
+MAX_SUBSET_GUIDES = 12
+
+def loss_steps(center, span=SWEEP_SPAN, step=SWEEP_STEP):
+    """center ± span 을 step 간격으로 (0.1 mm 정수, 0 미만 제외, center 는 항상 포함)"""
+    c, s, d = to_units(center), to_units(span), max(1, to_units(step))
+    out = {c}
+    k = 1
+    while k * d <= s:
+        out.add(c - k * d)
+        out.add(c + k * d)
+        k += 1
+    return sorted(u for u in out if u >= 0)
+
+def guide_subsets(n, min_size=2):
+    """지시길이 n 개에서 min_size 개 이상 고른 모든 조합 (큰 조합 먼저)"""
+    if n > MAX_SUBSET_GUIDES:
+        raise ValueError(f"지시길이 {n}개: 전체 조합은 {MAX_SUBSET_GUIDES}개까지")
+    min_size = max(2, min_size)
+    return [c for k in range(n, min_size - 1, -1) for c in combinations(range(n), k)]
+
+def drop_one_subsets(n):
+    """전체 + 하나씩 뺀 조합 (화면 표 기본값, n+1 개)"""
+    full = tuple(range(n))
+    if n <= 2:
+        return [full]
+    return [full] + [full[:i] + full[i + 1:] for i in range(n)]
+
+def sweep(slab, guides, losses, subsets=None):
+    """Slab 하나를 손실 L 개 x 지시길이 조합 S 개로 계산.
+
+    slab, guides : mm (float / 문자열)
+    losses       : 0.1 mm 정수 목록 (loss_steps)
+    subsets      : 지시길이 번호(0부터) 튜플 목록, 없으면 drop_one_subsets
+
+    반환 dict (길이는 0.1 mm 정수, numpy 가 있으면 배열):
+      losses, subsets
+      n        : (S,)   조합의 지시길이 개수
+      spare    : (S,)   slab - 조합 합 (손실 빼기 전)
+      remain   : (L, S) 여유길이 (음수면 계산 불가)
+      add_each : (L, S) 각 + 의 분자, 분모 den
+      den      : (S,)   2n
+      ok       : (L, S) remain >= 0
+      max_loss : (S,)   계산 가능한 최대 손실 (음수면 손실 0 이어도 부족)
+    """
+    slab_u = to_units(slab)
+    g = [to_units(x) for x in guides]
+    if subsets is None:
+        subsets = drop_one_subsets(len(g))
+    subsets = [tuple(s) for s in subsets]
+    if any(len(s) < 2 for s in subsets):
+        raise ValueError("조합마다 지시길이 2개 이상")
+    losses = [int(x) for x in losses]
+
+    if np is not None:
+        mask = np.zeros((len(subsets), len(g)), dtype=np.int64)
+        for j, s in enumerate(subsets):
+            mask[j, list(s)] = 1
+        n = mask.sum(axis=1)
+        spare = slab_u - mask @ np.asarray(g, dtype=np.int64)
+        lv = np.asarray(losses, dtype=np.int64)
+        remain = spare[None, :] - lv[:, None] * (n - 1)[None, :]
+        ok = remain >= 0
+        max_loss = spare // (n - 1)
+        den = 2 * n
+        add_each = 2 * remain
+    else:
+        n = [len(s) for s in subsets]
+        spare = [slab_u - sum(g[i] for i in s) for s in subsets]
+        remain = [[sp - lo * (k - 1) for sp, k in zip(spare, n)] for lo in losses]
+        ok = [[r >= 0 for r in row] for row in remain]
+        max_loss = [sp // (k - 1) for sp, k in zip(spare, n)]
+        den = [2 * k for k in n]
+        add_each = [[2 * r for r in row] for row in remain]
+    return {
+        "losses": losses, "subsets": subsets, "n": n, "spare": spare,
+        "remain": remain, "add_each": add_each, "den": den, "ok": ok,
+        "max_loss": max_loss,
+    }
+
+def sweep_batch(batch, losses):
+    """FixedBatch(여러 Slab, 지시길이 전체) x 손실 L 개.
+
+    반환: remain (B, L), ok (B, L), max_loss (B,)  (0.1 mm 정수, 각 + 는 remain / n)
+    """
+    losses = [int(x) for x in losses]
+    if np is not None:
+        slab = np.frombuffer(batch.slab, dtype=np.int32).astype(np.int64)
+        offs = np.frombuffer(batch.offs, dtype=np.uint32).astype(np.int64)
+        cs = np.concatenate(([0], np.cumsum(np.frombuffer(batch.guides, dtype=np.int32),
+                                            dtype=np.int64)))
+        n = np.diff(offs)
+        spare = slab - (cs[offs[1:]] - cs[offs[:-1]])
+        remain = spare[:, None] - (n - 1)[:, None] * np.asarray(losses, dtype=np.int64)[None, :]
+        with np.errstate(divide="ignore"):
+            max_loss = np.where(n > 1, spare // np.maximum(n - 1, 1), spare)
+        return {"losses": losses, "n": n, "spare": spare, "remain": remain,
+                "ok": remain >= 0, "max_loss": max_loss}
+    g, offs = batch.guides, batch.offs
+    n, spare = [], []
+    for i in range(len(batch)):
+        n.append(offs[i + 1] - offs[i])
+        spare.append(batch.slab[i] - sum(g[offs[i]:offs[i + 1]]))
+    remain = [[sp - lo * (k - 1) for lo in losses] for sp, k in zip(spare, n)]
+    return {"losses": losses, "n": n, "spare": spare, "remain": remain,
+            "ok": [[r >= 0 for r in row] for row in remain],
+            "max_loss": [sp // (k - 1) if k > 1 else sp for sp, k in zip(spare, n)]}
+
+# ===== 표 문구 =====
+def _label(s, n_all):
+    if len(s) == n_all:
+        return f"1~{n_all}번" if n_all > 2 else "1·2번"
+    missing = [i for i in range(n_all) if i not in s]
+    if len(missing) == 1:
+        return f"{missing[0] + 1}번 제외"
+    return "·".join(str(i + 1) for i in s) + "번"
+
+def sweep_lines(res, plan, n_all, current=None):
+    """sweep 결과 -> 표시 줄 목록 (plan: slab_core.RenderPlan, current: 설정 손실 0.1 mm)"""
+    unit = plan.unit
+    u = plan.u
+    lines = [f"▶ 손실별 여유길이 ({_label(res['subsets'][0], n_all)})"]
+    den0 = int(res["den"][0])
+    for i, lo in enumerate(res["losses"]):
+        r = int(res["remain"][i][0])
+        mark = " [b]◀ 현재[/b]" if lo == current else ""
+        if r >= 0:
+            lines.append(f"   {u(lo)}{unit}: 여유 {u(r)}{unit} → 각 +{u(2 * r, den0)}{unit}{mark}")
+        else:
+            lines.append(f"   {u(lo)}{unit}: [color=#E53935]부족 {u(r)}{unit}[/color]{mark}")
+    lines.append("")
+    lines.append("▶ 계산 가능한 최대 손실")
+    for j, s in enumerate(res["subsets"]):
+        m = int(res["max_loss"][j])
+        if m < 0:
+            lines.append(f"   {_label(s, n_all)}: [color=#E53935]손실 0 이어도 부족[/color]")
+            continue
+        if plan.do_round:
+            m -= m % SCALE      # 반올림 표시로 한계를 넘는 값이 보이지 않도록 내림
+        lines.append(f"   {_label(s, n_all)}: {u(m)}{unit}")
+    return lines
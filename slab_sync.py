@@ -0,0 +1,315 @@
+#-*- coding: utf-8 -*-
+# 계산 기록 교대 서버 동기화 (오프라인 우선, 변경분만 전송)
+# - 새 기록은 기기 안 보내기함(sync/outbox.jsonl)에 먼저 fsync 로 쌓고, 작업 스레드가 묶어서 전송
+#   -> 네트워크가 없어도 기록은 남고, 연결되면 밀린 것부터 순서대로 보냄
+# - 기록 키 = (기기 id, 일련번호 seq) + ts. 서버는 기기별로 받은 마지막 seq(upto)만 기억하고
+#   클라이언트는 upto 다음부터만 보냄 (전체 기록을 다시 보내는 일 없음, 같은 묶음을 또 보내도 서버가 무시)
+# - 묶음은 JSON 을 gzip 으로 압축해 POST, 실패하면 지수 백오프(+지터)로 다시 시도
+# - 파일/네트워크 작업은 모두 작업 스레드 (UI 스레드는 append_many 도 부르지 않음: HistoryQueue 싱크)
+#
+# 서버 프로토콜 (HTTP/JSON)
+#   GET  {url}/sync/<device>                    -> {"upto": seq, "ts": 마지막 ts}
+#   POST {url}/sync/<device>  (gzip JSON)       {"records": [{"seq", "ts", "rec"}...]} -> {"upto": seq}
+#
+# 사용 예)
+#   python slab_sync.py serve --port 8766 --dir shift_data      # 시험용 교대 서버
+
+import os, sys, json, gzip, time, uuid, random, threading, argparse
+from http.client import HTTPException
+from urllib import request as urlrequest
+from urllib.error import URLError, HTTPError
+
+from slab_core import atomic_write
+
+def _upto(resp):
+    """서버 응답의 upto (없으면 0). 형식이 다르면 ValueError -> 전송 스레드가 백오프 후 다시 시도"""
+    if not isinstance(resp, dict):
+        raise ValueError(f"서버 응답 형식 오류: {type(resp).__name__}")
+    v = resp.get("upto", 0)
+    if isinstance(v, bool) or not isinstance(v, (int, float)) or v < 0 or not float(v).is_integer():
+        raise ValueError(f"서버 응답 upto 오류: {v!r}")
+    return int(v)
+
+class HistorySync(threading.Thread):
+    """HistoryQueue 싱크 + 전송 스레드. start() 후 append_many 로 받은 기록을 서버로 보냄"""
+
+    def __init__(self, path, url, batch=200, timeout=10.0, base_delay=1.0, max_delay=300.0,
+                 compact_every=2000):
+        super().__init__(name="slab-sync", daemon=True)
+        self.path = path
+        self.url = url.rstrip("/")
+        self.batch = batch
+        self.timeout = timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.compact_every = compact_every
+        self._outbox = os.path.join(path, "outbox.jsonl")
+        self._state_file = os.path.join(path, "state.json")
+        self._cv = threading.Condition()
+        self._ready = threading.Event()
+        self._stopping = False
+        self._unacked = []          # [(seq, JSON 한 줄)], 보내기함 파일과 같은 내용
+        self._dropped = 0           # 보내기함 파일 앞쪽의 이미 받은(acked) 줄 수
+        self._handshake = False
+        self._failures = 0
+        self._next_try = 0.0
+        self.device = None
+        self.seq = 0
+        self.acked = 0
+        self.fresh = False          # 이 기기에서 처음 켠 동기화 (지난 기록 채우기 판단용)
+        self.stats = {"sent": 0, "batches": 0, "raw_bytes": 0, "sent_bytes": 0,
+                      "failures": 0, "last_error": "", "last_ms": 0.0}
+
+    # ----- 싱크 (작업 스레드에서 호출) -----
+    def append_many(self, records):
+        self._ready.wait()
+        lines = []
+        with self._cv:
+            for rec in records:
+                if hasattr(rec, "to_dict"):
+                    rec = rec.to_dict()
+                self.seq += 1
+                item = {"seq": self.seq, "ts": rec.get("ts") or 0.0, "rec": rec}
+                lines.append((self.seq, json.dumps(item, ensure_ascii=False, separators=(",", ":"))))
+            if not lines:
+                return
+            with open(self._outbox, "a", encoding="utf-8") as f:
+                f.write("".join(line + "\n" for _, line in lines))
+                f.flush()
+                os.fsync(f.fileno())
+            self._unacked.extend(lines)
+            self._save_state()
+            self._cv.notify_all()
+
+    def pending(self):
+        with self._cv:
+            return len(self._unacked)
+
+    def stop(self, timeout=5.0):
+        with self._cv:
+            self._stopping = True
+            self._cv.notify_all()
+        self.join(timeout)
+
+    # ----- 상태 / 보내기함 -----
+    def _save_state(self):
+        atomic_write(self._state_file, json.dumps(
+            {"device": self.device, "seq": self.seq, "acked": self.acked}).encode("utf-8"))
+
+    def _load(self):
+        os.makedirs(self.path, exist_ok=True)
+        try:
+            with open(self._state_file, "r", encoding="utf-8") as f:
+                st = json.load(f)
+            self.device, self.seq, self.acked = st["device"], int(st["seq"]), int(st["acked"])
+        except (OSError, ValueError, KeyError):
+            self.device, self.seq, self.acked = uuid.uuid4().hex, 0, 0
+            self.fresh = True
+        # 보내기함에서 아직 안 받은 줄만 메모리에 (끝이 잘린 줄은 버림)
+        self._unacked, self._dropped = [], 0
+        try:
+            with open(self._outbox, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        seq = json.loads(line)["seq"]
+                    except (ValueError, KeyError):
+                        continue
+                    self.seq = max(self.seq, seq)
+                    if seq > self.acked:
+                        self._unacked.append((seq, line.rstrip("\n")))
+                    else:
+                        self._dropped += 1
+        except OSError:
+            pass
+        if self.fresh or self._dropped:
+            self._compact()
+        else:
+            self._save_state()
+
+    def _compact(self):
+        # 받은 줄을 빼고 보내기함을 다시 씀
+        atomic_write(self._outbox, "".join(line + "\n" for _, line in self._unacked).encode("utf-8"))
+        self._dropped = 0
+        self._save_state()
+
+    def _ack(self, upto):
+        with self._cv:
+            if upto <= self.acked:
+                return
+            self.acked = upto
+            n = 0
+            while n < len(self._unacked) and self._unacked[n][0] <= upto:
+                n += 1
+            del self._unacked[:n]
+            self._dropped += n
+            if not self._unacked or self._dropped >= self.compact_every:
+                self._compact()
+            else:
+                self._save_state()
+
+    # ----- 전송 -----
+    def _http(self, method, body=None):
+        req = urlrequest.Request(f"{self.url}/sync/{self.device}", data=body, method=method)
+        req.add_header("Accept", "application/json")
+        if body is not None:
+            req.add_header("Content-Type", "application/json")
+            req.add_header("Content-Encoding", "gzip")
+        with urlrequest.urlopen(req, timeout=self.timeout) as resp:
+            return json.loads(resp.read() or b"{}")
+
+    def _ship_once(self):
+        if not self._handshake:
+            # 서버가 이미 받은 위치 확인 (응답을 못 받고 끊겼던 묶음은 다시 보내지 않음)
+            got = _upto(self._http("GET"))
+            if got > self.seq:
+                raise ValueError(f"서버 upto {got} > 기기 seq {self.seq} (기기 id 충돌)")
+            self._ack(got)
+            self._handshake = True
+        with self._cv:
+            chunk = self._unacked[:self.batch]
+        if not chunk:
+            return
+        raw = ('{"records":[' + ",".join(line for _, line in chunk) + "]}").encode("utf-8")
+        body = gzip.compress(raw, 6)
+        t0 = time.perf_counter()
+        upto = _upto(self._http("POST", body))
+        self.stats["last_ms"] = (time.perf_counter() - t0) * 1000.0
+        self.stats["batches"] += 1
+        self.stats["sent"] += sum(1 for seq, _ in chunk if seq <= upto)
+        self.stats["raw_bytes"] += len(raw)
+        self.stats["sent_bytes"] += len(body)
+        if upto < chunk[0][0]:
+            # 하나도 안 받음: 같은 묶음을 바로 다시 보내지 않고 백오프
+            raise ValueError(f"서버가 묶음을 받지 않음 (upto {upto})")
+        self._ack(upto)
+
+    def run(self):
+        try:
+            self._load()
+        finally:
+            self._ready.set()
+        while True:
+            with self._cv:
+                while not self._stopping and (not self._unacked or time.monotonic() < self._next_try):
+                    wait = None if not self._unacked else self._next_try - time.monotonic()
+                    self._cv.wait(wait)
+                if self._stopping:
+                    return
+            try:
+                self._ship_once()
+                self._failures = 0
+                self._next_try = 0.0
+            except (URLError, HTTPError, HTTPException, OSError, ValueError) as e:
+                # 오프라인 / 서버 오류: 1, 2, 4 ... max_delay 초 (0.5~1 배 지터)
+                self._failures += 1
+                self._handshake = False
+                self.stats["failures"] += 1
+                self.stats["last_error"] = str(e)
+                delay = min(self.max_delay, self.base_delay * 2 ** (self._failures - 1))
+                self._next_try = time.monotonic() + delay * random.uniform(0.5, 1.0)
+
+def open_sync(user_data_dir, url):
+    return HistorySync(os.path.join(user_data_dir, "sync"), url)
+
+# ===== 시험용 교대 서버 =====
+def make_stand_in(root):
+    """교대 서버 흉내: 기기별 <root>/<device>.jsonl 에 받은 기록을 추가 (seq 중복은 무시)"""
+    from http.server import BaseHTTPRequestHandler
+    os.makedirs(root, exist_ok=True)
+    upto = {}
+    lock = threading.Lock()
+
+    def _load(device):
+        if device not in upto:
+            n, ts = 0, 0.0
+            try:
+                with open(os.path.join(root, device + ".jsonl"), "r", encoding="utf-8") as f:
+                    for line in f:
+                        item = json.loads(line)
+                        n, ts = max(n, item["seq"]), max(ts, item.get("ts") or 0.0)
+            except OSError:
+                pass
+            upto[device] = [n, ts]
+        return upto[device]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _device(self):
+            parts = self.path.strip("/").split("/")
+            if len(parts) != 2 or parts[0] != "sync" or not parts[1].isalnum():
+                self._reply(404, {"error": "not found"})
+                return None
+            return parts[1]
+
+        def _reply(self, status, obj):
+            data = json.dumps(obj).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            device = self._device()
+            if device:
+                with lock:
+                    n, ts = _load(device)
+                self._reply(200, {"upto": n, "ts": ts})
+
+        def do_POST(self):
+            device = self._device()
+            if not device:
+                return
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            try:
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                items = json.loads(body)["records"]
+            except (OSError, ValueError, KeyError):
+                self._reply(400, {"error": "bad body"})
+                return
+            with lock:
+                st = _load(device)
+                new = [it for it in items if it["seq"] > st[0]]
+                if new:
+                    with open(os.path.join(root, device + ".jsonl"), "a", encoding="utf-8") as f:
+                        for it in new:
+                            f.write(json.dumps(it, ensure_ascii=False) + "\n")
+                    st[0] = max(it["seq"] for it in new)
+                    st[1] = max([st[1]] + [it.get("ts") or 0.0 for it in new])
+                self._reply(200, {"upto": st[0]})
+
+    return Handler
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="교대 서버 동기화 (시험 서버 / 보내기함 상태)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sv = sub.add_parser("serve")
+    sv.add_argument("--host", default="127.0.0.1")
+    sv.add_argument("--port", type=int, default=8766)
+    sv.add_argument("--dir", default="shift_data")
+    stt = sub.add_parser("status")
+    stt.add_argument("path", help="user_data_dir/sync")
+    args = ap.parse_args(argv)
+    if args.cmd == "serve":
+        from http.server import ThreadingHTTPServer
+        srv = ThreadingHTTPServer((args.host, args.port), make_stand_in(args.dir))
+        print(f"교대 서버 http://{args.host}:{args.port} -> {args.dir}", file=sys.stderr, flush=True)
+        try:
+            srv.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+    # 읽기만 함 (보내기함 정리는 앱의 전송 스레드가)
+    with open(os.path.join(args.path, "state.json"), "r", encoding="utf-8") as f:
+        st = json.load(f)
+    with open(os.path.join(args.path, "outbox.jsonl"), "r", encoding="utf-8") as f:
+        pending = sum(1 for line in f if line.strip() and json.loads(line)["seq"] > st["acked"])
+    print(json.dumps(dict(st, pending=pending)))
+
+if __name__ == "__main__":
+    main()
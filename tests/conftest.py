@@ -0,0 +1,5 @@
+#-*- coding: utf-8 -*-
+# 루트의 slab_*.py 를 그대로 import (패키지가 아님)
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,77 @@
+#-*- coding: utf-8 -*-
+import json
+from datetime import datetime
+
+import pytest
+
+import slab_archive
+from slab_archive import HistoryArchive, code_prefix
+
+def _ts(day, hour=8):
+    return datetime(2025, 3, day, hour).timestamp()
+
+def _rec(i, day=1, prefix="SG94"):
+    return {"slab": 9000.0 + i % 10, "guides": [2950.0, 3000.0], "loss": 15.0,
+            "code": f"{prefix}{i % 1000:03d}-01", "ts": _ts(day, 8 + i % 12)}
+
+@pytest.fixture(params=["numpy", "python"])
+def no_numpy(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(slab_archive, "np", None)
+    elif slab_archive.np is None:
+        pytest.skip("numpy 없음")
+    return request.param
+
+def test_code_prefix():
+    assert code_prefix("SG94123-01") == "SG94"
+    assert code_prefix("ABC") == "ABC" and code_prefix(None) == ""
+
+def test_append_reopen_and_query(tmp_path, no_numpy):
+    arc = HistoryArchive(str(tmp_path))
+    arc.append_many([_rec(i, day=1) for i in range(10)])
+    arc.append_many([_rec(i, day=2, prefix="SK11") for i in range(5)])
+    arc.append(_rec(0, day=2))
+    arc = HistoryArchive(str(tmp_path))
+    assert len(arc) == 16
+    daily = arc.daily()
+    assert [d["day"] for d in daily] == ["2025-03-01", "2025-03-02"]
+    assert [d["count"] for d in daily] == [10, 6]
+    assert [d["count"] for d in arc.daily(prefix="SK11")] == [5]
+    assert {p["prefix"]: p["count"] for p in arc.by_prefix()} == {"SG94": 11, "SK11": 5}
+    day1 = arc.daily("2025-03-01", "2025-03-01")[0]
+    assert day1["slab"] == sum(9000.0 + i for i in range(10))
+    assert day1["total_loss"] == 150.0
+    assert day1["remain"] == pytest.approx(day1["slab"] - 10 * 5965.0)
+    # 교대(시간대) 스캔 = 일별 합계와 같아야 함
+    assert dict(arc.scan(_ts(1, 0), _ts(2, 0)), day="2025-03-01") == day1
+    assert arc.scan(prefix="SK11")["count"] == 5
+    pct = arc.percentiles("slab", qs=(0, 50, 100), ts_from=_ts(1, 0), ts_to=_ts(2, 0))
+    assert pct == {0: 9000.0, 50: 9004.5, 100: 9009.0}
+    assert arc.percentiles(ts_from=_ts(5, 0))[50] is None
+
+def test_failed_record_does_not_leave_summary_rows(tmp_path):
+    arc = HistoryArchive(str(tmp_path))
+    arc.append_many([_rec(i) for i in range(100)])
+    with pytest.raises(TypeError):
+        arc.append_many([_rec(100, prefix="NEW1"), dict(_rec(101), guides=None)])
+    arc.append(_rec(102))
+    assert len(arc) == 101
+    assert sum(d["count"] for d in arc.daily()) == 101
+    arc = HistoryArchive(str(tmp_path))
+    assert len(arc) == 101 and sum(d["count"] for d in arc.daily()) == 101
+    assert [p["prefix"] for p in arc.by_prefix()] == ["SG94"]
+    # 실패한 묶음의 고정부는 나중에 다시 들어와도 번호가 어긋나지 않음
+    arc.append(_rec(0, prefix="NEW1"))
+    arc = HistoryArchive(str(tmp_path))
+    assert {p["prefix"]: p["count"] for p in arc.by_prefix()} == {"SG94": 101, "NEW1": 1}
+
+def test_torn_write_is_recovered(tmp_path):
+    arc = HistoryArchive(str(tmp_path))
+    arc.append_many([_rec(i) for i in range(20)])
+    with open(tmp_path / "remain.col", "ab") as f:
+        f.write(b"\x01\x02")                       # 끝이 잘린 값
+    with open(tmp_path / "ts.col", "ab") as f:
+        f.write(bytes(8))                          # 한 열만 한 건 더
+    arc = HistoryArchive(str(tmp_path))
+    assert len(arc) == 20 and sum(d["count"] for d in arc.daily()) == 20
+    assert json.loads((tmp_path / "summary.json").read_text())["rows"] == 20
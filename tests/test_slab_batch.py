@@ -0,0 +1,82 @@
+#-*- coding: utf-8 -*-
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import slab_service
+from slab_core import _compute
+from slab_fixed import FixedBatch, compute_fixed, to_units
+from slab_batch import (compute_batch, iter_results, compute_scalar, padded_from,
+                        compute_batch_fixed)
+
+def _rows(n, seed=0):
+    # 행마다 지시길이 개수가 다르고 일부는 길이 부족(remain < 0)
+    rnd = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        g = [rnd.randrange(8000, 35000) / 10 for _ in range(rnd.randint(1, 6))]
+        slab = round(sum(g) + 15 * (len(g) - 1) + rnd.uniform(-200, 400), 1)
+        rows.append((slab, g, rnd.choice((10.0, 15.0, 20.5))))
+    return rows
+
+def _padded(rows):
+    k = max(len(g) for _, g, _ in rows)
+    guides = np.full((len(rows), k), np.nan)
+    for i, (_, g, _) in enumerate(rows):
+        guides[i, :len(g)] = g
+    return (np.array([s for s, _, _ in rows]), guides, np.array([l for _, _, l in rows]))
+
+def test_matches_scalar_compute_bit_for_bit():
+    rows = _rows(2000)
+    slab, guides, loss = _padded(rows)
+    res = compute_batch(slab, guides, loss)
+    got = list(iter_results(slab, guides, loss, res))
+    want = [_compute(s, g, l) for s, g, l in rows]
+    assert got == want
+    assert got == compute_scalar(slab, guides, loss)
+    assert any(w is None for w in want) and any(w is not None for w in want)
+
+def test_short_rows_and_nan_padding():
+    slab, guides, loss = _padded([(9000.0, [3000.0, 2900.0], 15.0),
+                                  (5000.0, [3000.0, 2900.0, 100.0], 15.0),   # remain < 0
+                                  (4000.0, [1000.0], 15.0)])
+    res = compute_batch(slab, guides, loss)
+    assert res["ok"].tolist() == [True, False, True]
+    assert res["n"].tolist() == [2, 3, 1]
+    assert res["remain"][1] < 0 and np.isnan(res["add_each"][1])
+    assert np.isnan(res["real"][1]).all()
+    assert np.isnan(res["real"][0, 2]) and np.isnan(res["real"][2, 1:]).all()
+    assert res["real"][2, 0] == 4000.0
+    assert res["marks"][0, 0] == res["real"][0, 0] + 7.5
+
+def test_scalar_loss_broadcasts():
+    slab, guides, _ = _padded(_rows(50, seed=1))
+    a = compute_batch(slab, guides, 15.0)
+    b = compute_batch(slab, guides, np.full(len(slab), 15.0))
+    assert np.array_equal(a["remain"], b["remain"])
+
+def test_fixed_batch_matches_compute_fixed():
+    rows = _rows(500, seed=2)
+    fb = FixedBatch()
+    for s, g, l in rows:
+        fb.append(s, g, l)
+    res = compute_batch_fixed(*padded_from(fb))
+    for i, (s, g, l) in enumerate(rows):
+        want = compute_fixed(to_units(s), [to_units(x) for x in g], to_units(l))
+        assert bool(res["ok"][i]) == (want is not None)
+        if want is not None:
+            n = len(g)
+            assert res["remain"][i] == want["remain"] and res["den"][i] == want["den"]
+            assert res["real"][i, :n].tolist() == want["real"]
+            assert res["marks"][i, :n].tolist() == want["marks"]
+
+def test_fallback_without_numpy_gives_same_output(monkeypatch):
+    # 앱(APK)에는 numpy 가 없음 -> slab_service 는 한 건씩 _compute
+    recs = [{"code": f"SG94{i:03d}-01", "slab": s, "guides": g, "loss": l}
+            for i, (s, g, l) in enumerate(_rows(300, seed=3))]
+    items = [(r, False) for r in recs]
+    with_np = slab_service.compute_many(items, "SG94", 15.0)
+    monkeypatch.setattr(slab_service, "np", None)
+    assert slab_service.compute_many(items, "SG94", 15.0) == with_np
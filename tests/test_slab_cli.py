@@ -0,0 +1,71 @@
+#-*- coding: utf-8 -*-
+import io, json
+
+from slab_cli import (_detect_format, read_records, parse_record, calc_records,
+                      run_chunks, write_header, main)
+
+CSV = "code,slab,p2,p1,p10\nSG94001-01,9000,3000,2950,\n,abc,1,2,\nSG94002-01,8000,4000,4100,\n"
+
+def _run(text, **kw):
+    fmt, lines = _detect_format(io.StringIO(text))
+    args = dict(prefix="SG94", loss=15.0, do_round=False, out_format="jsonl")
+    args.update(kw)
+    return fmt, "".join(t for _, t in run_chunks(lines, fmt, args["prefix"], args["loss"],
+                                                  args["do_round"], args["out_format"],
+                                                  kw.get("workers", 1), kw.get("chunk_size", 2)))
+
+def test_parse_record_orders_guides_by_number():
+    rec = {"code": " SG94001-01 ", "slab": "9000", "p2": "3000", "p1": "2950", "p10": ""}
+    assert parse_record(rec, "SG94") == ("SG94001-01", 9000.0, [2950.0, 3000.0, None])
+    assert parse_record({"front": "123", "back": "1", "slab": 1, "guides": [1, "2"]}, "SG94") \
+        == ("SG94123-01", 1.0, [1.0, 2.0])
+
+def test_numeric_zero_code_parts_are_kept():
+    # JSONL 숫자 0 이 빈 값으로 바뀌어 강번이 사라지던 문제
+    rec = {"front": 123, "back": 0, "slab": 9000, "guides": [3000, 2950]}
+    assert parse_record(rec, "SG94")[0] == "SG94123-00"
+    assert parse_record(dict(rec, back="0"), "SG94")[0] == "SG94123-00"
+    assert parse_record({"code": 0, "front": 1, "back": 1}, "SG94")[0] == "0"
+    _, out = _run('{"front": 123, "back": 0, "slab": 9000, "guides": [3000, 2950]}\n')
+    assert json.loads(out)["code"] == "SG94123-00"
+
+def test_csv_rows():
+    fmt, text = _run(CSV)
+    rows = [json.loads(line) for line in text.splitlines()]
+    assert fmt == "csv"
+    assert rows[0]["real"] == ["4467.5", "4517.5"]
+    assert rows[1]["error"].startswith("입력 오류")
+    assert rows[2]["error"].startswith("계산 불가")
+
+def test_bom_does_not_rename_first_column():
+    _, text = _run("\ufeff" + CSV)
+    assert json.loads(text.splitlines()[0])["code"] == "SG94001-01"
+
+def test_bom_file(tmp_path, capsys):
+    p = tmp_path / "orders.csv"
+    p.write_bytes(("\ufeff" + CSV).encode("utf-8"))
+    main([str(p)])
+    assert json.loads(capsys.readouterr().out.splitlines()[0])["code"] == "SG94001-01"
+
+def test_malformed_jsonl_lines_become_error_rows():
+    good = '{"code": "A", "slab": 9000, "guides": [3000, 2900]}\n'
+    fmt, text = _run(good + "{bad json\n" + "[1, 2]\n" + "\n" + "7\n" + good)
+    rows = [json.loads(line) for line in text.splitlines()]
+    assert fmt == "jsonl"
+    assert len(rows) == 5
+    assert "error" not in rows[0] and "error" not in rows[4]
+    assert all(r["error"].startswith("입력 오류") for r in rows[1:4])
+
+def test_workers_output_is_byte_identical():
+    text = "code,slab,p1,p2,p3\n" + "".join(
+        f"SG94{i:03d}-01,{9000 + i % 97}.{i % 10},2950.5,3000,{2000 + i % 50}\n" for i in range(300))
+    _, one = _run(text, chunk_size=37)
+    _, two = _run(text, chunk_size=37, workers=2)
+    assert one == two and len(one.splitlines()) == 300
+
+def test_csv_out_header():
+    buf = io.StringIO()
+    write_header(buf, "csv")
+    assert buf.getvalue().startswith("code,slab,guides")
+    recs = read_records(iter(CSV.splitlines(True)), "csv")
+    assert len(list(calc_records(recs, "SG94", 15.0, True))) == 3
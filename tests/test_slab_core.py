@@ -0,0 +1,149 @@
+#-*- coding: utf-8 -*-
+import pytest
+
+from slab_core import (_num_or_none, check_inputs, _compute, ERR_SLAB, ERR_GUIDES,
+                       build_result_text, build_history_text, build_history_summary,
+                       compile_plan, ResultFormatter)
+
+@pytest.mark.parametrize("s", ["nan", "NaN", "inf", "-inf", "1e999", "", ".", "abc", None])
+def test_num_or_none_rejects(s):
+    assert _num_or_none(s) is None
+
+def test_num_or_none_accepts():
+    assert _num_or_none(" 2950.5 ") == 2950.5
+    assert _num_or_none("1e3") == 1000.0
+
+@pytest.mark.parametrize("slab", [float("nan"), float("inf"), None, 0.0, -1.0])
+def test_check_inputs_bad_slab(slab):
+    assert check_inputs(slab, [1000.0, 2000.0]) == (None, ERR_SLAB)
+
+def test_check_inputs_skips_non_finite_guides():
+    guides, err = check_inputs(9000.0, [float("inf"), 3000.0, float("nan"), 2900.0, None])
+    assert err is None and guides == [3000.0, 2900.0]
+    assert check_inputs(9000.0, [float("inf"), 3000.0]) == (None, ERR_GUIDES)
+
+def test_compute():
+    r = _compute(9000.0, [2950.0, 3000.0, 2900.0], 15.0)
+    assert r["total_loss"] == 30.0
+    assert r["remain"] == pytest.approx(120.0)
+    assert _compute(1000.0, [600.0, 600.0], 15.0) is None
+
+# ===== 결과 문구 (RenderPlan 으로 바꾸기 전 문구와 글자 단위로 같아야 함) =====
+R1 = _compute(9000.0, [2950.0, 3000.0, 2900.0], 15.0)
+R2 = _compute(12345.6, [4010.2, 3990.0, 4200.5], 15.0)
+H2 = dict(R2, code="SG94123-01", timestamp="03-01 08:00:00")
+
+GOLDEN_RESULT = (
+    "▶ 강번: SG94123-01\n\n"
+    "▶ Slab 실길이: 9000.0 mm\n"
+    "▶ 1번 지시길이: 2950.0 mm\n"
+    "▶ 2번 지시길이: 3000.0 mm\n"
+    "▶ 3번 지시길이: 2900.0 mm\n"
+    "▶ 절단 손실: 15.0 mm × 2 = 30.0 mm\n"
+    "▶ 전체 여유길이: 120.0 mm → 각 +40.0 mm\n\n\n"
+    "▶ 절단 후 예상 길이:\n"
+    "   1번: 2990.0 mm\n"
+    "   2번: 3040.0 mm\n"
+    "   3번: 2940.0 mm\n\n\n"
+    "▶ 시각화 (절단 마킹 포인트):\n"
+    "H-1번(2997.5)--2번(3047.5)--3번(2947.5)-T")
+
+GOLDEN_RESULT_ROUND_SWAP = (
+    "▶ Slab 실길이: 9000\n"
+    "▶ 1번 지시길이: 2950\n"
+    "▶ 2번 지시길이: 3000\n"
+    "▶ 3번 지시길이: 2900\n"
+    "▶ 절단 손실: 15 × 2 = 30\n"
+    "▶ 전체 여유길이: 120 → 각 +40\n\n\n\n"
+    "▶ 시각화 (절단 마킹 포인트):\n"
+    "H-1번(2998)--2번(3048)--3번(2948)-T\n\n"
+    "▶ 절단 후 예상 길이:\n"
+    "   1번: 2990\n"
+    "   2번: 3040\n"
+    "   3번: 2940")
+
+GOLDEN_RESULT_DECIMAL = (
+    "▶ 강번: SG94123-01\n\n"
+    "▶ Slab 실길이: 12345.6 mm\n"
+    "▶ 1번 지시길이: 4010.2 mm\n"
+    "▶ 2번 지시길이: 3990.0 mm\n"
+    "▶ 3번 지시길이: 4200.5 mm\n"
+    "▶ 절단 손실: 15.0 mm × 2 = 30.0 mm\n"
+    "▶ 전체 여유길이: 114.9 mm → 각 +38.3 mm\n\n\n"
+    "▶ 절단 후 예상 길이:\n"
+    "   1번: 4048.5 mm\n"
+    "   2번: 4028.3 mm\n"
+    "   3번: 4238.8 mm\n\n\n"
+    "▶ 시각화 (절단 마킹 포인트):\n"
+    "H-1번(4056.0)--2번(4035.8)--3번(4246.3)-T")
+
+GOLDEN_HISTORY = (
+    "━━ [ 03-01 08:00:00 ] ━━\n"
+    "강번: SG94123-01\n"
+    "Slab 실길이: 12345.6 mm\n"
+    "1번 지시길이: 4010.2 mm\n"
+    "2번 지시길이: 3990.0 mm\n"
+    "3번 지시길이: 4200.5 mm\n\n"
+    "■ 절단 손실 계산 ■\n"
+    "손실 1회: 15.0 mm\n"
+    "절단 횟수: 2회\n"
+    "전체 손실: 15.0 × 2 = 30.0 mm\n\n"
+    "■ 여유길이 배분 ■\n"
+    "지시길이 합계: 12200.7 mm\n"
+    "전체 손실: 30.0 mm\n"
+    "여유길이: 114.9 mm → 각 +38.3 mm\n\n"
+    "■ 시각화 (절단 마킹 포인트) ■\n"
+    "H-1번(4056.0)--2번(4035.8)--3번(4246.3)-T")
+
+GOLDEN_HISTORY_ROUND = (
+    "━━ [ 03-01 08:00:00 ] ━━\n"
+    "강번: SG94123-01\n"
+    "Slab 실길이: 12346\n"
+    "1번 지시길이: 4010\n"
+    "2번 지시길이: 3990\n"
+    "3번 지시길이: 4201\n\n"
+    "■ 절단 손실 계산 ■\n"
+    "손실 1회: 15\n"
+    "절단 횟수: 2회\n"
+    "전체 손실: 15 × 2 = 30\n\n"
+    "■ 여유길이 배분 ■\n"
+    "지시길이 합계: 12201\n"
+    "전체 손실: 30\n"
+    "여유길이: 115 → 각 +38\n\n"
+    "■ 시각화 (절단 마킹 포인트) ■\n"
+    "H-1번(4056)--2번(4036)--3번(4246)-T")
+
+def test_result_text_golden():
+    assert build_result_text(R1, "SG94123-01", {}) == GOLDEN_RESULT
+    st = {"round": True, "hide_mm": True, "swap_sections": True}
+    assert build_result_text(R1, "", st) == GOLDEN_RESULT_ROUND_SWAP
+    assert build_result_text(R2, "SG94123-01", {}) == GOLDEN_RESULT_DECIMAL
+
+def test_history_text_golden():
+    assert build_history_text(H2, 3, {}) == GOLDEN_HISTORY
+    assert build_history_text(H2, 3, {"round": True, "hide_mm": True}) == GOLDEN_HISTORY_ROUND
+    old = dict(R1)              # 예전 기록: 시각 / 강번 없음
+    assert build_history_text(old, 1, {}).startswith("━━ [ 과거 기록 ] ━━\nSlab 실길이: 9000.0 mm\n")
+
+def test_history_summary_golden():
+    assert build_history_summary(H2, 3, {}) == \
+        "[b]3[/b]  [color=#777777]03-01 08:00:00[/color]  SG94123-01  /  Slab 12345.6 mm  /  3개"
+    assert build_history_summary({"slab": 9000, "guides": [1, 2]}, 7, {"hide_mm": True}) == \
+        "[b]7[/b]  [color=#777777]과거 기록[/color]  (강번 없음)  /  Slab 9000.0  /  2개"
+
+def test_plan_is_shared_per_settings():
+    assert compile_plan({}) is compile_plan({"round": False, "other": 1})
+    assert compile_plan({"round": True}) is not compile_plan({})
+
+def test_formatter_cache():
+    f = ResultFormatter(maxsize=2)
+    d = dict(H2, id=1)
+    assert f.history_text(d, 3, {}) == GOLDEN_HISTORY
+    assert f.history_text(d, 3, {}) == GOLDEN_HISTORY and (f.hits, f.misses) == (1, 1)
+    # 설정이 다르면 다른 항목
+    assert f.history_text(d, 3, {"round": True, "hide_mm": True}) == GOLDEN_HISTORY_ROUND
+    f.history_text(dict(d, id=2), 3, {})
+    assert len(f._cache) == 2
+    f.invalidate()
+    assert not f._cache
+    assert f.result_text(R1, "SG94123-01", {}) == GOLDEN_RESULT
@@ -0,0 +1,106 @@
+#-*- coding: utf-8 -*-
+import random
+
+import pytest
+
+from slab_fixed import (to_units, decimals, round_div, fmt_units, compute_fixed,
+                        fixed_from_result, FixedBatch)
+from slab_core import (_compute, build_history_text, ResultFormatter, load_settings)
+from slab_cli import calc_records, read_records, format_output
+
+@pytest.mark.parametrize("x, units", [
+    ("2950.05", 29501), ("2950.04", 29500), (0.05, 1), ("-0.05", -1),
+    (7, 70), ("1e3", 10000), (2950.55, 29506), ("12.", 120),
+])
+def test_to_units_half_up(x, units):
+    assert to_units(x) == units
+
+@pytest.mark.parametrize("x", ["abc", "", "1.2.3"])
+def test_to_units_invalid(x):
+    assert to_units(x) is None
+
+def test_decimals():
+    assert decimals(9000.0) == 0
+    assert decimals(2950.5) == 1
+    assert decimals(2950.55) == 2
+    assert decimals("12.3400") == 2
+
+def test_round_div_half_away_from_zero():
+    assert round_div(5, 2) == 3
+    assert round_div(-5, 2) == -3
+    assert round_div(4, 3) == 1
+    assert fmt_units(5, 2) == "0.3"          # 0.25 mm -> 0.3
+    assert fmt_units(-5, 2) == "-0.3"
+    assert fmt_units(12345, 1, do_round=True) == "1235"
+
+def test_compute_fixed_matches_float():
+    rnd = random.Random(1)
+    for _ in range(300):
+        guides = [rnd.randrange(8000, 35000) / 10 for _ in range(rnd.randint(2, 6))]
+        slab = round(sum(guides) + 15 * len(guides) + rnd.uniform(0, 500), 1)
+        r = _compute(slab, guides, 15.0)
+        fx = compute_fixed(to_units(slab), [to_units(g) for g in guides], to_units(15.0))
+        assert fx["remain"] / 10 == pytest.approx(r["remain"], abs=1e-6)
+        for num, real in zip(fx["real"], r["real"]):
+            assert num / fx["den"] / 10 == pytest.approx(real, abs=1e-6)
+
+def test_compute_fixed_too_long():
+    assert compute_fixed(10000, [6000, 6000], 150) is None
+    assert compute_fixed(10000, [6000, 6000], 150, allow_negative=True)["remain"] < 0
+
+@pytest.mark.parametrize("bad", [float("nan"), float("inf"), float("-inf")])
+def test_fixed_from_result_rejects_non_finite(bad):
+    for res in ({"slab": bad, "loss": 15.0, "guides": [100.0, 200.0]},
+                {"slab": 9000.0, "loss": bad, "guides": [100.0, 200.0]},
+                {"slab": 9000.0, "loss": 15.0, "guides": [100.0, bad]}):
+        with pytest.raises(ValueError):
+            fixed_from_result(res)
+        assert "error" in format_output("X", res, None, False)
+
+def test_cli_nan_row_regression():
+    # 예전에는 fixed_from_result 에서 TypeError (None - int) 로 전체가 멈췄음
+    rows = ["code,slab,p1,p2\n", "A,nan,100,200\n", "B,1e999,100,200\n", "C,9000,3000,2900\n"]
+    out = list(calc_records(read_records(iter(rows), "csv"), "SG94", 15.0, False))
+    assert [("error" in o) for o in out] == [True, True, False]
+    assert out[2]["remain"] == "3085.0"
+
+def test_fixed_batch_round_trip():
+    fb = FixedBatch.from_records([{"slab": 9000.0, "guides": [2950.0, 3000.0, 2900.0], "loss": 15.0},
+                                  {"slab": 8000.5, "guides": [4000.0, 3900.0]}])
+    fb2 = FixedBatch.from_bytes(fb.to_bytes())
+    assert len(fb2) == 2
+    assert fb2[1] == (80005, [40000, 39000], 150)
+    assert list(fb2.results()) == list(fb.results())
+    with pytest.raises(ValueError):
+        FixedBatch.from_bytes(b"XXXX" + fb.to_bytes()[4:])
+
+@pytest.mark.parametrize("slab, guides, loss", [
+    (float("nan"), [3000.0, 2900.0], 15.0),
+    (9000.0, [3000.0, float("inf")], 15.0),
+    (9000.0, [3000.0, 2900.0], float("-inf")),
+    (9000.0, ["abc", 2900.0], 15.0),
+    (1e300, [3000.0, 2900.0], 15.0),            # int32 범위 밖
+])
+def test_fixed_batch_rejects_bad_lengths(slab, guides, loss):
+    fb = FixedBatch.from_records([{"slab": 9000.0, "guides": [2950.0, 3000.0]}])
+    with pytest.raises(ValueError):
+        fb.append(slab, guides, loss)
+    # 실패한 행은 열에 조금도 남지 않음
+    assert len(fb) == 1 and len(fb.loss) == 1 and list(fb.offs) == [0, 2] and len(fb.guides) == 2
+    fb.append(8000.0, [4000.0, 3900.0], 15.0)
+    assert fb[1] == (80000, [40000, 39000], 150)
+
+def test_cached_history_text_is_identical():
+    st = load_settings("")
+    fmt = ResultFormatter(maxsize=8)
+    rnd = random.Random(2)
+    recs = []
+    for i in range(6):
+        guides = [rnd.randrange(8000, 35000) / 10 for _ in range(3)]
+        d = _compute(sum(guides) + 100.0, guides, 15.0)
+        d.update(id=i + 1, code=f"SG94{i:03d}-01", timestamp="2026-01-01 00:00")
+        recs.append(d)
+    for _ in range(2):
+        for d in recs:
+            assert fmt.history_text(d, 1, st) == build_history_text(d, 1, st)
+    assert fmt.misses == 6 and fmt.hits == 6
@@ -0,0 +1,79 @@
+#-*- coding: utf-8 -*-
+import time, threading, socketserver
+
+import pytest
+
+from slab_gauge import GaugeIngest, parse_reading, parse_addr
+
+def test_parse_reading():
+    assert parse_reading("9000.5\r\n") == 9000.5
+    assert parse_reading(b"ST,GS,+09000.5,mm\r\n") == 9000.5
+    assert parse_reading("01:L=9000.5") == 9000.5
+    assert parse_reading("ERR") is None
+    assert parse_reading("ST,GS,-00001.0,mm") is None
+
+def test_parse_addr():
+    assert parse_addr("tcp://10.0.0.5:5020") == ("tcp", "10.0.0.5", 5020)
+    assert parse_addr("gauge:5020") == ("tcp", "gauge", 5020)
+    assert parse_addr("serial:///dev/ttyUSB0@19200") == ("serial", "/dev/ttyUSB0", 19200)
+    with pytest.raises(ValueError):
+        parse_addr("gauge")
+
+class _Gauge(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+def _serve(scripts):
+    # 연결마다 scripts 의 다음 바이트열을 보내고 닫음 (마지막 것은 계속 반복)
+    conns = []
+
+    class H(socketserver.BaseRequestHandler):
+        def handle(self):
+            conns.append(1)
+            data = scripts[min(len(conns), len(scripts)) - 1]
+            try:
+                self.request.sendall(data)
+                time.sleep(0.2)
+            except OSError:
+                pass
+
+    srv = _Gauge(("127.0.0.1", 0), H)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, conns
+
+def _wait(cond, timeout=10.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if cond():
+            return True
+        time.sleep(0.02)
+    return False
+
+def test_overlong_line_is_skipped_and_ingest_continues():
+    junk = b"X" * 200000
+    srv, conns = _serve([b"9000.5\n" + junk + b"\n9001.0\n" + junk, b"9002.0\n"])
+    got = []
+    g = GaugeIngest(f"127.0.0.1:{srv.server_address[1]}", lambda fn: fn(),
+                    lambda items: got.extend(it["slab"] for it in items))
+    g.set_context("SG9400001-01", [3000.0, 2900.0], 15.0)
+    g.start()
+    try:
+        assert _wait(lambda: 9002.0 in got)
+        assert got[:3] == [9000.5, 9001.0, 9002.0]
+        assert g.stats["bad_lines"] == 2 and len(conns) >= 2
+        assert g._thread.is_alive()
+    finally:
+        g.stop()
+        srv.shutdown()
+
+def test_reconnect_backs_off_when_gauge_closes_without_data():
+    srv, conns = _serve([b""])          # 연결만 받고 바로 닫는 게이지
+    g = GaugeIngest(f"127.0.0.1:{srv.server_address[1]}", lambda fn: fn(), lambda items: None)
+    g.start()
+    try:
+        time.sleep(1.3)                 # 0.5 + 1.0 초 대기 -> 최대 3번 연결
+        assert 1 <= len(conns) <= 3
+        assert g._thread.is_alive()
+    finally:
+        g.stop()
+        srv.shutdown()
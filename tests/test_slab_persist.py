@@ -0,0 +1,72 @@
+#-*- coding: utf-8 -*-
+import time, threading
+
+from slab_persist import PersistWorker, HistoryQueue
+
+def _worker(delay):
+    w = PersistWorker(delay=delay)
+    w.start()
+    return w
+
+def test_steady_submits_within_delay_are_coalesced():
+    w = _worker(0.3)
+    done = []
+    try:
+        # 지연 시간 안에 여러 번 들어온 같은 키 저장 -> 마지막 것 한 번만 실행
+        for i in range(10):
+            w.submit("settings", lambda i=i: done.append(i))
+            time.sleep(0.01)
+        assert w.flush()
+        assert done == [9]
+        assert w.stats()["writes"] == 1 and w.stats()["coalesced"] == 9
+    finally:
+        w.stop()
+
+def test_delay_is_not_cut_short_by_other_keys():
+    w = _worker(0.3)
+    ran = threading.Event()
+    try:
+        w.submit("a", ran.set)
+        time.sleep(0.05)
+        w.submit("b", lambda: None)      # notify_all 로 깨워도 바로 쓰지 않음
+        assert not ran.wait(0.1)
+        assert ran.wait(2.0)
+    finally:
+        w.stop()
+
+def test_flush_skips_delay():
+    w = _worker(10.0)
+    done = []
+    try:
+        w.submit("a", lambda: done.append(1))
+        t0 = time.monotonic()
+        assert w.flush(timeout=2.0)
+        assert done == [1] and time.monotonic() - t0 < 1.0
+    finally:
+        w.stop()
+
+def test_job_errors_are_counted():
+    w = _worker(0.0)
+    try:
+        w.submit("a", lambda: 1 / 0)
+        assert w.flush()
+        assert w.stats()["errors"] == 1
+    finally:
+        w.stop()
+
+class _ListStore(list):
+    def append_many(self, batch):
+        self.extend(batch)
+
+def test_history_queue_sees_pending_records():
+    w = _worker(0.2)
+    store = _ListStore()
+    q = HistoryQueue(store, w)
+    try:
+        q.append({"code": "A"})
+        q.append({"code": "B"})
+        assert len(q) == 2 and q[-1]["code"] == "B" and not store
+        assert w.flush()
+        assert [r["code"] for r in store] == ["A", "B"] and len(q) == 2
+    finally:
+        w.stop()
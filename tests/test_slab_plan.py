@@ -0,0 +1,119 @@
+#-*- coding: utf-8 -*-
+import os
+
+from slab_plan import PlanIndex, find_plan_file
+
+CSV = "front,back,slab,p1,p2\n12345,1,9000,3000,2900\n12346,1,8000,4000,3900\nbad,1,abc,1,2\n"
+
+def _write(path, text, encoding="utf-8"):
+    with open(path, "w", encoding=encoding, newline="") as f:
+        f.write(text)
+    # 같은 초 안에 다시 쓰면 mtime 이 같을 수 있음
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+def test_load_and_get(tmp_path):
+    p = tmp_path / "work_orders.csv"
+    _write(p, CSV)
+    assert find_plan_file(["", str(tmp_path)]) == str(p)
+    idx = PlanIndex()
+    idx.load(str(p), "SG94", 15.0)
+    assert idx.done and not idx.error
+    assert len(idx) == 2 and idx.skipped == 1
+    ent = idx.get("SG9412345-01", 15.0)
+    assert ent["result"]["remain"] == 3085.0
+    assert idx.get("SG9412345-01", 20.0)["result"]["remain"] == 3080.0
+    assert idx.get("SG9499999-01", 15.0) is None
+
+def test_reload_drops_removed_codes_and_old_prefix(tmp_path):
+    p = tmp_path / "work_orders.csv"
+    _write(p, CSV)
+    idx = PlanIndex()
+    idx.load(str(p), "SG94", 15.0)
+    _write(p, "front,back,slab,p1,p2\n12345,1,9000,3000,2900\n")
+    idx.load(str(p), "SG94", 15.0)
+    assert idx.codes() == ["SG9412345-01"]
+    idx.load(str(p), "SG95", 15.0)
+    assert idx.codes() == ["SG9512345-01"]
+    assert idx.get("SG9412345-01", 15.0) is None
+
+def test_bom_and_cp949(tmp_path):
+    p = tmp_path / "work_orders.csv"
+    _write(p, "\ufeffcode,slab,p1,p2\nSG9400001-01,9000,3000,2900\n")
+    idx = PlanIndex()
+    idx.load(str(p), "SG94", 15.0)
+    assert idx.codes() == ["SG9400001-01"]
+    _write(p, "code,slab,p1,p2,비고\nSG9400002-01,9000,3000,2900,한글 메모\n", "cp949")
+    idx.load(str(p), "SG94", 15.0)
+    assert not idx.error and idx.codes() == ["SG9400002-01"]
+
+def test_malformed_jsonl_is_skipped(tmp_path):
+    p = tmp_path / "work_orders.jsonl"
+    _write(p, '{"code": "SG9400001-01", "slab": 9000, "guides": [3000, 2900]}\n{oops\n[1]\n')
+    idx = PlanIndex()
+    idx.load(str(p), "SG94", 15.0)
+    assert len(idx) == 1 and idx.skipped == 2
+
+def test_failure_still_signals_done(tmp_path):
+    p = tmp_path / "work_orders.csv"
+    _write(p, CSV)
+    idx = PlanIndex()
+    idx.load(str(p), "SG94", 15.0)
+    calls = []
+    t = idx.start(str(tmp_path / "missing.csv"), "SG94", 15.0, on_done=calls.append)
+    assert t is None                 # 없는 파일은 시작하지 않음
+    idx.path = None
+    os.chmod(p, 0)
+    try:
+        if os.access(p, os.R_OK):    # root 로 실행하면 권한으로 막을 수 없음 -> 디렉터리로 대신
+            p = tmp_path / "dir.csv"
+            p.mkdir()
+        t = idx.start(str(p), "SG94", 15.0, on_done=calls.append)
+        t.join(5)
+    finally:
+        os.chmod(tmp_path / "work_orders.csv", 0o644)
+    assert calls == [idx] and idx.done and idx.error
+    assert len(idx) == 2             # 예전 색인은 그대로
+
+def test_get_during_load_does_not_touch_the_loader_index(tmp_path):
+    p = tmp_path / "work_orders.csv"
+    _write(p, "front,back,slab,p1,p2\n" + "".join(f"{10000 + i},1,9000,3000,2900\n" for i in range(50)))
+    idx = PlanIndex()
+    seen = []
+
+    def on_batch(ix):
+        # 읽는 중 (읽기 스레드 안): 다른 손실로 조회 -> 값은 돌려주지만 읽는 중인 색인은 그대로
+        ent = ix.get("SG9410000-01", 20.0)
+        seen.append((ent["loss"], ent["result"]["remain"], ix._loading["SG9410000-01"]["loss"],
+                     "SG9410000-01" in ix._map))
+
+    idx.load(str(p), "SG94", 15.0, batch=10, on_batch=on_batch)
+    assert seen and all(s == (20.0, 3080.0, 15.0, False) for s in seen)
+    assert idx._map["SG9410000-01"]["loss"] == 15.0
+    # 완성된 색인은 다시 계산한 값을 저장해 두고 재사용
+    first = idx.get("SG9410000-01", 20.0)
+    assert idx._map["SG9410000-01"] is first and idx.get("SG9410000-01", 20.0) is first
+
+def test_get_does_not_overwrite_a_newer_index(tmp_path, monkeypatch):
+    import slab_plan
+    p = tmp_path / "work_orders.csv"
+    _write(p, CSV)
+    idx = PlanIndex()
+    idx.load(str(p), "SG94", 15.0)
+    _write(p, CSV.replace("12345,1,9000", "12345,1,9500"))
+    real_compute = slab_plan._compute
+    calls = []
+
+    def compute_then_reload(*a):
+        # get() 이 다시 계산하는 사이 새 파일을 읽어 색인이 바뀐 경우
+        if not calls:
+            calls.append(1)
+            monkeypatch.setattr(slab_plan, "_compute", real_compute)
+            idx.load(str(p), "SG94", 15.0)
+        return real_compute(*a)
+
+    monkeypatch.setattr(slab_plan, "_compute", compute_then_reload)
+    ent = idx.get("SG9412345-01", 20.0)
+    assert calls and ent["slab"] == 9000.0
+    assert idx._map["SG9412345-01"]["slab"] == 9500.0
+    assert idx._map["SG9412345-01"]["loss"] == 15.0
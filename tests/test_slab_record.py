@@ -0,0 +1,77 @@
+#-*- coding: utf-8 -*-
+import random, struct
+
+import pytest
+
+from slab_core import _compute
+from slab_record import HistoryRecord, RecordColumns, encode, decode, compactable
+
+def _rec(i, **kw):
+    r = _compute(9000.0 + i % 300, [2950.0, 3000.0, 2900.0 + i % 7 / 10], 15.0)
+    r.update(code=f"SG94{i % 1000:03d}-01", ts=1.7e9 + i * 60)
+    r.update(kw)
+    return r
+
+def _plain(rec):
+    d = rec.to_dict() if hasattr(rec, "to_dict") else dict(rec)
+    d.pop("id", None)
+    d.pop("timestamp", None)       # ts 로 만든 표시 시각
+    return d
+
+def test_record_reads_like_dict():
+    d = _rec(3)
+    r = HistoryRecord.from_dict(d)
+    assert _plain(r) == d and r["real"] == d["real"] and r["guides"] == d["guides"]
+    assert r.get("id") is None and "id" not in r and "remain" in r
+    assert r["timestamp"] == r.timestamp and "timestamp" not in d
+    with pytest.raises(KeyError):
+        r["nope"]
+
+def test_encode_decode_round_trip():
+    rnd = random.Random(11)
+    for i in range(200):
+        d = _compute(round(rnd.uniform(6000, 12000), 1), [round(rnd.uniform(1500, 3500), 1)], 15.0)
+        d.update(code=f"SG94{i:03d}-01", ts=1.7e9 + i)
+        buf = encode(d)
+        assert buf[0] == 0                          # 0.1 mm 정수
+        back = decode(buf, id=i)
+        assert back.id == i and _plain(back) == d
+
+def test_float_lengths_and_text_timestamp():
+    # 0.1 mm 로 안 떨어지는 길이 -> float64, 예전 기록의 표시 시각 문자열은 그대로 보관
+    r = HistoryRecord(9000.05, [3000.0, 2999.99], 15.0, "SG94-한글", 0, "01-02 03:04:05")
+    buf = encode(r)
+    assert buf[0] == 3
+    back = decode(buf)
+    assert back == r and back.slab == 9000.05 and back.timestamp == "01-02 03:04:05"
+
+def test_decode_rejects_truncated_buffer():
+    buf = encode(_rec(1))
+    with pytest.raises(struct.error):
+        decode(buf[:10])
+
+def test_compactable():
+    assert compactable(_rec(1))
+    assert not compactable(_rec(1, note="x"))                  # 모르는 키
+    assert not compactable(_rec(1, remain=1.0))                # 다른 계산식
+    assert not compactable({"slab": 9000.0, "guides": [3000.0, "x"], "loss": 15.0})
+    assert not compactable({"guides": [3000.0]})
+    for bad in (float("nan"), float("inf")):
+        assert not compactable({"slab": bad, "guides": [3000.0], "loss": 15.0})
+        assert not compactable({"slab": 9000.0, "guides": [bad], "loss": 15.0})
+
+def test_columns_round_trip():
+    recs = [_rec(i) for i in range(50)]
+    recs[7] = HistoryRecord(9000.05, [3000.0], 15.0, "SG94007-01", 1.7e9)
+    recs[9] = HistoryRecord(9000.0, [3000.0], 15.0, "SG94009-01", 0, "01-02 03:04:05")
+    cols = RecordColumns.from_records(recs)
+    assert len(cols) == 50 and sorted(cols._extra) == [7, 9]
+    back = RecordColumns.from_bytes(cols.to_bytes())
+    assert [_plain(r) for r in back] == [_plain(r) for r in recs]
+    assert back[7] == recs[7] and back[-1].code == recs[-1]["code"]
+    with pytest.raises(IndexError):
+        back[50]
+
+def test_columns_reject_other_data():
+    with pytest.raises(ValueError):
+        RecordColumns.from_bytes(b"XXXX" + bytes(12))
@@ -0,0 +1,102 @@
+#-*- coding: utf-8 -*-
+import json, random, asyncio
+
+import pytest
+
+import slab_service
+from slab_service import CalcService, compute_many
+from slab_cli import calc_records
+
+GOOD = {"code": "SG94123-01", "slab": 9000, "guides": [2950, 3000, 2900]}
+
+def _records(n, seed=0):
+    rnd = random.Random(seed)
+    out = []
+    for i in range(n):
+        guides = [rnd.randrange(8000, 35000) / 10 for _ in range(rnd.randint(2, 5))]
+        out.append({"code": f"SG94{i:03d}-01", "guides": guides,
+                    "slab": round(sum(guides) + 15 * len(guides) + rnd.uniform(-50, 300), 1)})
+    return out
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_compute_many_matches_cli(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(slab_service, "np", None)
+    elif slab_service.np is None:
+        pytest.skip("numpy 없음")
+    recs = _records(200)
+    want = list(calc_records(recs, "SG94", 15.0, False))
+    assert compute_many([(r, False) for r in recs], "SG94", 15.0) == want
+
+def test_compute_many_bad_row_does_not_spoil_batch():
+    good = _records(20)
+    recs = good + [{"slab": "nan", "guides": [1, 2]}, {"slab": 1e999, "guides": [1, 2]},
+                           dict(GOOD, loss="nan")]
+    outs = compute_many([(r, False) for r in recs], "SG94", 15.0)
+    assert outs[:20] == compute_many([(r, False) for r in good], "SG94", 15.0)
+    assert all("error" in o for o in outs[20:])
+
+def test_numeric_zero_back_code():
+    rec = {"front": 123, "back": 0, "slab": 9000, "guides": [3000, 2950]}
+    assert compute_many([(rec, False)], "SG94", 15.0)[0]["code"] == "SG94123-00"
+
+def test_run_batch_fails_only_bad_future():
+    async def go():
+        svc = CalcService()
+        loop = asyncio.get_running_loop()
+        futs = [loop.create_future() for _ in range(3)]
+        svc._run_batch([(GOOD, False, futs[0]), (dict(GOOD, loss="x"), False, futs[1]),
+                        ({"slab": "nan", "guides": [1, 2]}, False, futs[2])])
+        return futs
+    good, bad, nan = asyncio.run(go())
+    assert good.result()["remain"] == "120.0"
+    with pytest.raises(ValueError):
+        bad.result()
+    assert "error" in nan.result()
+
+async def _http(port, raw):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b""):
+            break
+        k, _, v = h.decode("latin-1").partition(":")
+        if k.lower() == "content-length":
+            length = int(v)
+    body = json.loads(await reader.readexactly(length))
+    writer.close()
+    return status, body
+
+def _post(path, obj, length=None):
+    data = json.dumps(obj).encode("utf-8") if not isinstance(obj, bytes) else obj
+    n = len(data) if length is None else length
+    return f"POST {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {n}\r\n\r\n".encode("latin-1") + data
+
+def test_http_endpoints():
+    async def go():
+        svc = CalcService(window_ms=5.0)
+        started = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(svc.serve("127.0.0.1", 0, started.set_result))
+        port = await started
+        try:
+            # 동시에 보낸 요청은 한 묶음: 잘못된 요청만 400
+            res = await asyncio.gather(_http(port, _post("/calc", GOOD)),
+                                       _http(port, _post("/calc", dict(GOOD, loss="nan"))),
+                                       _http(port, _post("/calc", b'{"slab": 1e999, "guides": [1, 2]}')))
+            bad_len = await _http(port, _post("/calc", GOOD, length="abc"))
+            batch = await _http(port, _post("/batch", {"records": [GOOD, {"slab": "nan"}]}))
+            health = await _http(port, b"GET /health HTTP/1.1\r\nHost: x\r\n\r\n")
+        finally:
+            task.cancel()
+        return res, bad_len, batch, health
+    (ok, bad, inf), bad_len, batch, health = asyncio.run(go())
+    assert ok[0] == 200 and ok[1]["remain"] == "120.0"
+    assert bad[0] == 400
+    assert inf[0] == 200 and "error" in inf[1]
+    assert bad_len[0] == 400
+    assert batch[0] == 200 and "error" not in batch[1]["results"][0] and "error" in batch[1]["results"][1]
+    assert health == (200, {"ok": True})
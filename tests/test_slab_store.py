@@ -0,0 +1,178 @@
+#-*- coding: utf-8 -*-
+import os, json
+from itertools import islice
+
+import pytest
+
+import slab_store
+from slab_store import HistoryJournal, HistoryDB, open_history, open_memory_history
+from slab_core import _compute
+
+def _rec(i, **kw):
+    r = _compute(9000.0 + i % 300, [2950.0, 3000.0, 2900.0 + i % 7 / 10], 15.0)
+    r.update(code=f"SG94{i % 1000:03d}-01", ts=1.7e9 + i * 60)
+    r.update(kw)
+    return r
+
+def _plain(rec):
+    d = rec.to_dict() if hasattr(rec, "to_dict") else dict(rec)
+    d.pop("id", None)
+    d.pop("timestamp", None)       # ts 로 만든 표시 시각 (HistoryRecord)
+    return d
+
+# ===== 저널 =====
+def test_journal_round_trip_and_reopen(tmp_path):
+    p = str(tmp_path / "h.jsonl")
+    j = HistoryJournal(p)
+    recs = [_rec(i) for i in range(50)]
+    j.append_many(recs[:30])
+    for r in recs[30:]:
+        j.append(r)
+    assert len(j) == 50 and j[0] == recs[0] and j[-1] == recs[-1]
+    assert j.recent(0, 3) == recs[-1:-4:-1]
+    j.close()
+    j = HistoryJournal(p)
+    assert list(j) == recs
+    j.close()
+
+def test_journal_recovers_truncated_tail(tmp_path):
+    p = str(tmp_path / "h.jsonl")
+    j = HistoryJournal(p)
+    j.append_many([_rec(i) for i in range(5)])
+    j.close()
+    with open(p, "ab") as f:
+        f.write(b'{"slab": 90')            # 비정상 종료로 잘린 줄
+    os.remove(str(tmp_path / "h.idx"))     # 인덱스도 없음 -> 저널에서 다시 만듦
+    j = HistoryJournal(p)
+    assert len(j) == 5 and j[4] == _rec(4)
+    j.append(_rec(5))
+    assert j[5] == _rec(5)
+    j.close()
+
+def test_journal_compacts_to_keep(tmp_path):
+    j = HistoryJournal(str(tmp_path / "h.jsonl"), keep=10)
+    j.append_many([_rec(i) for i in range(21)])
+    assert len(j) == 10 and j[0] == _rec(11)
+    j.close()
+
+def test_journal_migrates_legacy_json(tmp_path):
+    legacy = tmp_path / "calc_history.json"
+    legacy.write_text(json.dumps([_rec(1), _rec(2)]), encoding="utf-8")
+    j = HistoryJournal(str(tmp_path / "calc_history.jsonl"), legacy_json=str(legacy))
+    assert list(j) == [_rec(1), _rec(2)]
+    assert (tmp_path / "calc_history.json.bak").exists()
+    j.close()
+
+# ===== SQLite =====
+@pytest.mark.skipif(slab_store.sqlite3 is None, reason="sqlite3 없음")
+class TestHistoryDB:
+    def test_round_trip(self, tmp_path):
+        db = HistoryDB(str(tmp_path / "h.db"))
+        recs = [_rec(i) for i in range(40)] + [dict(_rec(40), memo="압축 안 되는 기록")]
+        db.append_many(recs)
+        assert len(db) == 41
+        assert [_plain(r) for r in db] == recs
+        assert _plain(db[-1]) == recs[-1] and _plain(db[3]) == recs[3]
+        db.close()
+        db = HistoryDB(str(tmp_path / "h.db"))
+        assert len(db) == 41 and _plain(db[0]) == recs[0]
+        db.close()
+
+    def test_iter_streams_in_chunks(self, tmp_path, monkeypatch):
+        db = HistoryDB(str(tmp_path / "h.db"))
+        db.append_many(_rec(i) for i in range(1203))
+        calls = []
+        real = db._db
+        class Spy:
+            def execute(self, sql, args=()):
+                calls.append(args)
+                return real.execute(sql, args)
+            def __getattr__(self, name):
+                return getattr(real, name)
+        db._db = Spy()
+        assert [r["code"] for r in islice(db, 10)] == [_rec(i)["code"] for i in range(10)]
+        assert len(calls) == 1 and calls[0][1] == 500     # 첫 묶음만 읽음
+        calls.clear()
+        assert sum(1 for _ in db) == 1203 and len(calls) == 3
+        db._db = real
+        db.close()
+
+    def test_query(self, tmp_path):
+        db = HistoryDB(str(tmp_path / "h.db"))
+        db.append_many([_rec(i) for i in range(30)])
+        page = db.query(limit=5)
+        assert [r["code"] for r in page] == [_rec(i)["code"] for i in range(29, 24, -1)]
+        nxt = db.query(limit=5, before_id=page[-1]["id"])
+        assert nxt[0]["code"] == _rec(24)["code"]
+        assert [r["code"] for r in db.query(code="SG94007", match="exact")] == []
+        assert [r["code"] for r in db.query(code="SG94007-01", match="exact")] == ["SG94007-01"]
+        assert db.count(code="SG9401") == 10
+        assert db.count(code="07-0", match="contains") == 1
+        assert db.count(slab_min=9010, slab_max=9019) == 10
+        assert db.codes() == {_rec(i)["code"] for i in range(30)}
+        db.close()
+
+    def test_getitem_uses_id_not_offset(self, tmp_path):
+        db = HistoryDB(str(tmp_path / "h.db"))
+        db.append_many(_rec(i) for i in range(50))
+        sqls = []
+        db._db.set_trace_callback(sqls.append)
+        assert db[7]["code"] == _rec(7)["code"] and db[-1]["code"] == _rec(49)["code"]
+        db._db.set_trace_callback(None)
+        assert sqls and not any("OFFSET" in s for s in sqls)
+        with pytest.raises(IndexError):
+            db[50]
+        db.close()
+
+    def test_keep_trims_oldest(self, tmp_path):
+        db = HistoryDB(str(tmp_path / "h.db"), keep=10)
+        db.append_many(_rec(i) for i in range(25))
+        assert len(db) == 10 and db.count() == 10
+        assert [r["code"] for r in db] == [_rec(i)["code"] for i in range(15, 25)]
+        db.append(_rec(25))
+        assert len(db) == 10 and db[0]["code"] == _rec(16)["code"]
+        assert db[-1]["code"] == _rec(25)["code"]
+        db.close()
+        # 보관 개수를 줄여 다시 열면 바로 잘라냄
+        db = HistoryDB(str(tmp_path / "h.db"), keep=4)
+        assert [r["code"] for r in db] == [_rec(i)["code"] for i in range(22, 26)]
+        assert db.count() == 4
+        db.close()
+
+    def test_getitem_with_id_gaps(self, tmp_path):
+        db = HistoryDB(str(tmp_path / "h.db"))
+        db.append_many(_rec(i) for i in range(10))
+        db._db.execute("DELETE FROM history WHERE id IN (3, 4, 10)")
+        db._db.commit()
+        db.close()
+        db = HistoryDB(str(tmp_path / "h.db"), keep=6)
+        kept = [0, 1, 4, 5, 6, 7, 8]
+        db.append(_rec(10))         # AUTOINCREMENT 라 id 10 은 다시 쓰지 않음
+        want = [_rec(i)["code"] for i in kept[2:] + [10]]
+        assert len(db) == 6 and [db[i]["code"] for i in range(6)] == want
+        assert [r["code"] for r in db] == want and db[-2]["code"] == _rec(8)["code"]
+        db.close()
+
+    def test_open_history_migrates_journal(self, tmp_path):
+        j = HistoryJournal(str(tmp_path / "calc_history.jsonl"))
+        j.append_many([_rec(i) for i in range(3)])
+        j.close()
+        h = open_history(str(tmp_path))
+        assert isinstance(h, HistoryDB) and [_plain(r) for r in h] == [_rec(i) for i in range(3)]
+        assert not (tmp_path / "calc_history.idx").exists()
+        h.close()
+
+# ===== 기록 파일을 못 열 때 =====
+@pytest.mark.parametrize("has_sqlite", [True, False])
+def test_memory_history_fallback(monkeypatch, has_sqlite):
+    if not has_sqlite:
+        monkeypatch.setattr(slab_store, "sqlite3", None)
+    elif slab_store.sqlite3 is None:
+        pytest.skip("sqlite3 없음")
+    h = open_memory_history(keep=10)
+    recs = [_rec(i) for i in range(5)]
+    h.append_many(recs)
+    assert len(h) == 5 and [_plain(r) for r in h] == recs
+    assert [_plain(r) for r in h.recent(0, 2)] == recs[:-3:-1]
+    assert h.codes() == {r["code"] for r in recs}
+    h.close()
@@ -0,0 +1,52 @@
+#-*- coding: utf-8 -*-
+import random, threading
+
+from slab_suggest import CodeIndex
+
+CODES = ["SG94123-01", "SG94123-02", "SG94124-01", "SG94200-01", "SG95001-01", "SK11001-01"]
+
+def test_prefix_narrows_as_user_types():
+    idx = CodeIndex(CODES + ["", None])
+    assert len(idx) == 6 and "SG94123-01" in idx and "" not in idx
+    assert idx.prefixed("S", limit=10) == sorted(CODES)
+    assert idx.prefixed("SG94") == ["SG94123-01", "SG94123-02", "SG94124-01", "SG94200-01"]
+    assert idx.prefixed("SG9412") == ["SG94123-01", "SG94123-02", "SG94124-01"]
+    assert idx.prefixed("SG94123-0") == ["SG94123-01", "SG94123-02"]
+    assert idx.prefixed("SG94123-02") == ["SG94123-02"]
+    assert idx.prefixed("SG943") == [] and idx.prefixed("X") == []
+    # 중간 부분 일치는 자동완성 대상 아님 (기록 검색 HistoryDB.query(match="contains") 에서)
+    assert idx.prefixed("123") == []
+    assert idx.count("SG94") == 4 and idx.count("SG9412") == 3 and idx.count("Z") == 0
+
+def test_results_are_sorted_and_limited():
+    idx = CodeIndex(f"SG94{i:03d}-0{i % 3 + 1}" for i in reversed(range(300)))
+    got = idx.prefixed("SG94", limit=8)
+    assert got == [f"SG94{i:03d}-0{i % 3 + 1}" for i in range(8)]
+    assert idx.prefixed("SG941", limit=3) == ["SG94100-02", "SG94101-03", "SG94102-01"]
+    assert idx.count("SG94") == 300
+    assert idx.prefixed("", limit=2) == ["SG94000-01", "SG94001-02"]
+
+def test_grows_with_history():
+    idx = CodeIndex(CODES)
+    idx.add("SG94123-03")
+    idx.add("SG94123-03")
+    idx.add("")
+    assert idx.prefixed("SG94123") == ["SG94123-01", "SG94123-02", "SG94123-03"]
+    assert idx.update(["SG94123-01", "SG94999-01"]) == 1       # 작은 병합: 한 건씩
+    many = [f"SG96{i:03d}-01" for i in range(500)]
+    random.Random(0).shuffle(many)
+    assert idx.update(many + CODES) == 500                     # 큰 병합: 새 배열로 교체
+    assert idx.update(many) == 0
+    assert len(idx) == 6 + 2 + 500
+    assert idx.prefixed("SG96", limit=3) == ["SG96000-01", "SG96001-01", "SG96002-01"]
+    assert idx._arr == sorted(idx._set)
+
+def test_concurrent_add_and_update():
+    idx = CodeIndex()
+    big = [f"SG97{i:04d}-01" for i in range(3000)]
+    adds = [f"SG98{i:03d}-01" for i in range(300)]
+    t = threading.Thread(target=lambda: [idx.add(c) for c in adds])
+    t.start()
+    idx.update(big)
+    t.join()
+    assert len(idx) == 3300 and idx._arr == sorted(big + adds)
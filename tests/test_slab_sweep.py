@@ -0,0 +1,73 @@
+#-*- coding: utf-8 -*-
+import random
+
+import pytest
+
+import slab_sweep
+from slab_fixed import FixedBatch
+from slab_sweep import loss_steps, guide_subsets, drop_one_subsets, sweep, sweep_batch
+
+def _plain(res):
+    # numpy 배열 -> 목록 (두 경로 비교용)
+    return {k: v.tolist() if hasattr(v, "tolist") else v for k, v in res.items()}
+
+def _both(fn, monkeypatch, *args):
+    if slab_sweep.np is None:
+        pytest.skip("numpy 없음")
+    fast = _plain(fn(*args))
+    with monkeypatch.context() as m:
+        m.setattr(slab_sweep, "np", None)
+        slow = fn(*args)
+    return fast, slow
+
+def test_loss_steps():
+    assert loss_steps(15.0) == [100, 110, 120, 130, 140, 150, 160, 170, 180, 190, 200]
+    assert loss_steps(15.0, span=0) == [150]                     # 빈 범위 -> 현재 값만
+    assert loss_steps(15.0, span=5, step=2) == [110, 130, 150, 170, 190]   # 나누어 떨어지지 않음
+    assert loss_steps(15.0, span=0.5, step=2) == [150]           # step > span
+    assert loss_steps(2.0, span=5) == [0, 10, 20, 30, 40, 50, 60, 70]   # 0 미만 제외
+    assert loss_steps(15.0, span=0.2, step=0) == [148, 149, 150, 151, 152]  # step 0 -> 0.1 mm
+
+def test_subsets():
+    assert drop_one_subsets(2) == [(0, 1)]
+    assert drop_one_subsets(3) == [(0, 1, 2), (1, 2), (0, 2), (0, 1)]
+    assert len(guide_subsets(4)) == 11 and guide_subsets(4)[0] == (0, 1, 2, 3)
+    with pytest.raises(ValueError):
+        guide_subsets(slab_sweep.MAX_SUBSET_GUIDES + 1)
+    with pytest.raises(ValueError):
+        sweep(9000, [3000, 2900], [150], subsets=[(0,)])
+
+def test_numpy_and_loop_paths_match(monkeypatch):
+    rnd = random.Random(5)
+    for _ in range(50):
+        g = [rnd.randrange(8000, 35000) / 10 for _ in range(rnd.randint(2, 6))]
+        slab = round(sum(g) + rnd.uniform(-100, 300), 1)
+        losses = loss_steps(rnd.choice((10.0, 15.0)), span=rnd.choice((0, 3, 5)),
+                            step=rnd.choice((0.5, 1.0, 2.0)))
+        for subsets in (None, guide_subsets(len(g))):
+            fast, slow = _both(sweep, monkeypatch, slab, g, losses, subsets)
+            assert fast == slow
+
+def test_values():
+    res = _plain(sweep(9000, [3000, 2900, 2950], [140, 150]))
+    assert res["n"] == [3, 2, 2, 2] and res["den"] == [6, 4, 4, 4]
+    assert res["spare"] == [1500, 31500, 30500, 31000]
+    assert res["remain"][1] == [1500 - 300, 31500 - 150, 30500 - 150, 31000 - 150]
+    assert res["add_each"][1][0] == 2400 and res["max_loss"][0] == 750
+    short = _plain(sweep(5000, [3000, 2900], [150]))
+    assert short["ok"] == [[False]] and short["max_loss"] == [-9000]
+
+def test_empty_loss_range(monkeypatch):
+    fast, slow = _both(sweep, monkeypatch, 9000, [3000, 2900, 2950], [])
+    assert fast == slow
+    assert len(fast["remain"]) == 0 and fast["max_loss"] == [750, 31500, 30500, 31000]    # 2개 조합은 절단 1회
+
+def test_batch_paths_match(monkeypatch):
+    rnd = random.Random(6)
+    fb = FixedBatch()
+    for _ in range(200):
+        g = [rnd.randrange(8000, 35000) / 10 for _ in range(rnd.randint(1, 6))]
+        fb.append(round(sum(g) + rnd.uniform(-100, 300), 1), g, 15.0)
+    for losses in (loss_steps(15.0), [], [150]):
+        fast, slow = _both(sweep_batch, monkeypatch, fb, losses)
+        assert fast == slow
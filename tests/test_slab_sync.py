@@ -0,0 +1,100 @@
+#-*- coding: utf-8 -*-
+import os, json, time, threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from slab_sync import HistorySync, make_stand_in
+
+def _wait(cond, timeout=10.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if cond():
+            return True
+        time.sleep(0.02)
+    return False
+
+@pytest.fixture
+def server(tmp_path):
+    base = make_stand_in(str(tmp_path / "shift"))
+
+    class Handler(base):
+        bad = [None]        # None 이면 정상, 아니면 이 JSON 을 그대로 응답
+
+        def _reply(self, status, obj):
+            if Handler.bad[0] is not None:
+                obj = Handler.bad[0]
+            super()._reply(status, obj)
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    srv.url = f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.root = tmp_path / "shift"
+    srv.bad = Handler.bad
+    yield srv
+    srv.shutdown()
+
+def _recs(a, b):
+    return [{"slab": 9000.0, "guides": [3000.0, 2900.0], "loss": 15.0,
+             "code": f"SG94{i:03d}-01", "ts": 1.7e9 + i} for i in range(a, b)]
+
+def _received(srv, sync):
+    path = srv.root / (sync.device + ".jsonl")
+    if not path.exists():
+        return []
+    return [json.loads(line)["seq"] for line in path.read_text(encoding="utf-8").splitlines()]
+
+def _sync(tmp_path, url, **kw):
+    s = HistorySync(str(tmp_path / "sync"), url, base_delay=0.05, max_delay=0.2, **kw)
+    s.start()
+    return s
+
+def test_delivers_batches_and_resumes_without_resending(tmp_path, server):
+    s = _sync(tmp_path, server.url, batch=7)
+    s.append_many(_recs(0, 20))
+    assert _wait(lambda: s.pending() == 0)
+    assert s.fresh and _received(server, s) == list(range(1, 21))
+    assert s.stats["batches"] == 3 and s.stats["sent_bytes"] < s.stats["raw_bytes"]
+    s.stop()
+    s = _sync(tmp_path, server.url)
+    s.append_many(_recs(20, 25))
+    assert _wait(lambda: s.pending() == 0)
+    assert not s.fresh and _received(server, s) == list(range(1, 26))
+    s.stop()
+
+def test_offline_records_are_kept_and_sent_later(tmp_path, server):
+    s = _sync(tmp_path, "http://127.0.0.1:9")        # 닫힌 포트
+    s.append_many(_recs(0, 5))
+    assert _wait(lambda: s.stats["failures"] >= 2)
+    assert s.is_alive() and s.pending() == 5
+    s.stop()
+    s = _sync(tmp_path, server.url)
+    assert s._ready.wait(5)                         # 보내기함을 다 읽기 전에는 pending() == 0
+    assert _wait(lambda: s.pending() == 0)
+    assert _received(server, s) == [1, 2, 3, 4, 5]
+    s.stop()
+    # 받은 기록은 보내기함에서 정리됨
+    assert os.path.getsize(tmp_path / "sync" / "outbox.jsonl") == 0
+
+@pytest.mark.parametrize("bad", [[1, 2], {"upto": None}, {"upto": "x"}, "text"])
+def test_bad_server_response_backs_off_and_retries(tmp_path, server, bad):
+    server.bad[0] = bad
+    s = _sync(tmp_path, server.url)
+    s.append_many(_recs(0, 3))
+    assert _wait(lambda: s.stats["failures"] >= 2)
+    assert s.is_alive() and "응답" in s.stats["last_error"]
+    server.bad[0] = None
+    assert _wait(lambda: s.pending() == 0)
+    assert _received(server, s) == [1, 2, 3]
+    s.stop()
+
+def test_null_response(tmp_path, server):
+    # JSON null 본문 -> json.loads 는 None
+    server.bad[0] = None
+    s = _sync(tmp_path, server.url)
+    s._ready.wait()
+    s._http = lambda method, body=None: None
+    s.append_many(_recs(0, 1))
+    assert _wait(lambda: s.stats["failures"] >= 1)
+    assert s.is_alive()
+    s.stop()
@@ -0,0 +1,66 @@
+#-*- coding: utf-8 -*-
+# 열 보관소(slab_archive) 벤치마크
+#   python tools/bench_archive.py [--n 1000000] [--dir /tmp/slab_archive_bench]
+# n 건 추가 시간, 파일 크기, 일별 합계(summary) 조회 vs 열 전체 스캔 / 백분위 시간 출력
+
+import os, sys, time, shutil, random, argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slab_archive import HistoryArchive
+
+def make_records(n, seed=0, chunk=10000):
+    rnd = random.Random(seed)
+    t = 1.7e9
+    for start in range(0, n, chunk):
+        out = []
+        for _ in range(min(chunk, n - start)):
+            guides = [rnd.randrange(8000, 35000) / 10 for _ in range(rnd.randint(2, 4))]
+            t += rnd.uniform(10, 60)
+            out.append({"slab": round(sum(guides) + 15 * len(guides) + rnd.uniform(0, 300), 1),
+                        "guides": guides, "loss": 15.0, "ts": t,
+                        "code": f"SG9{rnd.randrange(4)}{rnd.randrange(1000):03d}-0{rnd.randrange(10)}"})
+        yield out
+
+def _time(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        ms = (time.perf_counter() - t0) * 1000
+        best = ms if best is None else min(best, ms)
+    return out, best
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=1_000_000)
+    ap.add_argument("--dir", default="/tmp/slab_archive_bench")
+    args = ap.parse_args(argv)
+    shutil.rmtree(args.dir, ignore_errors=True)
+
+    arc = HistoryArchive(args.dir)
+    t0 = time.perf_counter()
+    for chunk in make_records(args.n):
+        arc.append_many(chunk)
+    t_add = time.perf_counter() - t0
+    size = sum(os.path.getsize(os.path.join(args.dir, f)) for f in os.listdir(args.dir))
+    print(f"records {len(arc):,}  append {t_add:.1f} s  ({t_add / args.n * 1e6:.1f} us/record)")
+    print(f"on disk {size / 1e6:.1f} MB  ({size / args.n:.1f} bytes/record)")
+
+    # 다시 열기 (합계 파일만 읽음)
+    arc, ms = _time(lambda: HistoryArchive(args.dir), 1)
+    print(f"{'open':<28}{ms:>10.1f} ms")
+    _, ms = _time(lambda: arc.daily())
+    print(f"{'daily (summary)':<28}{ms:>10.1f} ms")
+    _, ms = _time(lambda: arc.by_prefix())
+    print(f"{'by_prefix (summary)':<28}{ms:>10.1f} ms")
+    ts = arc.column("ts")
+    lo, hi = float(ts[len(ts) // 4]), float(ts[len(ts) // 2])
+    _, ms = _time(lambda: arc.scan(lo, hi))
+    print(f"{'scan 1/4 range':<28}{ms:>10.1f} ms")
+    _, ms = _time(lambda: arc.scan(lo, hi, prefix="SG91"))
+    print(f"{'scan 1/4 range + prefix':<28}{ms:>10.1f} ms")
+    pct, ms = _time(lambda: arc.percentiles("remain"))
+    print(f"{'percentiles remain':<28}{ms:>10.1f} ms   {pct}")
+
+if __name__ == "__main__":
+    main()
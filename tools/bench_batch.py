@@ -0,0 +1,44 @@
+#-*- coding: utf-8 -*-
+# 배치 계산 벤치마크: 스칼라 _compute 루프 vs slab_batch.compute_batch
+#   python tools/bench_batch.py [행 수 ...]
+
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from slab_batch import compute_batch, compute_scalar, iter_results
+
+def make_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    slab = np.round(rng.uniform(6000, 12000, n), 1)
+    k = rng.integers(2, 4, n)
+    guides = np.round(rng.uniform(1800, 4500, (n, 3)), 1)
+    guides[k == 2, 2] = np.nan
+    loss = rng.choice([10.0, 15.0, 20.0], n)
+    return slab, guides, loss
+
+def best_of(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, out
+
+def main(argv):
+    sizes = [int(a) for a in argv] or [1_000, 10_000, 100_000]
+    print(f"{'rows':>9} {'scalar(s)':>10} {'batch(s)':>10} {'scalar rows/s':>14} {'batch rows/s':>14} {'speedup':>8}")
+    for n in sizes:
+        slab, guides, loss = make_rows(n)
+        t_s, ref = best_of(lambda: compute_scalar(slab, guides, loss))
+        t_b, res = best_of(lambda: compute_batch(slab, guides, loss))
+        got = list(iter_results(slab, guides, loss, res))
+        if got != ref:
+            bad = next(i for i, (a, b) in enumerate(zip(got, ref)) if a != b)
+            raise SystemExit(f"불일치: {bad}행 batch={got[bad]} scalar={ref[bad]}")
+        print(f"{n:>9} {t_s:>10.4f} {t_b:>10.4f} {n/t_s:>14,.0f} {n/t_b:>14,.0f} {t_s/t_b:>7.1f}x")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
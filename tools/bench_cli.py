@@ -0,0 +1,46 @@
+#-*- coding: utf-8 -*-
+# 헤드리스 배치(slab_cli) 병렬 처리량 벤치마크
+#   python tools/bench_cli.py [--rows 500000] [--workers 1,2,4,8] [--chunk-size 5000]
+# 워커 수별 행/s 와 출력이 1 워커 결과와 바이트 단위로 같은지(sha256) 확인
+
+import os, sys, time, random, hashlib, argparse, tempfile, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def make_csv(path, rows, seed=0):
+    rnd = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("front,back,slab,p1,p2,p3\n")
+        for _ in range(rows):
+            p3 = f"{rnd.uniform(1800, 3500):.1f}" if rnd.random() < 0.5 else ""
+            f.write(f"{rnd.randrange(1000):03d},{rnd.randrange(10)},{rnd.uniform(6000, 12000):.1f},"
+                    f"{rnd.uniform(1800, 4500):.1f},{rnd.uniform(1800, 4500):.1f},{p3}\n")
+
+def run(path, workers, chunk, out_format):
+    t0 = time.perf_counter()
+    p = subprocess.run([sys.executable, os.path.join(ROOT, "slab_cli.py"), path,
+                        "--workers", str(workers), "--chunk-size", str(chunk),
+                        "--out-format", out_format],
+                       capture_output=True, check=True)
+    return time.perf_counter() - t0, hashlib.sha256(p.stdout).hexdigest()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=500_000)
+    ap.add_argument("--workers", default="1,2,4,8")
+    ap.add_argument("--chunk-size", type=int, default=5000)
+    ap.add_argument("--out-format", default="jsonl")
+    args = ap.parse_args(argv)
+    path = os.path.join(tempfile.mkdtemp(), "rows.csv")
+    make_csv(path, args.rows)
+    print(f"{args.rows:,} 행, CPU {os.cpu_count()} 개, chunk {args.chunk_size}")
+    print(f"{'workers':>8} {'seconds':>8} {'rows/s':>10} {'speedup':>8}  same output")
+    base = ref = None
+    for w in (int(x) for x in args.workers.split(",")):
+        dt, digest = run(path, w, args.chunk_size, args.out_format)
+        base = base or dt
+        ref = ref or digest
+        print(f"{w:>8} {dt:>8.2f} {args.rows/dt:>10,.0f} {base/dt:>7.2f}x  {digest == ref}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#-*- coding: utf-8 -*-
+# 고정소수점 엔진 벤치마크: float(_compute + dict) vs 0.1 mm 정수(compute_fixed + FixedBatch)
+#   python tools/bench_fixed.py [--n 100000]
+# 계산 / 표시 문자열 시간, 보관 메모리(tracemalloc), 직렬화 크기, 반올림이 달라지는 건수 출력
+
+import os, sys, time, json, random, argparse, tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slab_core import _compute, make_fmt
+from slab_fixed import FixedBatch, compute_fixed, fmt_units, fixed_from_result
+
+def make_inputs(n, seed=0):
+    rnd = random.Random(seed)
+    out = []
+    while len(out) < n:
+        guides = [rnd.randrange(8000, 35000) / 10 for _ in range(rnd.randint(2, 6))]
+        slab = round(sum(guides) + 15 * len(guides) + rnd.uniform(0, 300), 1)
+        out.append((slab, guides, 15.0))
+    return out
+
+def _measure(fn):
+    # 시간은 추적 없이, 메모리는 한 번 더 만들어 tracemalloc 으로
+    t0 = time.perf_counter()
+    fn()
+    ms = (time.perf_counter() - t0) * 1000
+    tracemalloc.start()
+    obj = fn()
+    mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, ms, mem
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=100000)
+    args = ap.parse_args(argv)
+    inputs = make_inputs(args.n)
+
+    floats, f_ms, f_mem = _measure(lambda: [_compute(s, g, l) for s, g, l in inputs])
+    batch, b_ms, b_mem = _measure(lambda: FixedBatch.from_records(
+        {"slab": s, "guides": g, "loss": l} for s, g, l in inputs))
+    t0 = time.perf_counter()
+    fixed = list(batch.results())
+    x_ms = (time.perf_counter() - t0) * 1000
+
+    print(f"records {args.n}")
+    print(f"{'':<22}{'float dict':>14}{'fixed int':>14}")
+    print(f"{'compute ms':<22}{f_ms:>14.1f}{x_ms:>14.1f}   (fixed: pack {b_ms:.1f} ms)")
+    print(f"{'store bytes (traced)':<22}{f_mem:>14,}{b_mem:>14,}")
+    print(f"{'store bytes (arrays)':<22}{'':>14}{batch.nbytes:>14,}")
+    js = sum(len(json.dumps(r)) for r in floats)
+    print(f"{'serialized bytes':<22}{js:>14,}{len(batch.to_bytes()):>14,}")
+
+    for do_round in (False, True):
+        fmt = make_fmt(do_round)
+        t0 = time.perf_counter()
+        a = [[fmt(x) for x in r["real"]] for r in floats]
+        fa = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        b = [[fmt_units(x, fx["den"], do_round) for x in fx["real"]] for fx in fixed]
+        fb = (time.perf_counter() - t0) * 1000
+        diff = sum(x != y for ra, rb in zip(a, b) for x, y in zip(ra, rb))
+        print(f"{'format ms round=' + str(do_round):<22}{fa:>14.1f}{fb:>14.1f}"
+              f"   rounding differs: {diff}")
+
+    # 표시 경로(fixed_from_result)는 float 결과에서 바로 정수로
+    t0 = time.perf_counter()
+    for r in floats:
+        fixed_from_result(r)
+    print(f"fixed_from_result     {(time.perf_counter() - t0) * 1e6 / len(floats):.2f} us/record")
+
+    # NumPy 배치: float64 (NaN 패딩) vs int64 (0 패딩)
+    try:
+        import numpy as np
+        from slab_batch import compute_batch, compute_batch_fixed, padded_from
+    except ImportError:
+        np = None
+    if np is not None:
+        k = max(len(g) for _, g, _ in inputs)
+        slab = np.array([s for s, _, _ in inputs])
+        guides = np.full((len(inputs), k), np.nan)
+        for i, (_, g, _) in enumerate(inputs):
+            guides[i, :len(g)] = g
+        loss = np.array([l for _, _, l in inputs])
+        t0 = time.perf_counter()
+        res_f = compute_batch(slab, guides, loss)
+        nf = (time.perf_counter() - t0) * 1000
+        cols = padded_from(batch)
+        t0 = time.perf_counter()
+        res_x = compute_batch_fixed(*cols)
+        nx = (time.perf_counter() - t0) * 1000
+        # 두 배치가 같은 답인지: 계산 가능 여부 / 여유길이(0.1 mm) / 예상 길이(float 오차 이내)
+        ok = res_f["ok"]
+        assert np.array_equal(ok, res_x["ok"])
+        assert np.array_equal(np.round(res_f["remain"] * 10).astype(np.int64), res_x["remain"])
+        real_x = np.where(np.isnan(res_f["real"]), np.nan, res_x["real"] / res_x["den"][:, None] / 10)
+        assert np.allclose(res_f["real"][ok], real_x[ok], equal_nan=True)
+        print(f"{'numpy batch ms':<22}{nf:>14.1f}{nx:>14.1f}   (결과 일치)")
+        print(f"{'numpy input bytes':<22}{slab.nbytes + guides.nbytes + loss.nbytes:>14,}"
+              f"{sum(a.nbytes for a in cols):>14,}")
+
+    # 0.1 mm 정수 저장 <-> 바이너리 왕복 확인
+    back = FixedBatch.from_bytes(batch.to_bytes())
+    assert back[len(back) - 1] == batch[len(batch) - 1]
+    assert compute_fixed(*batch[0]) == fixed[0]
+
+if __name__ == "__main__":
+    main()
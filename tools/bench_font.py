@@ -0,0 +1,102 @@
+#-*- coding: utf-8 -*-
+# 폰트 벤치마크 (전체 폰트 vs tools/subset_font.py 부분 폰트)
+#   1) 파일 크기 / APK 안 압축 크기 (zip deflate 9 로 추정)
+#   2) 폰트 등록 + 첫 렌더링(폰트 열기 포함) 시간, 같은 크기 두 번째 렌더링 시간 (Kivy 필요, 새 프로세스)
+#   3) 첫 계산 결과 렌더링 시간: 미리 그리기 없음 / 있음 (main.py 의 _warm_glyphs 와 같은 단계)
+#
+#   python tools/bench_font.py [--runs 5] [--font NanumGothic.ttf NanumGothic.ttf.orig]
+
+import os, sys, json, zlib, argparse, statistics, subprocess
+from importlib.util import find_spec
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = r"""
+import os, sys, time, json
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+sys.path.insert(0, sys.argv[3])
+from kivy.core.window import Window
+from kivy.core.text import LabelBase, Label as CoreLabel
+from kivy.core.text.markup import MarkupLabel
+from kivy.metrics import dp, sp
+from slab_core import _compute, build_code, build_result_text, load_settings
+
+path, warm = sys.argv[1], sys.argv[2] == "1"
+st = load_settings("")
+out_fs = dp(int(st.get("out_font", 15)))
+
+def render(text, fs, markup=False, bold=False):
+    t0 = time.perf_counter()
+    (MarkupLabel if markup else CoreLabel)(text=text, font_name="F", font_size=fs, bold=bold).refresh()
+    return (time.perf_counter() - t0) * 1000.0
+
+t0 = time.perf_counter()
+LabelBase.register(name="F", fn_regular=path)
+reg = (time.perf_counter() - t0) * 1000.0
+loss = float(st.get("loss_mm", 15.0))
+sample = build_result_text(_compute(9000.0, [2950.0, 3000.0, 2900.0], loss), "SG9400000-00", st)
+real = build_result_text(_compute(12345.0, [4010.0, 3990.0, 4200.0], loss), "SG9412345-01", st)
+out = {"register_ms": reg}
+if warm:
+    try:
+        with open(os.path.join(sys.argv[3], "font_glyphs.txt"), "r", encoding="utf-8") as f:
+            chars = f.read().strip("\n")
+    except OSError:
+        chars = ""
+    block = "\n".join(chars[i:i + 64] for i in range(0, len(chars), 64))
+    t0 = time.perf_counter()
+    render(sample, out_fs, True)
+    if block:
+        render(block, out_fs); render(block, out_fs, bold=True)
+        render(block, dp(17)); render(block, sp(15)); render(block, sp(14))
+    out["warm_ms"] = (time.perf_counter() - t0) * 1000.0
+out["first_ms"] = render(real, out_fs, True)
+out["second_ms"] = render(real.replace("12345", "12346"), out_fs, True)
+print("BENCH " + json.dumps(out), flush=True)
+"""
+
+def sizes(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    return len(data), len(zlib.compress(data, 9))
+
+def child(path, warm):
+    p = subprocess.run([sys.executable, "-c", _CHILD, path, "1" if warm else "0", ROOT],
+                       cwd=ROOT, capture_output=True, text=True, timeout=120)
+    for line in p.stdout.splitlines():
+        if line.startswith("BENCH "):
+            return json.loads(line[6:])
+    raise RuntimeError((p.stderr or p.stdout)[-500:])
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--font", nargs="+",
+                    default=[os.path.join(ROOT, "NanumGothic.ttf"), os.path.join(ROOT, "NanumGothic.ttf.orig")])
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    fonts = [p for p in args.font if os.path.exists(p)]
+    if not fonts:
+        print("폰트 파일 없음: " + ", ".join(args.font))
+        return 1
+    print(f"{'font':<24}{'bytes':>12}{'APK(zip)':>12}")
+    for p in fonts:
+        raw, packed = sizes(p)
+        print(f"{os.path.basename(p):<24}{raw:>12,}{packed:>12,}")
+
+    # 렌더링은 새 프로세스에서 측정하므로 여기서는 설치 여부만 확인 (Kivy 를 불러오지 않음)
+    if find_spec("kivy") is None:
+        print("렌더링 시간: 측정 불가 (Kivy 없음)")
+        return 0
+    print(f"\n{'font':<24}{'warm':>6}{'register':>10}{'warm-up':>10}{'1st calc':>10}{'2nd calc':>10}  (ms, 중앙값 {args.runs}회)")
+    for p in fonts:
+        for warm in (False, True):
+            runs = [child(p, warm) for _ in range(args.runs)]
+            med = lambda k: statistics.median(r.get(k, 0.0) for r in runs)
+            print(f"{os.path.basename(p):<24}{'yes' if warm else 'no':>6}{med('register_ms'):>10.2f}"
+                  f"{med('warm_ms'):>10.1f}{med('first_ms'):>10.1f}{med('second_ms'):>10.1f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
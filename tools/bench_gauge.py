@@ -0,0 +1,70 @@
+#-*- coding: utf-8 -*-
+# 게이지 수신 파이프라인(slab_gauge) 지연 / 역압 벤치마크
+#   python tools/bench_gauge.py [--rate 50] [--burst 40] [--seconds 3] [--frame-ms 16.7] [--slow-ms 0]
+# 시험 서버와 GaugeIngest 를 한 프로세스에서 돌리고, 주 스레드는 Kivy Clock 처럼
+# 프레임마다 예약된 콜백을 실행 (slow-ms 로 화면 처리를 일부러 늦춰 역압 확인)
+
+import os, sys, time, asyncio, threading, argparse
+from collections import deque
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slab_gauge import GaugeIngest, stand_in_server
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rate", type=float, default=50.0)
+    ap.add_argument("--burst", type=int, default=40)
+    ap.add_argument("--seconds", type=float, default=3.0)
+    ap.add_argument("--frame-ms", type=float, default=16.7)
+    ap.add_argument("--slow-ms", type=float, default=0.0, help="콜백마다 추가로 걸리는 시간")
+    args = ap.parse_args(argv)
+
+    port = []
+    ready = threading.Event()
+    def _serve():
+        def _started(p):
+            port.append(p)
+            ready.set()
+        try:
+            asyncio.run(stand_in_server(port=0, rate=args.rate, burst=args.burst,
+                                        started=_started))
+        except Exception:
+            pass
+    threading.Thread(target=_serve, daemon=True).start()
+    ready.wait(5)
+
+    calls = deque()
+    shown = [0]
+    def on_results(items):
+        shown[0] += len(items)
+        if args.slow_ms:
+            time.sleep(args.slow_ms / 1000.0)
+    ing = GaugeIngest(f"127.0.0.1:{port[0]}", calls.append, on_results,
+                      queue_size=64, outbox_size=128)
+    ing.set_context("SG94123-01", [2950.0, 3000.0, 2900.0], 15.0)
+    ing.start()
+
+    frames = over = 0
+    end = time.perf_counter() + args.seconds
+    while time.perf_counter() < end:
+        t0 = time.perf_counter()
+        # 이번 프레임 전에 예약된 콜백만 (실행 중 새로 예약된 것은 다음 프레임, Clock 과 같음)
+        for _ in range(len(calls)):
+            calls.popleft()()
+        dt = (time.perf_counter() - t0) * 1000
+        frames += 1
+        if dt > args.frame_ms:
+            over += 1
+        time.sleep(max(0.0, args.frame_ms / 1000.0 - dt / 1000.0))
+    ing.stop()
+
+    m = ing.metrics()
+    print(f"readings {m['readings']}  shown {shown[0]}  batches {m['batches']} (max {m['max_batch']})"
+          f"  ui calls {m['ui_calls']}  frames {frames} (over budget {over})")
+    print(f"backpressure: queue high {m['queue_high']}  queue waits {m['queue_waits']}"
+          f"  outbox waits {m['outbox_waits']}")
+    print(f"latency ms  calc p50 {m['calc_p50_ms']:.2f} p95 {m['calc_p95_ms']:.2f} max {m['calc_max_ms']:.2f}")
+    print(f"            ui   p50 {m['ui_p50_ms']:.2f} p95 {m['ui_p95_ms']:.2f} max {m['ui_max_ms']:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#-*- coding: utf-8 -*-
+# SQLite 기록 저장소 검색 지연 벤치마크
+#   python tools/bench_history_db.py [행 수=1000000]
+
+import os, sys, time, random, tempfile, statistics
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slab_core import _compute
+from slab_store import HistoryDB
+
+def make_records(n, seed=0):
+    rnd = random.Random(seed)
+    t0 = time.time() - 180 * 86400
+    for i in range(n):
+        slab = round(rnd.uniform(6000, 12000), 1)
+        guides = [round(rnd.uniform(1800, 3500), 1) for _ in range(rnd.choice((2, 3)))]
+        rec = _compute(slab, guides, 15.0) or {"slab": slab, "guides": guides, "loss": 15.0}
+        rec["code"] = f"SG{rnd.choice((94, 95, 96))}{rnd.randrange(1000):03d}-0{rnd.randrange(10)}"
+        rec["ts"] = t0 + i * (180 * 86400 / n)
+        yield rec
+
+def timed(fn, repeat=20):
+    ts = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = fn()
+        ts.append((time.perf_counter() - t) * 1000)
+    return statistics.median(ts), max(ts), out
+
+def main(argv):
+    n = int(argv[0]) if argv else 1_000_000
+    path = os.path.join(tempfile.mkdtemp(), "calc_history.db")
+    db = HistoryDB(path)
+    t = time.perf_counter()
+    batch = []
+    for rec in make_records(n):
+        batch.append(rec)
+        if len(batch) == 10_000:
+            db.append_many(batch)
+            batch = []
+    db.append_many(batch)
+    print(f"{n:,} 건 적재: {time.perf_counter() - t:.1f} s, 파일 {os.path.getsize(path)/1e6:.0f} MB")
+
+    now = time.time()
+    cases = [
+        ("append 1건 (commit 포함)", lambda: db.append(next(make_records(1, seed=7)))),
+        ("최신 페이지 [0]", lambda: db[-1]),
+        ("강번 정확 일치", lambda: db.query(code="SG94123-05", match="exact")),
+        ("강번 앞부분 SG95123 50건", lambda: db.query(code="SG95123", limit=50)),
+        ("강번 앞부분 SG95 50건 (1/3 일치)", lambda: db.query(code="SG95", limit=50)),
+        ("강번 부분 '123-0' 50건", lambda: db.query(code="123-0", match="contains", limit=50)),
+        ("최근 하루 50건", lambda: db.query(ts_from=now - 86400, limit=50)),
+        ("한 달 전 하루 50건", lambda: db.query(ts_from=now - 31 * 86400, ts_to=now - 30 * 86400, limit=50)),
+        ("한 달 전 하루 건수", lambda: db.count(ts_from=now - 31 * 86400, ts_to=now - 30 * 86400)),
+        ("Slab 9000~9010 50건", lambda: db.query(slab_min=9000, slab_max=9010, limit=50)),
+        ("SG96 + 길이 범위 50건", lambda: db.query(code="SG96", slab_min=11000, slab_max=11100, limit=50)),
+        ("OFFSET 10000 페이지", lambda: db.query(limit=50, offset=10_000)),
+        ("커서 페이지 (id < …)", lambda: db.query(limit=50, before_id=n - 10_000)),
+    ]
+    print(f"{'질의':<32}{'median ms':>10}{'max ms':>9}{'rows':>6}")
+    for name, fn in cases:
+        med, mx, out = timed(fn)
+        rows = len(out) if isinstance(out, list) else 1
+        print(f"{name:<32}{med:>10.3f}{mx:>9.3f}{rows:>6}")
+    db.close()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,58 @@
+#-*- coding: utf-8 -*-
+# 로트 배정 벤치마크
+#   python tools/bench_planner.py [--budget-s 5] [--workers 4]
+# 문제 크기별로 best-fit 만 / 국소 탐색 / 병렬(workers) 의 사용률, 배정률, 실행 시간 출력
+# CPU 가 1개이거나 workers < 2 면 병렬 줄은 측정하지 않고 "생략" 으로 표시
+# (Slab 이 workers x 2 장 미만이라 plan_lot 이 나누지 않은 경우도 표시)
+# 주문 총길이는 Slab 총길이의 약 1.15 배 (모두 배정 불가 -> 무엇을 배정하느냐가 사용률을 좌우)
+
+import os, sys, random, argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slab_solver import plan_lot, make_order
+
+def make_problem(n_slabs, seed=0):
+    rnd = random.Random(seed)
+    slabs = [(f"SG94{i:04d}-01", round(rnd.uniform(8000, 12500), 1)) for i in range(n_slabs)]
+    target = sum(l for _, l in slabs) * 1.15
+    orders, total = [], 0.0
+    while total < target:
+        length = round(rnd.uniform(1500, 4500), 1)
+        qty = rnd.choice((1, 1, 2, 3))
+        orders.append(make_order(f"O{len(orders)}", length, 0, rnd.choice((0, 10, 20, 50)), qty))
+        total += length * qty
+    return slabs, orders
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--budget-s", type=float, default=5.0)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--sizes", default="100,1000,3000")
+    args = ap.parse_args(argv)
+    cpus = os.cpu_count() or 1
+    skip = None
+    if args.workers < 2:
+        skip = f"workers={args.workers}"
+    elif cpus < 2:
+        skip = f"CPU {cpus}개"
+    print(f"{'slabs':>6} {'pieces':>7} {'mode':<14} {'yield':>7} {'placed':>7} {'scrap m':>9} {'runtime s':>10}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        slabs, orders = make_problem(n)
+        n_pieces = sum(o["qty"] for o in orders)
+        modes = [("best-fit", dict(local_search=False)),
+                 ("+local search", dict(local_search=True)),
+                 (f"+{args.workers} workers", dict(local_search=True, workers=args.workers))]
+        for name, kw in modes:
+            if kw.get("workers") and skip:
+                print(f"{n:>6} {n_pieces:>7} {name:<14} 병렬 생략 ({skip}, 병렬 수치 없음)")
+                continue
+            r = plan_lot(slabs, orders, budget_s=args.budget_s, **kw)
+            placed = 1 - len(r["unplaced"]) / n_pieces
+            note = ""
+            if kw.get("workers") and r["workers"] < kw["workers"]:
+                note = f"  (나누지 않음: Slab {n}장 < workers x 2)"
+            print(f"{n:>6} {n_pieces:>7} {name:<14} {r['yield']:>6.2%} {placed:>6.1%} "
+                  f"{r['scrap']/1000:>9.1f} {r['runtime_ms']/1000:>10.2f}{note}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#-*- coding: utf-8 -*-
+# 기록 표현별 메모리 / 직렬화 크기 벤치마크
+#   python tools/bench_record.py [--n 1000000]
+# dict(지금 기록 형태) / HistoryRecord(__slots__) / RecordColumns(열 단위) 를 n 건씩 만들어
+# 건당 메모리(tracemalloc), 건당 저장 크기(JSON / encode / 열 바이너리), 변환 시간 출력
+
+import os, sys, gc, time, json, random, argparse, tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+
+from slab_core import _compute
+from slab_record import HistoryRecord, RecordColumns, encode, decode
+
+def make_record(rnd, i):
+    guides = [rnd.randrange(8000, 35000) / 10 for _ in range(rnd.randint(2, 4))]
+    r = _compute(round(sum(guides) + 15 * len(guides) + rnd.uniform(0, 300), 1), guides, 15.0)
+    now = datetime.fromtimestamp(1.7e9 + i * 37)
+    r.update(code=f"SG94{rnd.randrange(1000):03d}-0{rnd.randrange(10)}",
+             timestamp=now.strftime("%m-%d %H:%M:%S"), ts=now.timestamp())
+    return r
+
+def _traced(build):
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    obj = build()
+    sec = time.perf_counter() - t0
+    mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, mem, sec
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=1_000_000)
+    args = ap.parse_args(argv)
+    n = args.n
+    rnd = random.Random(0)
+
+    dicts, m_dict, t_dict = _traced(lambda: [make_record(rnd, i) for i in range(n)])
+    slots, m_slot, t_slot = _traced(lambda: [HistoryRecord.from_dict(d) for d in dicts])
+    # 람다가 나중에 del 되는 이름을 잡지 않도록 값을 기본 인자로 묶음
+    cols, m_cols, t_cols = _traced(lambda recs=slots: RecordColumns.from_records(recs))
+    del slots
+    gc.collect()
+
+    print(f"records {n:,}")
+    print(f"{'':<28}{'bytes/record':>14}{'total MB':>10}{'build s':>9}")
+    for name, m, t in (("dict (지금)", m_dict, t_dict), ("HistoryRecord __slots__", m_slot, t_slot),
+                       ("RecordColumns", m_cols, t_cols)):
+        print(f"{name:<28}{m / n:>14.1f}{m / 1e6:>10.1f}{t:>9.2f}")
+
+    sample = dicts[: min(n, 100_000)]
+    t0 = time.perf_counter()
+    js = [json.dumps(d, ensure_ascii=False).encode("utf-8") for d in sample]
+    t_js = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    bs = [encode(d) for d in sample]
+    t_enc = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    back = [decode(b) for b in bs]
+    t_dec = time.perf_counter() - t0
+    assert all(r.to_dict() == d for r, d in zip(back[:1000], sample))
+    k = len(sample)
+    print(f"{'on disk':<28}{'bytes/record':>14}{'us/record':>10}")
+    print(f"{'JSON':<28}{sum(map(len, js)) / k:>14.1f}{t_js / k * 1e6:>10.2f}")
+    print(f"{'encode (한 건 바이너리)':<28}{sum(map(len, bs)) / k:>14.1f}{t_enc / k * 1e6:>10.2f}")
+    print(f"{'decode':<28}{'':>14}{t_dec / k * 1e6:>10.2f}")
+    print(f"{'RecordColumns.to_bytes':<28}{len(cols.to_bytes()) / n:>14.1f}")
+
+    # 파생 값 계산 비용 (읽을 때마다 _compute 한 번)
+    t0 = time.perf_counter()
+    for r in back:
+        r["real"]
+    print(f"derived real on read      {(time.perf_counter() - t0) / k * 1e6:.2f} us/record")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#-*- coding: utf-8 -*-
+# 결과 패널 페이지 넘김 스트레스 (Kivy 필요)
+#   python tools/bench_render.py [--pages 10] [--frames 300]
+# 텍스처 캐시를 끈 상태(cache_size=0)와 켠 상태로 같은 페이지 순환을 그리고
+# 프레임 간격 / 텍스트 처리 시간의 중앙값, p95, 최대값을 출력
+# 실시간 계산 흉내(매 프레임 Slab 실길이 한 자리씩 변경)는 전체 텍스트 / 줄 단위(show_lines) 로 비교
+
+import os, sys, time, random, argparse, statistics
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.uix.scrollview import ScrollView
+
+from main import ResultView
+from slab_core import _compute, build_history_text, build_result_text
+
+def make_pages(n, seed=0):
+    rnd = random.Random(seed)
+    pages = []
+    while len(pages) < n:
+        guides = [round(rnd.uniform(1800, 3500), 1) for _ in range(3)]
+        r = _compute(round(rnd.uniform(9000, 12000), 1), guides, 15.0)
+        if r:
+            r.update(code=f"SG94{rnd.randrange(1000):03d}-0{rnd.randrange(10)}",
+                     timestamp=f"10-18 12:{len(pages):02d}:00")
+            pages.append(build_history_text(r, len(pages) + 1, {}))
+    return pages
+
+def make_typing(n, seed=0):
+    # 지시길이는 그대로, Slab 실길이만 바뀌는 결과 화면 n 개
+    rnd = random.Random(seed)
+    guides = [2800.0, 3100.0, 2950.5]
+    return [build_result_text(_compute(9000.0 + rnd.randrange(3000), guides, 15.0),
+                              "SG94123-01", {}) for _ in range(n)]
+
+def _pct(xs, p):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(len(xs) * p))]
+
+class BenchApp(App):
+    def __init__(self, pages, typing, frames, **kw):
+        super().__init__(**kw)
+        self.frames = frames
+        self.phases = [("캐시 없음", 0, pages, False), ("텍스처 캐시", 16, pages, False),
+                       ("입력 전체", 0, typing, False), ("입력 줄단위", 0, typing, True)]
+        self.results = []
+
+    def build(self):
+        self.sv = ScrollView(do_scroll_x=False)
+        return self.sv
+
+    def on_start(self):
+        Clock.schedule_once(lambda dt: self._next_phase(), 0.5)
+
+    def _next_phase(self):
+        if not self.phases:
+            for name, frame, work, view in self.results:
+                print(f"{name:<10} frame median {statistics.median(frame):6.2f} ms  "
+                      f"p95 {_pct(frame, .95):6.2f}  max {max(frame):6.2f}  |  "
+                      f"text→texture median {statistics.median(work):6.2f} ms  "
+                      f"p95 {_pct(work, .95):6.2f}  (hit {view.hits}, miss {view.misses})")
+            self.stop()
+            return
+        self.name, size, self.pages, self.live = self.phases.pop(0)
+        self.sv.clear_widgets()
+        self.view = ResultView(self.sv, cache_size=size)
+        self.view.width = self.sv.width
+        self.sv.add_widget(self.view)
+        self.i, self.frame, self.work, self.last = 0, [], [], None
+        self.ev = Clock.schedule_interval(self._tick, 0)
+
+    def _tick(self, dt):
+        now = time.perf_counter()
+        if self.last is not None:
+            self.frame.append((now - self.last) * 1000)
+        self.last = now
+        page = self.pages[self.i % len(self.pages)]
+        t0 = time.perf_counter()
+        if self.live:
+            self.view.show_lines(page.split("\n"))
+        else:
+            self.view.text = page
+            self.view._refresh()
+        self.work.append((time.perf_counter() - t0) * 1000)
+        self.i += 1
+        if self.i >= self.frames:
+            self.ev.cancel()
+            self.results.append((self.name, self.frame, self.work, self.view))
+            self._next_phase()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=10)
+    ap.add_argument("--frames", type=int, default=300)
+    args = ap.parse_args(argv)
+    BenchApp(make_pages(args.pages), make_typing(args.frames), args.frames).run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#-*- coding: utf-8 -*-
+# 주문 조합 최적화 벤치마크
+#   python tools/bench_solver.py [--slabs 50] [--budget-ms 50]
+# 주문 풀 크기별로 Slab 여러 장을 풀어 시간(중앙값/최대), 예산 내 최적 증명 비율,
+# 평균 스크랩/사용률을 출력
+
+import os, sys, time, random, argparse, statistics
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slab_solver import solve, make_order
+
+def make_pool(n, rnd, tols):
+    pool = []
+    for i in range(n):
+        length = round(rnd.uniform(1500, 4500), 1)
+        pool.append(make_order(f"O{i}", length, 0, rnd.choice(tols),
+                               rnd.choice((1, 1, 2, 3))))
+    return pool
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--slabs", type=int, default=50)
+    ap.add_argument("--budget-ms", type=float, default=50.0)
+    args = ap.parse_args(argv)
+    for name, tols in (("허용 +0~50 mm", (0, 10, 20, 30, 50)), ("허용 0 mm (정확 길이)", (0,))):
+        print(f"[{name}]")
+        run(args, tols)
+
+def run(args, tols):
+    rnd = random.Random(0)
+    print(f"{'orders':>7} {'median ms':>10} {'max ms':>8} {'optimal':>8} {'scrap mm':>9} {'yield':>7} {'nodes':>8}")
+    for n in (20, 50, 100, 200, 300, 500):
+        pool = make_pool(n, rnd, tols)
+        ts, opt, scrap, yld, nodes = [], 0, [], [], []
+        for _ in range(args.slabs):
+            slab = round(rnd.uniform(7000, 12500), 1)
+            t0 = time.perf_counter()
+            r = solve(slab, 15.0, pool, budget_ms=args.budget_ms)
+            ts.append((time.perf_counter() - t0) * 1000)
+            opt += r["optimal"]
+            scrap.append(r["scrap"])
+            yld.append(r["yield"])
+            nodes.append(r["nodes"])
+        print(f"{n:>7} {statistics.median(ts):>10.2f} {max(ts):>8.2f} {opt/args.slabs:>7.0%} "
+              f"{statistics.mean(scrap):>9.1f} {statistics.mean(yld):>6.2%} {statistics.median(nodes):>8.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#-*- coding: utf-8 -*-
+# 시작 시간 벤치마크
+#   1) slab_core import 시간 (Kivy 없는 코어 모듈)
+#   2) 앱 실행 ~ 첫 화면(첫 프레임) 시간 (Kivy 필요, main.py 의 SLAB_STARTUP_PROBE 사용)
+#   3) 첫 프레임 이후로 미룬 기록 열기 시간 (기록 MAX_HISTORY 건, 새 프로세스에서 측정)
+#      예전에는 build() 안에서 해서 첫 프레임 시간에 그대로 더해지던 부분
+#
+#   python tools/bench_startup.py [--runs 5] [--core-budget-ms 30] [--frame-budget-ms 2500]
+#   예산을 넘으면 종료 코드 1
+
+import os, sys, re, time, shutil, tempfile, argparse, statistics, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _run(args, env=None, timeout=120):
+    return subprocess.run([sys.executable] + args, cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=timeout)
+
+def core_import_ms():
+    # -X importtime 의 누적 시간(us) 중 slab_core 줄만 사용
+    p = _run(["-X", "importtime", "-c", "import slab_core"])
+    for line in p.stderr.splitlines():
+        parts = [x.strip() for x in line.split("|")]
+        if len(parts) == 3 and parts[2] == "slab_core":
+            return int(parts[1]) / 1000.0
+    raise RuntimeError(p.stderr[-500:])
+
+def kivy_loaded_by_core():
+    p = _run(["-c", "import sys, slab_core, slab_cli; print('kivy' in sys.modules)"])
+    return p.stdout.strip() == "True"
+
+_HISTORY_OPEN = """
+import sys, time
+t0 = time.perf_counter()
+from slab_store import open_history
+from slab_archive import open_archive
+from slab_core import MAX_HISTORY
+t1 = time.perf_counter()
+open_archive(sys.argv[1])
+h = open_history(sys.argv[1], keep=MAX_HISTORY)
+len(h); h.recent(0, 20)
+t2 = time.perf_counter()
+print(f"{(t1 - t0) * 1000:.2f} {(t2 - t1) * 1000:.2f}")
+"""
+
+def history_open_ms(runs):
+    d = tempfile.mkdtemp(prefix="slab_startup_")
+    try:
+        p = _run(["-c", "import sys\n"
+                  "from slab_store import open_history\n"
+                  "from slab_archive import open_archive\n"
+                  "from slab_core import MAX_HISTORY, _compute\n"
+                  "recs = []\n"
+                  "for i in range(MAX_HISTORY):\n"
+                  "    r = _compute(9000.0 + i % 300, [2950.0, 3000.0, 2900.0], 15.0)\n"
+                  "    r.update(code=f'SG94{i % 1000:03d}-01', ts=1.7e9 + i * 60)\n"
+                  "    recs.append(r)\n"
+                  "open_history(sys.argv[1], keep=MAX_HISTORY).append_many(recs)\n"
+                  "open_archive(sys.argv[1]).append_many(recs)\n", d])
+        if p.returncode:
+            raise RuntimeError(p.stderr[-500:])
+        out = []
+        for _ in range(runs):
+            p = _run(["-c", _HISTORY_OPEN, d])
+            out.append(tuple(map(float, p.stdout.split())))
+        return out
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+def first_frame():
+    env = dict(os.environ, SLAB_STARTUP_PROBE="exit")
+    t0 = time.time()
+    p = _run(["main.py"], env=env)
+    m = re.search(r"SLAB_STARTUP import_ms=([\d.]+) build_ms=([\d.]+) "
+                  r"first_frame_ms=([\d.]+) wall=([\d.]+)", p.stdout)
+    if not m:
+        return None
+    imp, build, frame, wall = map(float, m.groups())
+    return {"import_ms": imp, "build_ms": build, "first_frame_ms": frame,
+            "launch_ms": (wall - t0) * 1000.0}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--core-budget-ms", type=float, default=30.0)
+    ap.add_argument("--frame-budget-ms", type=float, default=2500.0)
+    args = ap.parse_args(argv)
+
+    failed = False
+    if kivy_loaded_by_core():
+        print("FAIL: slab_core / slab_cli 가 kivy 를 import 함")
+        failed = True
+
+    core = [core_import_ms() for _ in range(args.runs)]
+    med = statistics.median(core)
+    print(f"core import      : median {med:7.2f} ms  (min {min(core):.2f}, budget {args.core_budget_ms:.0f})")
+    failed |= med > args.core_budget_ms
+
+    hist = history_open_ms(args.runs)
+    print(f"history import   : median {statistics.median(h[0] for h in hist):7.2f} ms  (첫 프레임 이후)")
+    print(f"history open     : median {statistics.median(h[1] for h in hist):7.2f} ms  (첫 프레임 이후)")
+
+    runs = [first_frame() for _ in range(args.runs)]
+    runs = [r for r in runs if r]
+    if not runs:
+        print("first frame      : 측정 불가 (kivy 실행 환경 없음)")
+    else:
+        for key in ("import_ms", "build_ms", "first_frame_ms", "launch_ms"):
+            print(f"{key:<17}: median {statistics.median(r[key] for r in runs):7.1f} ms")
+        launch = statistics.median(r["launch_ms"] for r in runs)
+        print(f"{'':<17}  (launch budget {args.frame_budget_ms:.0f} ms)")
+        failed |= launch > args.frame_budget_ms
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+#-*- coding: utf-8 -*-
+# 강번 자동완성 벤치마크
+#   python tools/bench_suggest.py [--n 100000]
+# 정렬 배열(CodeIndex) 접두어 조회 vs 기록 dict 선형 탐색, 한 건 추가(add) / 대량 병합(update) 시간 출력
+
+import os, sys, time, random, argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slab_suggest import CodeIndex
+
+def _us(fn, reps):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        fn()
+    return (time.perf_counter() - t0) / reps * 1e6
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=100000)
+    ap.add_argument("--prefix", default="SG94")
+    args = ap.parse_args(argv)
+    rnd = random.Random(0)
+    codes = [f"{args.prefix}{rnd.randrange(1000):03d}-0{rnd.randrange(10)}{rnd.randrange(100):02d}"
+             for _ in range(args.n)]
+    history = [{"code": c, "slab": 9000.0} for c in codes]
+
+    t0 = time.perf_counter()
+    idx = CodeIndex()
+    idx.update(codes)
+    print(f"codes {len(idx)}  build {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    for q in ("1", "12"):
+        p = args.prefix + q
+        tree = _us(lambda: idx.prefixed(p, 8), 2000)
+        scan = _us(lambda: [d["code"] for d in history if d["code"].startswith(p)][:8], 5)
+        print(f"prefix {q!r:5} matches {idx.count(p):>6}  sorted {tree:8.1f} us  scan {scan:10.1f} us")
+
+    new = iter(f"{args.prefix}{i:03d}-09X" for i in range(1000))
+    print(f"add (insort)    {_us(lambda: idx.add(next(new)), 1000):8.1f} us")
+    more = [f"{args.prefix}{i % 1000:03d}-0{i}" for i in range(10000)]
+    t0 = time.perf_counter()
+    idx.update(more)
+    print(f"update +{len(more)}  {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
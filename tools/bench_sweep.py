@@ -0,0 +1,55 @@
+#-*- coding: utf-8 -*-
+# 손실 민감도(slab_sweep) 벤치마크
+#   python tools/bench_sweep.py [--n 100000] [--guides 6]
+# 화면 표 1회(손실 11개 x 전체+하나 뺀 조합) / 전체 조합 / 배치 n 건 시간,
+# numpy 와 파이썬 루프 각각 출력 (입력 1회당 한 프레임 16.7 ms 안에 들어오는지)
+
+import os, sys, time, random, argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import slab_sweep
+from slab_core import compile_plan
+from slab_fixed import FixedBatch
+from slab_sweep import sweep, sweep_batch, sweep_lines, loss_steps, guide_subsets
+
+def _best_ms(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        ms = (time.perf_counter() - t0) * 1000
+        best = ms if best is None else min(best, ms)
+    return best
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=100000)
+    ap.add_argument("--guides", type=int, default=6)
+    args = ap.parse_args(argv)
+    rnd = random.Random(0)
+    guides = [rnd.randrange(8000, 35000) / 10 for _ in range(args.guides)]
+    slab = round(sum(guides) + 15 * len(guides) + 120.4, 1)
+    losses = loss_steps(15.0)
+    plan = compile_plan({})
+    subsets = guide_subsets(len(guides))
+    batch = FixedBatch.from_records(
+        {"slab": round(sum(g) + 15 * len(g) + rnd.uniform(-100, 300), 1), "guides": g, "loss": 15.0}
+        for g in ([rnd.randrange(8000, 35000) / 10 for _ in range(rnd.randint(2, 6))]
+                  for _ in range(args.n)))
+
+    np = slab_sweep.np
+    print(f"losses {len(losses)}  guides {len(guides)}  all subsets {len(subsets)}  batch {args.n:,}")
+    print(f"{'':<30}{'numpy ms':>10}{'python ms':>11}")
+    for name, fn in (
+            ("screen table (sweep+lines)",
+             lambda: sweep_lines(sweep(slab, guides, losses), plan, len(guides), 150)),
+            ("all subsets", lambda: sweep(slab, guides, losses, subsets)),
+            ("batch", lambda: sweep_batch(batch, losses))):
+        t_np = _best_ms(fn) if np is not None else None
+        slab_sweep.np = None
+        t_py = _best_ms(fn, 1 if name == "batch" else 5)
+        slab_sweep.np = np
+        print(f"{name:<30}{(f'{t_np:.2f}' if t_np is not None else '-'):>10}{t_py:>11.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#-*- coding: utf-8 -*-
+# slab_service 부하 시험 (localhost)
+#   python tools/load_service.py [--concurrency 1 4 16 64] [--seconds 3] [--window-ms 1] [--url host:port]
+# --url 이 없으면 slab_service 를 하위 프로세스로 띄움. 동시 연결마다 keep-alive 로 /calc 를 계속 보내
+# 동시성별 초당 요청 수, 클라이언트 지연 p50/p95/p99, 서버 묶음 크기 출력
+# (--window-ms 0 --max-batch 1 로 띄우면 묶음 없는 경우와 비교)
+
+import os, sys, json, time, socket, random, asyncio, argparse, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def make_bodies(n=256, seed=0):
+    rnd = random.Random(seed)
+    out = []
+    for i in range(n):
+        guides = [rnd.randrange(8000, 35000) / 10 for _ in range(rnd.randint(2, 5))]
+        slab = round(sum(guides) + 15 * len(guides) + rnd.uniform(-50, 300), 1)
+        out.append(json.dumps({"code": f"SG94{i % 1000:03d}-01", "slab": slab,
+                               "guides": guides}).encode("utf-8"))
+    return out
+
+async def _request(reader, writer, host, method, path, body=b""):
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                 .encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b""):
+            break
+        k, _, v = h.decode("latin-1").partition(":")
+        if k.lower() == "content-length":
+            length = int(v)
+    return status, await reader.readexactly(length)
+
+async def _client(host, port, bodies, end, lat, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = random.randrange(len(bodies))
+    try:
+        while time.perf_counter() < end:
+            t0 = time.perf_counter()
+            status, _ = await _request(reader, writer, host, "POST", "/calc", bodies[i % len(bodies)])
+            lat.append((time.perf_counter() - t0) * 1000.0)
+            if status != 200:
+                errors.append(status)
+            i += 1
+    finally:
+        writer.close()
+
+async def _stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, data = await _request(reader, writer, host, "GET", "/stats")
+        return json.loads(data)
+    finally:
+        writer.close()
+
+def _pct(vals, q):
+    s = sorted(vals)
+    return s[min(len(s) - 1, int(len(s) * q / 100))] if s else 0.0
+
+async def run_level(host, port, conc, seconds, bodies):
+    before = await _stats(host, port)
+    lat, errors = [], []
+    end = time.perf_counter() + seconds
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, bodies, end, lat, errors) for _ in range(conc)))
+    dt = time.perf_counter() - t0
+    after = await _stats(host, port)
+    nb = after["batches"] - before["batches"]
+    avg_batch = (after["batched_records"] - before["batched_records"]) / nb if nb else 0.0
+    return len(lat) / dt, _pct(lat, 50), _pct(lat, 95), _pct(lat, 99), avg_batch, len(errors)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    ap.add_argument("--seconds", type=float, default=3.0)
+    ap.add_argument("--url", default="", help="이미 떠 있는 서비스 host:port")
+    ap.add_argument("--window-ms", type=float, default=1.0)
+    ap.add_argument("--max-batch", type=int, default=512)
+    args = ap.parse_args(argv)
+
+    proc = None
+    if args.url:
+        host, _, port = args.url.rpartition(":")
+        port = int(port)
+    else:
+        host, port = "127.0.0.1", _free_port()
+        proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "slab_service.py"),
+                                 "--port", str(port), "--window-ms", str(args.window_ms),
+                                 "--max-batch", str(args.max_batch)],
+                                stderr=subprocess.PIPE, text=True)
+        print(proc.stderr.readline().strip())
+    try:
+        bodies = make_bodies()
+        print(f"{'conc':>5}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'batch':>8}{'err':>5}")
+        for conc in args.concurrency:
+            rps, p50, p95, p99, batch, err = asyncio.run(
+                run_level(host, port, conc, args.seconds, bodies))
+            print(f"{conc:>5}{rps:>10.0f}{p50:>9.2f}{p95:>9.2f}{p99:>9.2f}{batch:>8.1f}{err:>5}")
+        m = asyncio.run(_stats(host, port))
+        print(f"server: {m['requests']} requests, p50 {m['p50_ms']} / p95 {m['p95_ms']} / "
+              f"p99 {m['p99_ms']} ms, connections {m['connections']}, max batch {m['max_batch']}")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+if __name__ == "__main__":
+    main()
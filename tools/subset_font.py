@@ -0,0 +1,102 @@
+#-*- coding: utf-8 -*-
+# 빌드 전 단계: NanumGothic.ttf 를 앱이 실제로 쓰는 글자만 남긴 부분 폰트로 교체
+#   python tools/subset_font.py [--font NanumGothic.ttf] [--dry-run] [--no-hinting]
+#
+# - 글자 목록 = 앱 소스(main.py, slab_*.py)의 문자열 리터럴(f-string 포함, docstring 제외)
+#               + ASCII 출력 문자 전체 (숫자/강번/입력값) + 결과 문구 기호(EXTRA)
+# - 원본은 NanumGothic.ttf.orig 로 보관 (buildozer.spec 의 include_exts 에 없어 APK 에 안 들어감)
+#   다시 실행하면 .orig 에서 새로 만듦 -> 문구를 바꾼 뒤 빌드 전에 한 번 더 실행
+# - font_glyphs.txt 에 남긴 글자를 기록 (앱이 시작할 때 이 글자들로 글리프 캐시를 미리 채움)
+# - fontTools 필요 (pip install fonttools, 빌드 PC 에서만)
+
+import os, sys, ast, glob, time, shutil, argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 소스 문자열에 없어도 표시될 수 있는 기호 (시각화 / 구분선 / 단위 / 화살표)
+EXTRA = "━■□▶◀▲▼×÷→←↑↓·…–—±°“”‘’"
+
+def app_sources(root=ROOT):
+    return [os.path.join(root, "main.py")] + sorted(glob.glob(os.path.join(root, "slab_*.py")))
+
+def _docstring_ids(tree):
+    ids = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            body = node.body
+            if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant):
+                ids.add(id(body[0].value))
+    return ids
+
+def literal_chars(paths):
+    """문자열 리터럴에 나오는 글자 집합 (docstring / 주석 제외)"""
+    chars = set()
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+        skip = _docstring_ids(tree)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str) and id(node) not in skip:
+                chars.update(node.value)
+    return chars
+
+def glyph_text(paths=None):
+    chars = literal_chars(paths or app_sources())
+    chars.update(chr(c) for c in range(0x20, 0x7F))
+    chars.update(EXTRA)
+    return "".join(sorted(c for c in chars if c.isprintable() or c == " "))
+
+def subset(src, dst, text, hinting=True):
+    try:
+        from fontTools import subset as ftsubset
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        sys.exit("fontTools 가 필요함: pip install fonttools")
+    opts = ftsubset.Options()
+    opts.hinting = hinting
+    opts.layout_features = ["*"]
+    opts.name_IDs = ["*"]
+    opts.notdef_outline = True
+    font = TTFont(src)
+    cmap = font.getBestCmap()
+    missing = [c for c in text if ord(c) not in cmap and c != " "]
+    sub = ftsubset.Subsetter(opts)
+    sub.populate(text=text)
+    sub.subset(font)
+    font.save(dst)
+    return len(cmap), len(font.getGlyphOrder()), missing
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--font", default=os.path.join(ROOT, "NanumGothic.ttf"))
+    ap.add_argument("--glyphs", default=os.path.join(ROOT, "font_glyphs.txt"))
+    ap.add_argument("--dry-run", action="store_true", help="글자 목록만 출력")
+    ap.add_argument("--no-hinting", action="store_true", help="힌팅 제거 (더 작지만 작은 글씨가 흐려질 수 있음)")
+    args = ap.parse_args(argv)
+
+    text = glyph_text()
+    hangul = sum(1 for c in text if "가" <= c <= "힣")
+    print(f"글자 {len(text)}개 (한글 음절 {hangul}, 소스 {len(app_sources())}개 파일)")
+    if args.dry_run:
+        print(text)
+        return 0
+
+    orig = args.font + ".orig"
+    if not os.path.exists(orig):
+        if not os.path.exists(args.font):
+            sys.exit(f"폰트 없음: {args.font}")
+        shutil.copy2(args.font, orig)
+    t0 = time.perf_counter()
+    n_cmap, n_glyphs, missing = subset(orig, args.font, text, hinting=not args.no_hinting)
+    ms = (time.perf_counter() - t0) * 1000
+    with open(args.glyphs, "w", encoding="utf-8") as f:
+        f.write(text)
+    a, b = os.path.getsize(orig), os.path.getsize(args.font)
+    print(f"{os.path.basename(orig)} {a:,} bytes ({n_cmap:,} 글자) -> "
+          f"{os.path.basename(args.font)} {b:,} bytes ({n_glyphs} 글리프), {b / a:.1%}, {ms:.0f} ms")
+    if missing:
+        print(f"폰트에 없는 글자 {len(missing)}개: {''.join(missing)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())